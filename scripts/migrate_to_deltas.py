@@ -14,7 +14,30 @@ sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from mcp_server.config import Settings
 from mcp_server.repositories.sqlite_repository import create_sqlite_repositories
-from mcp_server.services.state_service import StateService, GitManager
+from mcp_server.services.state_service import GitManager, StateService
+
+BATCH_SIZE = 1000
+
+
+def flush(state_repo, pending):
+    """Write pending deltas in a single transaction and clear the buffer."""
+    if not pending:
+        return
+    written = state_repo.update_file_hash_deltas(pending)
+    print(f"  Persisted deltas for {written}/{len(pending)} states")
+    pending.clear()
+
+
+def compute_deltas(full_hashes, prev_hashes):
+    """Return new/changed hashes plus ``None`` markers for deleted files."""
+    cur_keys = full_hashes.keys()
+    prev_keys = prev_hashes.keys()
+    changed = {k for k in cur_keys & prev_keys if full_hashes[k] != prev_hashes[k]}
+
+    deltas = {k: full_hashes[k] for k in (cur_keys - prev_keys) | changed}
+    deltas.update(dict.fromkeys(prev_keys - cur_keys))
+    return deltas
+
 
 def migrate_to_deltas():
     """Migrate existing states to delta storage."""
@@ -31,13 +54,14 @@ def migrate_to_deltas():
 
     # Get all states
     states = state_repo.get_all()
+    pending = {}
 
     for state in states:
         if state.state_number == 0:
             # Genesis already has full hashes as deltas
             continue
 
-        if hasattr(state, 'file_hash_deltas') and state.file_hash_deltas:
+        if hasattr(state, "file_hash_deltas") and state.file_hash_deltas:
             # Already migrated
             continue
 
@@ -52,27 +76,20 @@ def migrate_to_deltas():
             # Compute deltas from previous state
             prev_state = state_repo.get_by_number(state.state_number - 1)
             if prev_state and prev_state.file_hashes:
-                # Calculate deltas
-                deltas = {}
-                for file_path, current_hash in full_hashes.items():
-                    if file_path not in prev_state.file_hashes:
-                        deltas[file_path] = current_hash  # new file
-                    elif prev_state.file_hashes[file_path] != current_hash:
-                        deltas[file_path] = current_hash  # changed
-
-                for file_path in prev_state.file_hashes:
-                    if file_path not in full_hashes:
-                        deltas[file_path] = None  # deleted
-
-                # Update state with deltas
-                state.file_hash_deltas = deltas
-                state_repo.create(state)  # This will update existing state
-                print(f"  Migrated {len(deltas)} delta entries")
+                deltas = compute_deltas(full_hashes, prev_state.file_hashes)
+
+                pending[state.state_number] = deltas
+                print(f"  Computed {len(deltas)} delta entries")
+
+                if len(pending) >= BATCH_SIZE:
+                    flush(state_repo, pending)
 
         except Exception as e:
             print(f"  Failed to migrate state {state.state_number}: {e}")
 
+    flush(state_repo, pending)
     print("Migration complete")
 
+
 if __name__ == "__main__":
-    migrate_to_deltas()
\ No newline at end of file
+    migrate_to_deltas()
@@ -15,13 +15,17 @@ sys.path.insert(0, str(project_root))
 
 def main() -> None:
     """Main entry point for the MCP server."""
+    from src.mcp_server import tools
     from src.mcp_server.config import Settings, get_settings
     from src.mcp_server.repositories.sqlite_repository import create_sqlite_repositories
     from src.mcp_server.services.git_manager import GitManager
     from src.mcp_server.services.state_service import StateService
-    from src.mcp_server.tools import mcp_tools
     from src.mcp_server.utils.audit import get_audit_logger
-    from src.mcp_server.utils.logging import get_logger, setup_logging
+    from src.mcp_server.utils.logging import (
+        enable_protocol_debug_logging,
+        get_logger,
+        setup_logging,
+    )
     from src.mcp_server.utils.security import get_rate_limiter
 
     settings = get_settings()
@@ -49,7 +53,15 @@ def main() -> None:
 
     if settings.db_mode == "neo4j":
         try:
-            from neo4j.exceptions import ServiceUnavailable, SessionExpired
+            from docker.errors import DockerException
+            from neo4j.exceptions import DriverError, Neo4jError
+
+            from src.mcp_server.repositories.neo4j_repository import create_neo4j_repositories
+            from src.mcp_server.services.neo4j_bootstrap import (
+                neo4j_endpoint_reachable,
+                prepare_neo4j_connection,
+            )
+            from src.mcp_server.services.neo4j_service_manager import Neo4jServiceError
         except Exception as e:
             logger.warning(f"Neo4j driver not available ({e}). Falling back to SQLite.")
             state_repo, transition_repo = create_sqlite_repositories(
@@ -59,12 +71,9 @@ def main() -> None:
             logger.info(f"Using SQLite at {settings.sqlite_path}")
         else:
             try:
-                from src.mcp_server.repositories.neo4j_repository import (
-                    create_neo4j_repositories,
-                )
-                from src.mcp_server.services.neo4j_bootstrap import prepare_neo4j_connection
-
                 settings = prepare_neo4j_connection(settings)
+                if not neo4j_endpoint_reachable(settings.neo4j_uri):
+                    raise Neo4jServiceError(f"{settings.neo4j_uri} is not accepting connections")
                 state_repo, transition_repo = create_neo4j_repositories(
                     uri=settings.neo4j_uri,
                     user=settings.neo4j_user,
@@ -72,7 +81,7 @@ def main() -> None:
                     settings=settings,
                 )
                 logger.info(f"Connected to Neo4j at {settings.neo4j_uri}")
-            except (ServiceUnavailable, SessionExpired, Exception) as e:
+            except (DriverError, Neo4jError, Neo4jServiceError, DockerException, OSError) as e:
                 logger.warning(f"Neo4j connection failed: {e}. Falling back to SQLite.")
                 state_repo, transition_repo = create_sqlite_repositories(
                     path=settings.sqlite_path,
@@ -95,32 +104,31 @@ def main() -> None:
     )
 
     logger.info("State Service initialized successfully")
-    logger.info("Available MCP Tools:")
-    for tool_name in dir(mcp_tools):
-        if not tool_name.startswith("_"):
-            logger.info(f"  - {tool_name}")
-    print("\nMCP Server is ready to accept connections.")
-    print("Press Ctrl+C to stop.")
+    logger.info("Available MCP Tools: %s", ", ".join(tools.__all__))
+    # stdout carries the MCP JSON-RPC stream, so the ready banner goes through the logger.
+    logger.info("MCP Server is ready to accept connections. Press Ctrl+C to stop.")
 
     # Start the MCP server
     try:
         logger.info("Importing MCP server app...")
-        from .mcp_server import app
+        from .mcp_server import build_app
 
+        app = build_app(settings=settings, state_service=state_service)
         logger.info("MCP server app imported successfully")
 
-        import mcp
+        import logging
 
-        mcp_version = getattr(mcp, "__version__", "unknown")
-        logger.info(f"MCP library version: {mcp_version}")
+        if logger.isEnabledFor(logging.DEBUG):
+            from importlib.metadata import PackageNotFoundError, version
 
-        logger.info("Starting app.run()...")
-        # Enable debug logging for MCP
-        import logging
+            try:
+                mcp_version = version("mcp")
+            except PackageNotFoundError:
+                mcp_version = "unknown"
+            logger.debug(f"MCP library version: {mcp_version}")
 
-        logging.getLogger("mcp").setLevel(logging.DEBUG)
-        logging.getLogger("anyio").setLevel(logging.DEBUG)
-        logging.getLogger("asyncio").setLevel(logging.DEBUG)
+        logger.info("Starting app.run()...")
+        enable_protocol_debug_logging(settings.log_level)
 
         logger.info("Calling app.run()...")
         app.run()
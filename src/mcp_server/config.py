@@ -1,22 +1,71 @@
+import functools
 import os
+from collections import ChainMap
 from pathlib import Path
-from typing import Literal
+from types import MappingProxyType
+from typing import Literal, Mapping
 
-from dotenv import load_dotenv
+from dotenv import dotenv_values
 
 DEFAULT_VOLUME_ROOT = Path("/opt/codebase-state-manager/volumes")
+ENV_FILE_PATH = Path(__file__).parent.parent.parent / ".env"
+_TRUTHY_VALUES = frozenset({"true", "1", "yes", "on"})
 
 
-def _load_env_with_override() -> dict:
-    """Load environment variables from .env file, but respect existing env vars.
+@functools.lru_cache(maxsize=1)
+def _parse_env_file(path: str, mtime: float) -> Mapping[str, str]:
+    """Parse a .env file once per modification time.
+
+    The mtime is part of the cache key so edits to the file are picked up on the
+    next settings load without re-reading an unchanged file.
+    """
+    values = dotenv_values(dotenv_path=path)
+    return MappingProxyType({key: value for key, value in values.items() if value is not None})
+
+
+def _load_env_file() -> Mapping[str, str]:
+    """Return the cached key/value pairs from the project .env file, if any."""
+    try:
+        mtime = ENV_FILE_PATH.stat().st_mtime
+    except OSError:
+        return MappingProxyType({})
+    return _parse_env_file(str(ENV_FILE_PATH), mtime)
+
+
+def _load_env_with_override() -> Mapping[str, str]:
+    """Layer .env values under the process environment.
+
+    Existing environment variables always win over values from the .env file, and
+    the file is not exported into os.environ.
 
     Returns:
-        Dictionary of environment variables from .env file
+        Read-only view of the effective environment
+    """
+    return ChainMap(os.environ, _load_env_file())  # type: ignore[arg-type]
+
+
+def get_env(name: str, default: str | None = None) -> str | None:
+    """Look up a variable in the process environment, falling back to the .env file."""
+    return _load_env_with_override().get(name, default)
+
+
+def _env_bool(env: Mapping[str, str], name: str, default: bool) -> bool:
+    """Parse a boolean flag, falling back to ``default`` only when it is unset.
+
+    A blank value is set but not truthy, so it reads as False.
     """
-    env_path = Path(__file__).parent.parent.parent / ".env"
-    if env_path.exists():
-        load_dotenv(dotenv_path=str(env_path), override=False)
-    return {}
+    raw = env.get(name)
+    if raw is None:
+        return default
+    return raw.strip().lower() in _TRUTHY_VALUES
+
+
+def _env_int(env: Mapping[str, str], name: str, default: int) -> int:
+    """Parse an integer setting without touching ``int()`` when it is unset."""
+    raw = env.get(name)
+    if raw is None:
+        return default
+    return int(raw)
 
 
 def _get_default_volume_path(project_path: Path | None = None) -> str:
@@ -31,6 +80,30 @@ def _get_default_volume_path(project_path: Path | None = None) -> str:
 
 
 class Settings:
+    # Settings are read on every tool call, so keep instances dict-free: slot attributes
+    # resolve through a descriptor instead of an instance __dict__ lookup.
+    __slots__ = (
+        "neo4j_enabled",
+        "db_mode",
+        "neo4j_uri",
+        "neo4j_user",
+        "neo4j_password",
+        "neo4j_bootstrap_mode",
+        "neo4j_auth_enabled",
+        "neo4j_auto_image",
+        "neo4j_auto_home",
+        "neo4j_connection_timeout",
+        "sqlite_path",
+        "docker_volume_name",
+        "docker_container_name",
+        "volume_path",
+        "log_level",
+        "rate_limit_enabled",
+        "audit_enabled",
+        "max_prompt_length",
+        "max_state_number",
+    )
+
     def __init__(  # nosec: B107
         self,
         neo4j_enabled: bool = True,
@@ -89,21 +162,20 @@ class Settings:
 
     @classmethod
     def from_env(cls) -> "Settings":
-        _load_env_with_override()
+        env = _load_env_with_override()
 
-        neo4j_enabled_raw = os.getenv("NEO4J_ENABLED", "true")
-        neo4j_enabled = neo4j_enabled_raw.lower() in ("true", "1", "yes")
+        neo4j_enabled = _env_bool(env, "NEO4J_ENABLED", True)
 
-        db_mode_raw = os.getenv("DB_MODE", "")
+        db_mode_raw = env.get("DB_MODE", "")
         if db_mode_raw in ("neo4j", "sqlite"):
             db_mode: Literal["neo4j", "sqlite"] = db_mode_raw  # type: ignore[assignment]
         else:
             db_mode = "neo4j" if neo4j_enabled else "sqlite"
 
-        neo4j_uri_env = os.getenv("NEO4J_URI")
-        neo4j_user_env = os.getenv("NEO4J_USER")
-        neo4j_password_env = os.getenv("NEO4J_PASSWORD")
-        neo4j_bootstrap_mode_raw = os.getenv("NEO4J_BOOTSTRAP_MODE", "").lower()
+        neo4j_uri_env = env.get("NEO4J_URI")
+        neo4j_user_env = env.get("NEO4J_USER")
+        neo4j_password_env = env.get("NEO4J_PASSWORD")
+        neo4j_bootstrap_mode_raw = env.get("NEO4J_BOOTSTRAP_MODE", "").lower()
         if neo4j_bootstrap_mode_raw in ("auto", "external"):
             neo4j_bootstrap_mode: Literal["auto", "external"] = neo4j_bootstrap_mode_raw  # type: ignore[assignment]
         else:
@@ -116,26 +188,25 @@ class Settings:
         neo4j_user = neo4j_user_env or "neo4j"
         neo4j_password = neo4j_password_env or ""
 
-        neo4j_auth_enabled_raw = os.getenv("NEO4J_AUTH_ENABLED", "")
+        # Unlike the other flags, a blank NEO4J_AUTH_ENABLED keeps the mode-based default
+        neo4j_auth_enabled_raw = env.get("NEO4J_AUTH_ENABLED")
         if neo4j_auth_enabled_raw:
-            neo4j_auth_enabled = neo4j_auth_enabled_raw.lower() in ("true", "1", "yes")
+            neo4j_auth_enabled = neo4j_auth_enabled_raw.strip().lower() in _TRUTHY_VALUES
         else:
             neo4j_auth_enabled = neo4j_bootstrap_mode == "external"
 
-        neo4j_auto_image = os.getenv("NEO4J_AUTO_IMAGE", "neo4j:5.24")
-        neo4j_auto_home = os.getenv("NEO4J_AUTO_HOME", "./.data/neo4j")
-        neo4j_connection_timeout = int(os.getenv("NEO4J_CONNECTION_TIMEOUT", "90"))
-        sqlite_path = os.getenv("SQLITE_PATH", "./data/state_manager.db")
-        docker_container_name = os.getenv("DOCKER_CONTAINER_NAME", "codebase-state-manager")
-        volume_path = os.getenv("VOLUME_PATH") or _get_default_volume_path()
+        neo4j_auto_image = env.get("NEO4J_AUTO_IMAGE", "neo4j:5.24")
+        neo4j_auto_home = env.get("NEO4J_AUTO_HOME", "./.data/neo4j")
+        neo4j_connection_timeout = _env_int(env, "NEO4J_CONNECTION_TIMEOUT", 90)
+        sqlite_path = env.get("SQLITE_PATH", "./data/state_manager.db")
+        docker_container_name = env.get("DOCKER_CONTAINER_NAME", "codebase-state-manager")
+        volume_path = env.get("VOLUME_PATH") or _get_default_volume_path()
         docker_volume_name = volume_path  # Use same path for consistency
-        log_level = os.getenv("LOG_LEVEL", "INFO")
-        rate_limit_enabled_raw = os.getenv("RATE_LIMIT_ENABLED", "true")
-        rate_limit_enabled = rate_limit_enabled_raw.lower() in ("true", "1", "yes")
-        audit_enabled_raw = os.getenv("AUDIT_ENABLED", "true")
-        audit_enabled = audit_enabled_raw.lower() in ("true", "1", "yes")
-        max_prompt_length = int(os.getenv("MAX_PROMPT_LENGTH", "10000"))
-        max_state_number = int(os.getenv("MAX_STATE_NUMBER", "1000000"))
+        log_level = env.get("LOG_LEVEL", "INFO")
+        rate_limit_enabled = _env_bool(env, "RATE_LIMIT_ENABLED", True)
+        audit_enabled = _env_bool(env, "AUDIT_ENABLED", True)
+        max_prompt_length = _env_int(env, "MAX_PROMPT_LENGTH", 10000)
+        max_state_number = _env_int(env, "MAX_STATE_NUMBER", 1000000)
 
         return cls(
             neo4j_enabled=neo4j_enabled,
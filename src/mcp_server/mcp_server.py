@@ -4,32 +4,30 @@ MCP Server for Codebase State Manager
 Integrates the codebase-state-manager-mcp library with MCP protocol
 """
 
+import asyncio
+import atexit
+import functools
+import inspect
 import logging
 import os
 import sys
 import traceback
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import Any, AsyncIterator, Callable, TypeVar
 
 # Add src to path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root / "src"))
 
-from mcp.server.fastmcp import FastMCP
-from neo4j.exceptions import ServiceUnavailable, SessionExpired
+from mcp.server.fastmcp import Context, FastMCP
 
-from .config import get_settings, reset_settings
-from .repositories.neo4j_repository import (
-    Neo4jStateRepository,
-    Neo4jTransitionRepository,
-    create_neo4j_repositories,
-)
-from .repositories.sqlite_repository import (
-    SQLiteStateRepository,
-    SQLiteTransitionRepository,
-    create_sqlite_repositories,
-)
+from .config import Settings, get_settings, reset_settings
+from .repositories.abstract_repositories import StateRepository, TransitionRepository
+from .repositories.sqlite_repository import create_sqlite_repositories
 from .services.git_manager import GitManager
-from .services.neo4j_bootstrap import prepare_neo4j_connection
 from .services.state_service import StateService
 from .tools import (
     arbitrary_state_transition,
@@ -46,6 +44,7 @@ from .tools import (
     get_rewarded_transitions,
     get_state_info,
     get_state_transitions,
+    get_states_info,
     get_transition_info,
     new_state_transition,
     search_states,
@@ -55,298 +54,427 @@ from .tools import (
     total_states,
     track_transitions,
 )
+from .utils.logging import enable_protocol_debug_logging
 
-settings = get_settings()
-
-# Ensure docker_volume_name matches volume_path for consistency
-settings.docker_volume_name = settings.volume_path
+T = TypeVar("T")
 
-state_repo: Neo4jStateRepository | SQLiteStateRepository
-transition_repo: Neo4jTransitionRepository | SQLiteTransitionRepository
+logger = logging.getLogger(__name__)
 
-if settings.db_mode == "neo4j":
-    try:
-        settings = prepare_neo4j_connection(settings)
-        state_repo, transition_repo = create_neo4j_repositories(
-            uri=settings.neo4j_uri,
-            user=settings.neo4j_user,
-            password=settings.neo4j_password,
-            settings=settings,
-        )
-        print(f"[INFO] Using Neo4j: {settings.neo4j_uri}")
-    except (ServiceUnavailable, SessionExpired, Exception) as e:
-        print(f"[WARNING] Neo4j unavailable: {e}, falling back to SQLite")
+_settings: Settings | None = None
+_state_service: StateService | None = None
+
+
+def create_state_service(settings: Settings) -> StateService:
+    """Open the configured repositories and wrap them in a StateService."""
+    state_repo: StateRepository
+    transition_repo: TransitionRepository
+
+    if settings.db_mode == "neo4j":
+        # Only pay for the Neo4j driver and Docker SDK when the graph backend is selected.
+        from docker.errors import DockerException
+        from neo4j.exceptions import DriverError, Neo4jError
+
+        from .repositories.neo4j_repository import create_neo4j_repositories
+        from .services.neo4j_bootstrap import neo4j_endpoint_reachable, prepare_neo4j_connection
+        from .services.neo4j_service_manager import Neo4jServiceError
+
+        try:
+            settings = prepare_neo4j_connection(settings)
+            if not neo4j_endpoint_reachable(settings.neo4j_uri):
+                raise Neo4jServiceError(f"{settings.neo4j_uri} is not accepting connections")
+            state_repo, transition_repo = create_neo4j_repositories(
+                uri=settings.neo4j_uri,
+                user=settings.neo4j_user,
+                password=settings.neo4j_password,
+                settings=settings,
+            )
+            logger.info("Using Neo4j: %s", settings.neo4j_uri)
+        except (DriverError, Neo4jError, Neo4jServiceError, DockerException, OSError) as e:
+            logger.warning(
+                "Neo4j unavailable: %s, falling back to SQLite: %s", e, settings.sqlite_path
+            )
+            state_repo, transition_repo = create_sqlite_repositories(
+                path=settings.sqlite_path,
+                settings=settings,
+            )
+    else:
         state_repo, transition_repo = create_sqlite_repositories(
             path=settings.sqlite_path,
             settings=settings,
         )
-        print(f"[INFO] Using SQLite: {settings.sqlite_path}")
-else:
-    state_repo, transition_repo = create_sqlite_repositories(
-        path=settings.sqlite_path,
+        logger.info("Using SQLite: %s", settings.sqlite_path)
+
+    return StateService(
+        state_repo=state_repo,
+        transition_repo=transition_repo,
+        git_manager=GitManager(),
         settings=settings,
     )
-    print(f"[INFO] Using SQLite: {settings.sqlite_path}")
-
-git_manager = GitManager()
-state_service = StateService(
-    state_repo=state_repo,
-    transition_repo=transition_repo,
-    git_manager=git_manager,
-    settings=settings,
-)
 
-app = FastMCP("codebase-state-manager")
 
+def build_app(
+    settings: Settings | None = None, state_service: StateService | None = None
+) -> FastMCP:
+    """Bind the tool wrappers to a StateService and return the FastMCP app.
 
-@app.tool()
-async def genesis_tool(state_representation: str = "raw") -> dict:
-    """Initialize the state machine for a project.
+    Args:
+        settings: Settings to use, defaults to the process-wide settings
+        state_service: Already-built service to reuse instead of opening the repositories again
 
-    Creates state #0 and sets up the codebase state machine.
-    Automatically detects project path and uses default volume.
+    Returns:
+        The module-level FastMCP app
     """
-    from pathlib import Path
-
-    # Auto-detect project path (current working directory)
-    project_path = str(Path.cwd())
+    global _settings, _state_service
 
-    # Use configured volume path
-    volume_path = settings.volume_path
+    resolved_settings = settings or get_settings()
+    # Ensure docker_volume_name matches volume_path for consistency
+    resolved_settings.docker_volume_name = resolved_settings.volume_path
 
-    result = genesis(
-        state_service=state_service,
-        project_path=project_path,
-        volume_path=volume_path,
-        state_representation=state_representation,
-    )
-    return result
+    _state_service = state_service or create_state_service(resolved_settings)
+    _settings = _state_service.settings
+    return app
 
 
-@app.tool()
-async def start_genesis_tool() -> dict:
-    """Start an idempotent background genesis for the current project."""
-    project_path = str(Path.cwd())
-    volume_path = settings.volume_path
-    result = start_genesis(
-        state_service=state_service,
-        project_path=project_path,
-        volume_path=volume_path,
-    )
-    return result
+# StateService keeps unsynchronised caches and the SQLite engine shares one connection
+# (StaticPool), so blocking service calls run one at a time on a dedicated worker thread.
+# This keeps the event loop free for protocol traffic and cheap job-status tools.
+_service_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="state-service")
 
+# Upper bound on service calls queued on or running in the worker. Callers beyond it
+# wait on the event loop, where cancellation is free, instead of piling work into the
+# executor queue that would still run after the client has gone away.
+MAX_PENDING_SERVICE_CALLS = max(4, os.cpu_count() or 1)
+_service_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
 
-@app.tool()
-async def get_genesis_status_tool(job_id: str) -> dict:
-    """Get status for a background genesis job."""
-    result = get_genesis_status(job_id=job_id)
-    return result
 
+def _get_service_slots(loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+    slots = _service_slots.get(loop)
+    if slots is None:
+        slots = _service_slots[loop] = asyncio.Semaphore(MAX_PENDING_SERVICE_CALLS)
+    return slots
 
-@app.tool()
-async def get_genesis_result_tool(job_id: str, state_representation: str = "raw") -> dict:
-    """Get result for a background genesis job."""
-    result = get_genesis_result(job_id=job_id, state_representation=state_representation)
-    return result
 
+async def _call_service(func: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    """Run a blocking StateService-backed call on the service worker thread.
 
-@app.tool()
-async def get_current_state_number_tool() -> dict:
-    """Get the current state number."""
-    result = get_current_state_number(state_service=state_service)
-    return result
+    The caller's slot is held until the job itself finishes, not until the caller stops
+    waiting: cancelling the await (e.g. a batch timeout) cannot stop a job that has
+    started, so it keeps counting against MAX_PENDING_SERVICE_CALLS until it is done.
+    """
+    loop = asyncio.get_running_loop()
+    slots = _get_service_slots(loop)
+    await slots.acquire()
+    try:
+        future = _service_executor.submit(functools.partial(func, *args, **kwargs))
+    except BaseException:
+        slots.release()
+        raise
 
+    def release_slot(_: Any) -> None:
+        try:
+            loop.call_soon_threadsafe(slots.release)
+        except RuntimeError:
+            pass  # The loop has already closed; its semaphore went with it.
+
+    future.add_done_callback(release_slot)
+    return await asyncio.wrap_future(future, loop=loop)
+
+
+def _get_state_service() -> StateService:
+    if _state_service is None:
+        build_app()
+    assert _state_service is not None
+    return _state_service
+
+
+def _get_settings() -> Settings:
+    if _settings is None:
+        build_app()
+    assert _settings is not None
+    return _settings
+
+
+def _close_state_service(state_service: StateService) -> None:
+    global _settings, _state_service
+    for repo in (state_service.state_repo, state_service.transition_repo):
+        close = getattr(repo, "close", None)
+        if close is None:
+            continue
+        try:
+            close()
+        except Exception:
+            logger.warning("Failed to close repository", exc_info=True)
+    if _state_service is state_service:
+        _settings = None
+        _state_service = None
+
+
+@atexit.register
+def _close_state_service_at_exit() -> None:
+    # Runs after the executors' worker threads have been joined, so no service call or
+    # volume-fix job is still using the repositories.
+    if _state_service is not None:
+        _close_state_service(_state_service)
+
+
+@asynccontextmanager
+async def lifespan(server: FastMCP) -> AsyncIterator[dict[str, StateService]]:
+    """Open the repositories before serving requests and publish the shared service.
+
+    FastMCP enters the lifespan once per client session (each SSE or streamable HTTP
+    connection), so the repositories are not closed here: one client disconnecting must
+    not tear down the service other sessions and background jobs still use. They are
+    closed once, at process exit.
+    """
+    state_service = await _call_service(_get_state_service)
+    yield {"state_service": state_service}
 
-@app.tool()
-async def fix_volume_path_tool() -> dict:
-    """Rebuild only the configured VOLUME_PATH from the current project."""
-    project_path = str(Path.cwd())
-    result = fix_volume_path(
-        state_service=state_service,
-        project_path=project_path,
-    )
-    return result
 
+def _service_from_context(ctx: Context | None) -> StateService | None:
+    """Return the service the lifespan published for this request, if there is one."""
+    if ctx is None:
+        return None
+    try:
+        lifespan_context = ctx.request_context.lifespan_context
+    except ValueError:
+        return None
+    if isinstance(lifespan_context, dict):
+        return lifespan_context.get("state_service")
+    return None
 
-@app.tool()
-async def start_fix_volume_path_tool() -> dict:
-    """Start an idempotent background rebuild of the configured VOLUME_PATH."""
-    project_path = str(Path.cwd())
-    result = start_fix_volume_path(
-        state_service=state_service,
-        project_path=project_path,
-    )
-    return result
 
+async def _call_with_service(
+    ctx: Context | None, func: Callable[..., T], /, *args: Any, **kwargs: Any
+) -> T:
+    """Run ``func(*args, state_service=..., **kwargs)`` on the service worker thread.
 
-@app.tool()
-async def get_fix_volume_path_status_tool(job_id: str) -> dict:
-    """Get status for a background VOLUME_PATH rebuild job."""
-    result = get_fix_volume_path_status(job_id=job_id)
-    return result
+    The service comes from the request's lifespan context; outside a request it is
+    resolved on the worker, so a first-time build never blocks the event loop.
+    """
+    state_service = _service_from_context(ctx)
 
+    def run() -> T:
+        return func(*args, state_service=state_service or _get_state_service(), **kwargs)
 
-@app.tool()
-async def get_fix_volume_path_result_tool(job_id: str) -> dict:
-    """Get result for a background VOLUME_PATH rebuild job."""
-    result = get_fix_volume_path_result(job_id=job_id)
-    return result
+    return await _call_service(run)
 
 
-@app.tool()
-async def total_states_tool() -> dict:
-    """Get the total number of states."""
-    result = total_states(state_service=state_service)
-    return result
+app = FastMCP("codebase-state-manager", lifespan=lifespan)
 
 
-@app.tool()
-async def new_state_transition_tool(
-    user_prompt: str,
-    reward: float | None = None,
-    state_representation: str = "raw",
+def _genesis_in_configured_volume(
+    state_service: StateService, project_path: str, state_representation: str
 ) -> dict:
-    """Create a new state transition from the current state."""
-    result = new_state_transition(
+    return genesis(
         state_service=state_service,
-        user_prompt=user_prompt,
-        reward=reward,
+        project_path=project_path,
+        volume_path=state_service.settings.volume_path,
         state_representation=state_representation,
     )
-    return result
 
 
-@app.tool()
-async def get_current_state_info_tool(state_representation: str = "raw") -> dict:
-    """Get full context of the current state."""
-    result = get_current_state_info(
+def _start_genesis_in_configured_volume(state_service: StateService, project_path: str) -> dict:
+    return start_genesis(
         state_service=state_service,
-        state_representation=state_representation,
+        project_path=project_path,
+        volume_path=state_service.settings.volume_path,
     )
-    return result
 
 
 @app.tool()
-async def search_states_tool(text: str) -> dict:
-    """Search states by prompt content."""
-    result = search_states(
-        state_service=state_service,
-        text=text,
-    )
-    return result
-
+async def genesis_tool(state_representation: str = "raw", ctx: Context | None = None) -> dict:
+    """Initialize the state machine for a project.
 
-@app.tool()
-async def arbitrary_state_transition_tool(
-    next_state: int,
-    user_prompt: str | None = None,
-    state_representation: str = "raw",
-) -> dict:
-    """Performs an arbitrary state transition from the current state to a given next_state number."""
-    result = arbitrary_state_transition(
-        state_service=state_service,
-        next_state=next_state,
-        user_prompt=user_prompt,
+    Creates state #0 and sets up the codebase state machine.
+    Automatically detects project path and uses default volume.
+    """
+    # Auto-detect project path (current working directory); the volume is the configured one
+    project_path = str(Path.cwd())
+    result = await _call_with_service(
+        ctx,
+        _genesis_in_configured_volume,
+        project_path=project_path,
         state_representation=state_representation,
     )
     return result
 
 
 @app.tool()
-async def get_state_info_tool(state: int, state_representation: str = "raw") -> dict:
-    """Get information for a specific state."""
-    result = get_state_info(
-        state_service=state_service,
-        state=state,
-        state_representation=state_representation,
+async def start_genesis_tool(ctx: Context | None = None) -> dict:
+    """Start an idempotent background genesis for the current project."""
+    project_path = str(Path.cwd())
+    result = await _call_with_service(
+        ctx, _start_genesis_in_configured_volume, project_path=project_path
     )
     return result
 
 
 @app.tool()
-async def get_state_transitions_tool(state: int) -> dict:
-    """Get transitions for a specific state."""
-    result = get_state_transitions(state_service=state_service, state=state)
+async def get_genesis_status_tool(job_id: str) -> dict:
+    """Get status for a background genesis job."""
+    result = get_genesis_status(job_id=job_id)
     return result
 
 
 @app.tool()
-async def get_transition_info_tool(transition_id: str) -> dict:
-    """Get information for a specific transition."""
-    result = get_transition_info(state_service=state_service, transition_id=transition_id)
+async def get_genesis_result_tool(job_id: str, state_representation: str = "raw") -> dict:
+    """Get result for a background genesis job."""
+    result = get_genesis_result(job_id=job_id, state_representation=state_representation)
     return result
 
 
-@app.tool()
-async def track_transitions_tool() -> dict:
-    """Get the last 5 transitions."""
-    result = track_transitions(state_service=state_service)
-    return result
+# Tools that only forward their arguments to a tools.* function, together with the
+# description clients see. Each one is exposed with the function's own signature minus
+# the injected state_service and the internal client_id.
+_SERVICE_TOOL_TABLE: tuple[tuple[str, Callable[..., dict], str], ...] = (
+    ("get_current_state_number_tool", get_current_state_number, "Get the current state number."),
+    ("total_states_tool", total_states, "Get the total number of states."),
+    (
+        "new_state_transition_tool",
+        new_state_transition,
+        "Create a new state transition from the current state.",
+    ),
+    (
+        "get_current_state_info_tool",
+        get_current_state_info,
+        "Get full context of the current state.",
+    ),
+    ("search_states_tool", search_states, "Search states by prompt content."),
+    (
+        "arbitrary_state_transition_tool",
+        arbitrary_state_transition,
+        "Performs an arbitrary state transition from the current state to a given next_state number.",
+    ),
+    ("get_state_info_tool", get_state_info, "Get information for a specific state."),
+    (
+        "get_states_info_tool",
+        get_states_info,
+        "Get information for several states in one call, ordered by state number.",
+    ),
+    ("get_state_transitions_tool", get_state_transitions, "Get transitions for a specific state."),
+    ("get_transition_info_tool", get_transition_info, "Get information for a specific transition."),
+    ("track_transitions_tool", track_transitions, "Get the last 5 transitions."),
+    (
+        "get_current_state_compact_context_tool",
+        get_current_state_compact_context,
+        "Get a non-persisted compact preview of the current workspace.",
+    ),
+    (
+        "get_compact_states_tool",
+        get_compact_states,
+        "Get compact state payloads for one state, an inclusive range, or all states.",
+    ),
+    (
+        "get_rewarded_transitions_tool",
+        get_rewarded_transitions,
+        "Get transitions with non-null reward values.",
+    ),
+    ("set_transition_reward_tool", set_transition_reward, "Set or update a transition reward."),
+)
+_HIDDEN_TOOL_PARAMETERS = frozenset({"state_service", "client_id"})
+_CONTEXT_PARAMETER = inspect.Parameter(
+    "ctx", inspect.Parameter.KEYWORD_ONLY, default=None, annotation=Context | None
+)
 
 
-@app.tool()
-async def get_current_state_compact_context_tool(include_vocabulary: bool = False) -> dict:
-    """Get a non-persisted compact preview of the current workspace."""
-    result = get_current_state_compact_context(
-        state_service=state_service,
-        include_vocabulary=include_vocabulary,
+def _make_service_tool(name: str, func: Callable[..., dict], doc: str) -> Callable[..., Any]:
+    """Build an async tool that runs ``func`` on the service worker with the shared service."""
+    signature = inspect.signature(func)
+    parameters = [
+        parameter
+        for parameter in signature.parameters.values()
+        if parameter.name not in _HIDDEN_TOOL_PARAMETERS
+    ]
+
+    func_name = func.__name__
+
+    async def tool(ctx: Context | None = None, **kwargs: Any) -> dict:
+        # Resolve the target by name at call time, like a hand-written wrapper would,
+        # so replacing the module attribute (e.g. in tests) takes effect.
+        target = globals()[func_name]
+        return await _call_with_service(ctx, target, **kwargs)
+
+    # FastMCP injects the request Context into the parameter annotated with it.
+    parameters.append(_CONTEXT_PARAMETER)
+    tool.__name__ = tool.__qualname__ = name
+    tool.__doc__ = doc
+    tool.__signature__ = signature.replace(  # type: ignore[attr-defined]
+        parameters=parameters, return_annotation=dict
     )
-    return result
+    tool.__annotations__ = {p.name: p.annotation for p in parameters} | {"return": dict}
+    return tool
+
+
+_SERVICE_TOOLS = {
+    name: app.tool(name=name)(_make_service_tool(name, func, doc))
+    for name, func, doc in _SERVICE_TOOL_TABLE
+}
+globals().update(_SERVICE_TOOLS)
 
 
 @app.tool()
-async def get_compact_states_tool(
-    state: int | None = None,
-    start_state: int | None = None,
-    end_state: int | None = None,
-) -> dict:
-    """Get compact state payloads for one state, an inclusive range, or all states."""
-    result = get_compact_states(
-        state_service=state_service,
-        state=state,
-        start_state=start_state,
-        end_state=end_state,
-    )
+async def fix_volume_path_tool(ctx: Context | None = None) -> dict:
+    """Rebuild only the configured VOLUME_PATH from the current project."""
+    project_path = str(Path.cwd())
+    result = await _call_with_service(ctx, fix_volume_path, project_path=project_path)
     return result
 
 
 @app.tool()
-async def get_rewarded_transitions_tool() -> dict:
-    """Get transitions with non-null reward values."""
-    result = get_rewarded_transitions(state_service=state_service)
+async def start_fix_volume_path_tool(ctx: Context | None = None) -> dict:
+    """Start an idempotent background rebuild of the configured VOLUME_PATH."""
+    project_path = str(Path.cwd())
+    result = await _call_with_service(ctx, start_fix_volume_path, project_path=project_path)
     return result
 
 
 @app.tool()
-async def set_transition_reward_tool(
-    reward: float | None,
-    transition_id: int | None = None,
-    current_state: int | None = None,
-    next_state: int | None = None,
-) -> dict:
-    """Set or update a transition reward."""
-    result = set_transition_reward(
-        state_service=state_service,
-        reward=reward,
-        transition_id=transition_id,
-        current_state=current_state,
-        next_state=next_state,
-    )
+async def get_fix_volume_path_status_tool(job_id: str) -> dict:
+    """Get status for a background VOLUME_PATH rebuild job."""
+    result = get_fix_volume_path_status(job_id=job_id)
     return result
 
 
 @app.tool()
-async def get_current_state_transitions_tool() -> dict:
-    """Get transitions for the current state."""
+async def get_fix_volume_path_result_tool(job_id: str) -> dict:
+    """Get result for a background VOLUME_PATH rebuild job."""
+    result = get_fix_volume_path_result(job_id=job_id)
+    return result
+
+
+def _current_state_transitions(state_service: StateService) -> dict:
     current = state_service.get_current_state_number()
     if current[0] is None:
         return {"success": False, "message": "No current state"}
-    result = get_state_transitions(state_service=state_service, state=current[0])
+    return get_state_transitions(state_service=state_service, state=current[0])
+
+
+@app.tool()
+async def get_current_state_transitions_tool(ctx: Context | None = None) -> dict:
+    """Get transitions for the current state."""
+    result = await _call_with_service(ctx, _current_state_transitions)
     return result
 
 
+def _check_consistency(state_service: StateService) -> list:
+    return state_service.get_consistency_checker().check_all()
+
+
+def _repair_consistency(state_service: StateService) -> tuple[list, dict, list]:
+    """Check, auto-repair and re-check with one checker, which keeps the found issues."""
+    checker = state_service.get_consistency_checker()
+    issues = checker.check_all()
+    if not issues:
+        return issues, {}, []
+    repair_results = checker.auto_repair()
+    state_service.invalidate_read_caches()
+    return issues, repair_results, checker.check_all()
+
+
 @app.tool()
-async def check_consistency_tool() -> dict:
+async def check_consistency_tool(ctx: Context | None = None) -> dict:
     """Check system consistency and report any issues found.
 
     Checks for:
@@ -362,15 +490,8 @@ async def check_consistency_tool() -> dict:
         - issues: list of issues found (each with severity, category, message)
         - summary: human-readable summary
     """
-    from .utils.consistency_checker import ConsistencyChecker
-
     try:
-        checker = ConsistencyChecker(
-            state_repo=state_repo,
-            volume_path=settings.docker_volume_name,
-            db_path=settings.sqlite_path,
-        )
-        issues = checker.check_all()
+        issues = await _call_with_service(ctx, _check_consistency)
 
         if not issues:
             return {
@@ -412,7 +533,7 @@ async def check_consistency_tool() -> dict:
 
 
 @app.tool()
-async def repair_consistency_tool() -> dict:
+async def repair_consistency_tool(ctx: Context | None = None) -> dict:
     """Attempt to automatically repair consistency issues.
 
     This tool will:
@@ -428,18 +549,12 @@ async def repair_consistency_tool() -> dict:
         - remaining_issues: list of issues still present after repair
         - summary: human-readable summary
     """
-    from .utils.consistency_checker import ConsistencyChecker
-
     try:
-        checker = ConsistencyChecker(
-            state_repo=state_repo,
-            volume_path=settings.docker_volume_name,
-            db_path=settings.sqlite_path,
+        # Check for issues, attempt repairs, then re-check
+        issues, repair_results, remaining_issues = await _call_with_service(
+            ctx, _repair_consistency
         )
 
-        # Check for issues
-        issues = checker.check_all()
-
         if not issues:
             return {
                 "success": True,
@@ -449,9 +564,6 @@ async def repair_consistency_tool() -> dict:
                 "summary": "✓ No consistency issues found. Nothing to repair.",
             }
 
-        # Attempt repairs
-        repair_results = checker.auto_repair()
-
         repaired = []
         failed = []
         for issue_msg, success in repair_results.items():
@@ -460,8 +572,6 @@ async def repair_consistency_tool() -> dict:
             else:
                 failed.append(issue_msg)
 
-        # Re-check
-        remaining_issues = checker.check_all()
         remaining_list = [
             {
                 "severity": issue.severity,
@@ -493,11 +603,101 @@ async def repair_consistency_tool() -> dict:
         return {"success": False, "error": str(e), "summary": f"Failed to repair consistency: {e}"}
 
 
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-logger.info(
-    f"MCP Server initialized with app methods: {[name for name in dir(app) if not name.startswith('_')]}"
-)
+MAX_BATCH_CALLS = 50
+DEFAULT_BATCH_MAX_CONCURRENT = 4
+
+
+async def _run_batch_call(
+    index: int,
+    call: dict,
+    semaphore: asyncio.Semaphore,
+    stop_event: asyncio.Event,
+    stop_on_error: bool,
+    timeout_seconds: float | None,
+    ctx: Context | None,
+) -> dict[str, Any]:
+    tool_name = call.get("tool")
+    entry: dict[str, Any] = {"index": index, "tool": tool_name}
+    tool = _BATCHABLE_TOOLS.get(tool_name) if isinstance(tool_name, str) else None
+    args = call.get("args") or {}
+    if tool is None:
+        entry.update(success=False, error=f"Unknown tool: {tool_name}")
+    elif not isinstance(args, dict):
+        entry.update(success=False, error="args must be an object")
+    else:
+        async with semaphore:
+            if stop_event.is_set():
+                entry.update(success=False, skipped=True, error="Skipped after earlier failure")
+                return entry
+            try:
+                # Tool.run validates and coerces args like a direct call to the tool would
+                result = await asyncio.wait_for(tool.run(args, context=ctx), timeout_seconds)
+            except asyncio.TimeoutError:
+                entry.update(success=False, error=f"Timed out after {timeout_seconds}s")
+            except Exception as e:
+                entry.update(success=False, error=f"{type(e).__name__}: {e}")
+            else:
+                failed = isinstance(result, dict) and result.get("success") is False
+                entry.update(success=not failed, result=result)
+
+    if stop_on_error and not entry["success"]:
+        stop_event.set()
+    return entry
+
+
+@app.tool()
+async def batch_execute_tool(
+    calls: list[dict],
+    max_concurrent: int = DEFAULT_BATCH_MAX_CONCURRENT,
+    stop_on_error: bool = False,
+    timeout_ms: int | None = None,
+    ctx: Context | None = None,
+) -> dict:
+    """Run several tool calls in one request and return their results in order.
+
+    Each call is ``{"tool": "<tool name>", "args": {...}}`` naming any other tool
+    exposed by this server. Sub-calls share the server's StateService, and their args
+    are validated against that tool's schema. A sub-call that times out is reported
+    as failed, but if it already started on the service worker it still runs to
+    completion there.
+
+    Args:
+        calls: Sub-calls to execute (at most 50)
+        max_concurrent: Maximum number of sub-calls in flight at once
+        stop_on_error: Skip sub-calls that have not started once one fails
+        timeout_ms: Optional per-call timeout in milliseconds
+    """
+    if len(calls) > MAX_BATCH_CALLS:
+        return {
+            "success": False,
+            "message": f"Batch exceeds maximum of {MAX_BATCH_CALLS} calls",
+        }
+
+    semaphore = asyncio.Semaphore(max(1, max_concurrent))
+    stop_event = asyncio.Event()
+    timeout_seconds = timeout_ms / 1000 if timeout_ms else None
+    results = await asyncio.gather(
+        *(
+            _run_batch_call(index, call, semaphore, stop_event, stop_on_error, timeout_seconds, ctx)
+            for index, call in enumerate(calls)
+        )
+    )
+
+    failed = sum(1 for result in results if not result["success"])
+    return {
+        "success": failed == 0,
+        "results": results,
+        "message": f"{len(results) - failed}/{len(results)} calls succeeded",
+    }
+
+
+# Diagnostics go to stderr only; stdout carries the MCP JSON-RPC stream.
+logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+if logger.isEnabledFor(logging.DEBUG):
+    logger.debug(
+        "MCP Server initialized with app methods: %s",
+        [name for name in dir(app) if not name.startswith("_")],
+    )
 
 # List the tool functions we've registered
 registered_tool_names = [
@@ -516,6 +716,7 @@ registered_tool_names = [
     "search_states_tool",
     "arbitrary_state_transition_tool",
     "get_state_info_tool",
+    "get_states_info_tool",
     "get_state_transitions_tool",
     "get_transition_info_tool",
     "track_transitions_tool",
@@ -526,28 +727,29 @@ registered_tool_names = [
     "get_current_state_transitions_tool",
     "check_consistency_tool",
     "repair_consistency_tool",
+    "batch_execute_tool",
 ]
-logger.info(f"Manually registered tool functions: {registered_tool_names}")
+_BATCHABLE_TOOLS = {
+    name: app._tool_manager.get_tool(name)
+    for name in registered_tool_names
+    if name != "batch_execute_tool"
+}
+logger.debug("Manually registered tool functions: %s", registered_tool_names)
 
 
 def main():
-    # Enable debug logging for MCP and anyio
+    log_level = get_settings().log_level
     logging.basicConfig(
-        level=logging.DEBUG,
+        level=getattr(logging, log_level.upper(), logging.INFO),
         format="[MCP] %(asctime)s - %(name)s - %(levelname)s - %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S",
         stream=sys.stderr,
     )
-
-    # Set specific loggers to DEBUG
-    logging.getLogger("mcp").setLevel(logging.DEBUG)
-    logging.getLogger("anyio").setLevel(logging.DEBUG)
-    logging.getLogger("asyncio").setLevel(logging.DEBUG)
-
-    logger = logging.getLogger(__name__)
+    enable_protocol_debug_logging(log_level)
 
     logger.info("Starting MCP server with FastMCP...")
-    logger.info(f"Database mode: {settings.db_mode}")
+    build_app()
+    logger.info(f"Database mode: {_get_settings().db_mode}")
 
     try:
         logger.info("Calling app.run()...")
@@ -1,11 +1,45 @@
+import functools
 from abc import ABC, abstractmethod
-from datetime import datetime, timezone
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
 from enum import Enum
 from typing import Dict, Optional
 
+# Bound once at import: these run for every State/Transition built or loaded.
+_UTC = timezone.utc
+_now = datetime.now
+_fromiso = datetime.fromisoformat
+
 
 def now_utc() -> datetime:
-    return datetime.now(timezone.utc)
+    return _now(_UTC)
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_iso_datetime(value: str) -> datetime:
+    """Parse an ISO-8601 timestamp, memoized on the string.
+
+    datetime objects are immutable, so sharing one instance between states loaded
+    with the same timestamp is safe. A trailing ``Z`` is accepted on Python 3.10,
+    whose fromisoformat only understands numeric offsets.
+    """
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    return _fromiso(value)
+
+
+def format_iso_datetime(value: datetime) -> str:
+    """Format a timestamp as ISO-8601, memoized on the instant and its UTC offset.
+
+    Datetimes for the same instant in different offsets compare and hash equal, so
+    the offset is part of the cache key to keep each one's own rendering.
+    """
+    return _format_iso(value, value.utcoffset())
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_iso(value: datetime, offset: Optional[timedelta]) -> str:
+    return value.isoformat()
 
 
 class BranchState(str, Enum):
@@ -20,34 +54,27 @@ class BranchState(str, Enum):
     DETACHED_HEAD = "detached_head"
 
 
+@dataclass(slots=True, eq=False)
 class State:
-    def __init__(
-        self,
-        state_number: int,
-        user_prompt: str,
-        branch_name: str,
-        git_diff_info: str,
-        hash: str,
-        created_at: Optional[datetime] = None,
-        file_hashes: Optional[Dict[str, str]] = None,
-        file_hash_deltas: Optional[Dict[str, Optional[str]]] = None,
-        llm_context: Optional[str] = None,
-        compression_version: Optional[str] = None,
-        compacted_at: Optional[datetime] = None,
-    ) -> None:
-        self.state_number = state_number
-        self.user_prompt = user_prompt
-        self.branch_name = branch_name
-        self.git_diff_info = git_diff_info
-        self.hash = hash
-        self.created_at = created_at or now_utc()
-        # For genesis state (0): store full hashes
-        # For transition states (1+): store None to save space, reconstruct on-demand
-        self.file_hashes = file_hashes
-        self.file_hash_deltas = file_hash_deltas or {}
-        self.llm_context = llm_context
-        self.compression_version = compression_version
-        self.compacted_at = compacted_at
+    state_number: int
+    user_prompt: str
+    branch_name: str
+    git_diff_info: str
+    hash: str
+    created_at: Optional[datetime] = None
+    # For genesis state (0): store full hashes
+    # For transition states (1+): store None to save space, reconstruct on-demand
+    file_hashes: Optional[Dict[str, str]] = None
+    file_hash_deltas: Dict[str, Optional[str]] = field(default_factory=dict)
+    llm_context: Optional[str] = None
+    compression_version: Optional[str] = None
+    compacted_at: Optional[datetime] = None
+
+    def __post_init__(self) -> None:
+        if self.created_at is None:
+            self.created_at = now_utc()
+        if not self.file_hash_deltas:
+            self.file_hash_deltas = {}
 
     def to_dict(self) -> dict:
         return {
@@ -56,12 +83,12 @@ class State:
             "branch_name": self.branch_name,
             "git_diff_info": self.git_diff_info,
             "hash": self.hash,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "created_at": format_iso_datetime(self.created_at) if self.created_at else None,
             "file_hashes": self.file_hashes,
             "file_hash_deltas": self.file_hash_deltas,
             "llm_context": self.llm_context,
             "compression_version": self.compression_version,
-            "compacted_at": self.compacted_at.isoformat() if self.compacted_at else None,
+            "compacted_at": format_iso_datetime(self.compacted_at) if self.compacted_at else None,
         }
 
     def get_file_hashes(self, state_service=None):
@@ -91,14 +118,14 @@ class State:
         created_at = None
         if data.get("created_at"):
             if isinstance(data["created_at"], str):
-                created_at = datetime.fromisoformat(data["created_at"])
+                created_at = parse_iso_datetime(data["created_at"])
             else:
                 created_at = data["created_at"]
 
         compacted_at = None
         if data.get("compacted_at"):
             if isinstance(data["compacted_at"], str):
-                compacted_at = datetime.fromisoformat(data["compacted_at"])
+                compacted_at = parse_iso_datetime(data["compacted_at"])
             else:
                 compacted_at = data["compacted_at"]
 
@@ -117,22 +144,18 @@ class State:
         )
 
 
+@dataclass(slots=True, eq=False)
 class Transition:
-    def __init__(
-        self,
-        transition_id: int,
-        current_state: int,
-        next_state: int,
-        user_prompt: Optional[str] = None,
-        timestamp: Optional[datetime] = None,
-        reward: Optional[float] = None,
-    ) -> None:
-        self.transition_id = transition_id
-        self.current_state = current_state
-        self.next_state = next_state
-        self.user_prompt = user_prompt
-        self.timestamp = timestamp or now_utc()
-        self.reward = reward
+    transition_id: int
+    current_state: int
+    next_state: int
+    user_prompt: Optional[str] = None
+    timestamp: Optional[datetime] = None
+    reward: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        if self.timestamp is None:
+            self.timestamp = now_utc()
 
     def to_dict(self) -> dict:
         return {
@@ -140,7 +163,7 @@ class Transition:
             "current_state": self.current_state,
             "next_state": self.next_state,
             "user_prompt": self.user_prompt,
-            "timestamp": self.timestamp.isoformat() if self.timestamp else None,
+            "timestamp": format_iso_datetime(self.timestamp) if self.timestamp else None,
             "reward": self.reward,
         }
 
@@ -149,7 +172,7 @@ class Transition:
         timestamp = None
         if data.get("timestamp"):
             if isinstance(data["timestamp"], str):
-                timestamp = datetime.fromisoformat(data["timestamp"])
+                timestamp = parse_iso_datetime(data["timestamp"])
             else:
                 timestamp = data["timestamp"]
         transition_id = data.get("transition_id")
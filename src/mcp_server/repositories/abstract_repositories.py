@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from ..models.state_model import State, Transition
 
@@ -10,10 +10,25 @@ class StateRepository(ABC):
     def create(self, state: State) -> bool:
         pass
 
+    def create_many(self, states: List[State]) -> int:
+        """Persist several states and return how many were written.
+
+        Backends override this with batched writes; the default creates them one by one.
+        """
+        return sum(1 for state in states if self.create(state))
+
     @abstractmethod
     def get_by_number(self, state_number: int) -> Optional[State]:
         pass
 
+    def get_many(self, state_numbers: List[int]) -> List[State]:
+        """Return the existing states among ``state_numbers``, ordered by state number.
+
+        Backends override this with a single query; the default looks them up one by one.
+        """
+        states = (self.get_by_number(number) for number in sorted(set(state_numbers)))
+        return [state for state in states if state is not None]
+
     @abstractmethod
     def get_current(self) -> Optional[State]:
         pass
@@ -22,6 +37,14 @@ class StateRepository(ABC):
     def get_all(self) -> List[State]:
         pass
 
+    def get_state_numbers(self) -> List[int]:
+        """Return every stored state number in ascending order.
+
+        For callers that only need the numbers; backends override this with a
+        projection that skips building State objects.
+        """
+        return [state.state_number for state in self.get_all()]
+
     @abstractmethod
     def exists(self, state_number: int) -> bool:
         pass
@@ -48,6 +71,15 @@ class StateRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    def set_file_hashes(self, state_number: int, file_hashes: Dict[str, str]) -> bool:
+        """Store a full file-hash snapshot on an existing state.
+
+        Used to attach checkpoint snapshots once create_next has assigned the number.
+        Returns True if the state was updated, False otherwise.
+        """
+        pass
+
     @abstractmethod
     def set_current(self, state_number: int) -> bool:
         """Set the current state explicitly.
@@ -74,6 +106,13 @@ class TransitionRepository(ABC):
     def create(self, transition: Transition) -> bool:
         pass
 
+    def create_many(self, transitions: List[Transition]) -> int:
+        """Persist several transitions with their own ids and return how many were written.
+
+        Backends override this with batched writes; the default creates them one by one.
+        """
+        return sum(1 for transition in transitions if self.create(transition))
+
     @abstractmethod
     def create_next(self, transition: Transition) -> bool:
         """Create a new transition with the next sequential transition ID.
@@ -1,14 +1,28 @@
 import json
+import logging
+import threading
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Optional
+from operator import itemgetter
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, TypeVar
 
-from neo4j import Driver, GraphDatabase
+from neo4j import Driver, GraphDatabase, Record, Session, SummaryCounters
 
 from ..config import Settings
-from ..models.state_model import State, Transition
+from ..models.state_model import State, Transition, parse_iso_datetime
 from ..repositories.abstract_repositories import StateRepository, TransitionRepository
+from ..utils import json_codec
 from ..utils.hash import generate_state_hash
 
+_RowT = TypeVar("_RowT")
+
+logger = logging.getLogger(__name__)
+
+MAX_CONNECTION_POOL_SIZE = 50
+CONNECTION_ACQUISITION_TIMEOUT_SECONDS = 60
+# Rows sent per UNWIND write in create_many; each batch is its own transaction.
+BULK_WRITE_BATCH_SIZE = 10_000
+
 STATE_PROPERTY_NAMES = {
     "state_number",
     "user_prompt",
@@ -33,535 +47,731 @@ TRANSITION_PROPERTY_NAMES = {
 }
 
 
-class Neo4jStateRepository(StateRepository):
+def _to_datetime(value) -> Optional[datetime]:
+    """Convert a stored timestamp to a datetime.
+
+    State and transition timestamps are written as native Neo4j temporal values; ISO
+    strings are still accepted for data written before that change.
+    """
+    if not value:
+        return None
+    if isinstance(value, str):
+        return parse_iso_datetime(value)
+    return value.to_native()
+
+
+def _state_params(state: State) -> dict:
+    return {
+        "state_number": state.state_number,
+        "user_prompt": state.user_prompt,
+        "branch_name": state.branch_name,
+        "git_diff_info": state.git_diff_info,
+        "hash": state.hash,
+        "created_at": state.created_at,
+        "file_hashes": json_codec.dumps(state.file_hashes) if state.file_hashes else None,
+        "file_hash_deltas": (
+            json_codec.dumps(state.file_hash_deltas) if state.file_hash_deltas else None
+        ),
+        "llm_context": state.llm_context,
+        "compression_version": state.compression_version,
+        "compacted_at": state.compacted_at,
+    }
+
+
+def _transition_params(transition: Transition) -> dict:
+    return {
+        "transition_id": transition.transition_id,
+        "current_state": transition.current_state,
+        "next_state": transition.next_state,
+        "user_prompt": transition.user_prompt,
+        "timestamp": transition.timestamp,
+        "reward": transition.reward,
+    }
+
+
+def _collect_built(tx, query: str, params: dict, build: Callable[[Record], _RowT]) -> list[_RowT]:
+    # Records must be read before the managed transaction closes; hydrating them as the
+    # result streams in means the raw records are never all held at once.
+    return [build(record) for record in tx.run(query, params)]
+
+
+def _collect_single(tx, query: str, params: dict) -> Optional[Record]:
+    return tx.run(query, params).single()
+
+
+def _consume_counters(tx, query: str, params: dict) -> SummaryCounters:
+    # Write results are judged by the update counters, so no rows are sent back.
+    return tx.run(query, params).consume().counters
+
+
+# Queries are module constants so every call sends the identical text and hits the
+# driver and server query-plan caches.
+
+# Column order must match the unpacking in Neo4jStateRepository._build_state.
+_STATE_COLUMNS = """
+RETURN s.state_number, s.user_prompt, s.branch_name, s.git_diff_info, s.hash, s.created_at,
+       s.file_hashes, s.file_hash_deltas, s.llm_context, s.compression_version, s.compacted_at
+"""
+
+_Q_STATE_UPSERT = """
+MERGE (s:State {state_number: $state_number})
+SET s.user_prompt = $user_prompt,
+    s.branch_name = $branch_name,
+    s.git_diff_info = $git_diff_info,
+    s.hash = $hash,
+    s.created_at = $created_at,
+    s.file_hashes = $file_hashes,
+    s.file_hash_deltas = $file_hash_deltas,
+    s.llm_context = $llm_context,
+    s.compression_version = $compression_version,
+    s.compacted_at = $compacted_at
+"""
+
+_Q_STATE_UPSERT_MANY = """
+UNWIND $rows AS r
+MERGE (s:State {state_number: r.state_number})
+SET s += r
+RETURN count(s) AS written
+"""
+
+_Q_STATE_BY_NUMBER = "MATCH (s:State {state_number: $state_number})" + _STATE_COLUMNS
+
+_Q_STATES_BY_NUMBERS = (
+    "MATCH (s:State) WHERE s.state_number IN $state_numbers"
+    + _STATE_COLUMNS
+    + "ORDER BY s.state_number"
+)
+
+# One round-trip: the explicit pointer wins, otherwise the highest state number.
+_Q_CURRENT_STATE = (
+    """
+OPTIONAL MATCH (m:Metadata {key: 'current_state'})
+CALL {
+    WITH m
+    WITH m WHERE m.state_number IS NOT NULL
+    MATCH (s:State {state_number: m.state_number})
+    RETURN s
+    UNION
+    WITH m
+    WITH m WHERE m IS NULL OR m.state_number IS NULL
+    MATCH (s:State)
+    RETURN s ORDER BY s.state_number DESC LIMIT 1
+}
+"""
+    + _STATE_COLUMNS
+)
+
+# Project the properties server-side: rows arrive as plain value lists, with no node
+# envelope to transfer or per-property lookups to make.
+_Q_ALL_STATES = "MATCH (s:State)" + _STATE_COLUMNS + "ORDER BY s.state_number"
+
+_Q_STATE_NUMBERS = "MATCH (s:State) RETURN s.state_number ORDER BY s.state_number"
+
+# EXISTS stops at the first match and needs no aggregation stage.
+_Q_STATE_EXISTS = "RETURN EXISTS { MATCH (s:State {state_number: $state_number}) } AS found"
+
+_Q_STATE_COUNT = "MATCH (s:State) RETURN COUNT(s) AS count"
+
+_Q_STATE_SEARCH = """
+MATCH (s:State)
+WHERE s.user_prompt CONTAINS $text
+RETURN s.state_number AS state_number
+ORDER BY s.state_number
+"""
+
+_Q_STATE_DELETE = "MATCH (s:State {state_number: $state_number}) DELETE s"
+
+# MERGE on Counter.name is only race-free under a uniqueness constraint; without it
+# two concurrent first claims could each create a Counter node and hand out one number.
+_Q_COUNTER_CONSTRAINT = (
+    "CREATE CONSTRAINT counter_name_unique IF NOT EXISTS "
+    "FOR (c:Counter) REQUIRE c.name IS UNIQUE"
+)
+
+# Claiming a number writes the Counter node first, which takes its write lock for the
+# rest of the transaction: concurrent create_next calls queue behind it (like SQLite's
+# BEGIN IMMEDIATE) instead of reading the same MAX and colliding on the constraint.
+_Q_CLAIM_STATE_NUMBER = """
+MERGE (c:Counter {name: 'state'})
+SET c.value = coalesce(c.value, -1)
+WITH c
+OPTIONAL MATCH (s:State)
+WITH c, MAX(s.state_number) AS max_state
+SET c.value = coalesce(max_state, -1) + 1
+RETURN c.value AS state_number
+"""
+
+_Q_STATE_CREATE = """
+CREATE (new:State {
+    state_number: $state_number,
+    user_prompt: $user_prompt,
+    branch_name: $branch_name,
+    git_diff_info: $git_diff_info,
+    hash: $hash,
+    created_at: $created_at,
+    file_hashes: $file_hashes,
+    file_hash_deltas: $file_hash_deltas,
+    llm_context: $llm_context,
+    compression_version: $compression_version,
+    compacted_at: $compacted_at
+})
+"""
+
+_Q_STATE_SET_FILE_HASHES = """
+MATCH (s:State {state_number: $state_number})
+SET s.file_hashes = $file_hashes
+"""
+
+# Matching the state first means the pointer is only moved to a state that exists.
+_Q_SET_CURRENT = """
+MATCH (s:State {state_number: $state_number})
+MERGE (m:Metadata {key: 'current_state'})
+SET m.state_number = s.state_number
+RETURN m.state_number AS state_number
+"""
+
+_Q_GET_METADATA = """
+MATCH (m:Metadata {key: $key})
+RETURN m.value AS value, m.state_number AS state_number
+"""
+
+_Q_SET_METADATA = """
+MERGE (m:Metadata {key: $key})
+SET m.value = $value
+REMOVE m.state_number
+"""
+
+_Q_TRANSITION_CREATE = """
+MERGE (from:State {state_number: $current_state})
+MERGE (to:State {state_number: $next_state})
+CREATE (from)-[t:TRANSITION {
+    transition_id: $transition_id,
+    user_prompt: $user_prompt,
+    timestamp: $timestamp,
+    reward: $reward
+}]->(to)
+"""
+
+_Q_TRANSITION_CREATE_MANY = """
+UNWIND $rows AS r
+MERGE (from:State {state_number: r.current_state})
+MERGE (to:State {state_number: r.next_state})
+CREATE (from)-[t:TRANSITION {
+    transition_id: r.transition_id,
+    user_prompt: r.user_prompt,
+    timestamp: r.timestamp,
+    reward: r.reward
+}]->(to)
+RETURN count(t) AS written
+"""
+
+_Q_CLAIM_TRANSITION_ID = """
+MERGE (c:Counter {name: 'transition'})
+SET c.value = coalesce(c.value, 0)
+WITH c
+OPTIONAL MATCH ()-[t:TRANSITION]->()
+WITH c, MAX(t.transition_id) AS max_id
+SET c.value = coalesce(max_id, 0) + 1
+RETURN c.value AS transition_id
+"""
+
+# Metadata marker recording that legacy transition timestamps have been converted.
+_TIMESTAMP_MIGRATION_KEY = "transition_timestamps_migrated"
+
+# toString() of a temporal differs from the value itself, so this matches strings only.
+_Q_MIGRATE_TRANSITION_TIMESTAMPS = """
+MATCH ()-[t:TRANSITION]->()
+WHERE toString(t.timestamp) = t.timestamp
+SET t.timestamp = datetime(t.timestamp)
+"""
+
+# Scalars only, no relationship envelope. Column order must match the unpacking in
+# Neo4jTransitionRepository._build_transition.
+_TRANSITION_COLUMNS = """
+RETURN t.transition_id, from.state_number, to.state_number, t.user_prompt, t.timestamp,
+       t.reward
+"""
+
+_Q_TRANSITION_BY_ID = (
+    "MATCH (from:State)-[t:TRANSITION {transition_id: $transition_id}]->(to:State)"
+    + _TRANSITION_COLUMNS
+)
+
+_Q_TRANSITIONS_BY_STATE = (
+    "MATCH (from:State {state_number: $state_number})-[t:TRANSITION]->(to:State)"
+    + _TRANSITION_COLUMNS
+    + "ORDER BY t.transition_id"
+)
+
+_Q_LAST_TRANSITIONS = (
+    """
+MATCH (from:State)-[t:TRANSITION]->(to:State)
+WITH t, from, to
+ORDER BY t.timestamp DESC
+LIMIT $limit
+"""
+    + _TRANSITION_COLUMNS
+)
+
+_Q_TRANSITION_COUNT = "MATCH ()-[t:TRANSITION]->() RETURN COUNT(t) AS count"
+
+_Q_TRANSITION_DELETE = "MATCH ()-[t:TRANSITION {transition_id: $transition_id}]->() DELETE t"
+
+_Q_REWARDED_TRANSITIONS = (
+    """
+MATCH (from:State)-[t:TRANSITION]->(to:State)
+WHERE t.reward IS NOT NULL
+"""
+    + _TRANSITION_COLUMNS
+    + "ORDER BY t.transition_id"
+)
+
+_Q_TRANSITIONS_BY_STATE_PAIR = (
+    """
+MATCH (from:State {state_number: $current_state})-[t:TRANSITION]->
+      (to:State {state_number: $next_state})
+"""
+    + _TRANSITION_COLUMNS
+    + "ORDER BY t.transition_id"
+)
+
+_Q_TRANSITION_SET_REWARD = """
+MATCH ()-[t:TRANSITION {transition_id: $transition_id}]->()
+SET t.reward = $reward
+RETURN t.transition_id AS transition_id
+"""
+
+
+class _Neo4jSessionMixin:
+    """Keep one driver session per thread instead of opening a session per query.
+
+    A session is cheap to reuse: it borrows a pooled connection only while a query
+    runs. Sessions are not thread-safe, so each thread gets its own, and a session
+    that raised is dropped so the next call starts from a clean one.
+
+    Queries go through managed transactions (execute_read/execute_write), which the
+    driver retries on transient errors and, on a cluster, routes reads to followers.
+    """
+
+    driver: Driver
+
+    def _init_sessions(self) -> None:
+        self._local = threading.local()
+        self._sessions: list[Session] = []
+        self._sessions_lock = threading.Lock()
+
+    @contextmanager
+    def _session(self) -> Iterator[Session]:
+        session = getattr(self._local, "session", None)
+        if session is None or session.closed():
+            session = self.driver.session()
+            self._local.session = session
+            with self._sessions_lock:
+                self._sessions.append(session)
+        try:
+            yield session
+        except BaseException:
+            self._discard_session(session)
+            raise
+
+    def _discard_session(self, session: Session) -> None:
+        if getattr(self._local, "session", None) is session:
+            self._local.session = None
+        with self._sessions_lock:
+            if session in self._sessions:
+                self._sessions.remove(session)
+        try:
+            session.close()
+        except Exception:
+            pass
+
+    def _read_built(self, query: str, build: Callable[[Record], _RowT], **params) -> list[_RowT]:
+        with self._session() as session:
+            return session.execute_read(_collect_built, query, params, build)
+
+    def _read_single(self, query: str, **params) -> Optional[Record]:
+        with self._session() as session:
+            return session.execute_read(_collect_single, query, params)
+
+    def _write_single(self, query: str, **params) -> Optional[Record]:
+        with self._session() as session:
+            return session.execute_write(_collect_single, query, params)
+
+    def _write_counters(self, query: str, **params) -> SummaryCounters:
+        with self._session() as session:
+            return session.execute_write(_consume_counters, query, params)
+
+    def _write_batches(self, query: str, rows: list[dict]) -> int:
+        """Run an UNWIND $rows write per batch and return how many rows were committed.
+
+        Each batch commits on its own, so when one fails the earlier batches stay
+        written: the count includes them and the error is logged.
+        """
+        written = 0
+        try:
+            with self._session() as session:
+                for start in range(0, len(rows), BULK_WRITE_BATCH_SIZE):
+                    batch = rows[start : start + BULK_WRITE_BATCH_SIZE]
+                    record = session.execute_write(_collect_single, query, {"rows": batch})
+                    written += record["written"] if record else 0
+        except Exception:
+            logger.error(
+                "Bulk write failed after %d of %d rows were committed",
+                written,
+                len(rows),
+                exc_info=True,
+            )
+        return written
+
+    def close(self) -> None:
+        """Close the cached sessions, then the shared driver and its connection pool."""
+        with self._sessions_lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            try:
+                session.close()
+            except Exception:
+                pass
+        self._local = threading.local()
+        self.driver.close()
+
+
+class Neo4jStateRepository(_Neo4jSessionMixin, StateRepository):
     def __init__(self, driver: Driver, settings: Settings) -> None:
         self.driver = driver
         self.settings = settings
+        self._init_sessions()
         self._init_constraints()
 
     def _init_constraints(self) -> None:
-        with self.driver.session() as session:
+        # Schema statements cannot run inside managed transactions; use auto-commit.
+        with self._session() as session:
             session.run(
                 "CREATE CONSTRAINT IF NOT EXISTS FOR (s:State) REQUIRE s.state_number IS UNIQUE"
             )
             session.run("CREATE CONSTRAINT IF NOT EXISTS FOR (s:State) REQUIRE s.hash IS UNIQUE")
+            session.run(_Q_COUNTER_CONSTRAINT)
+            # CONTAINS predicates in search() are served by a text index instead of a label scan
+            session.run(
+                "CREATE TEXT INDEX state_user_prompt_text IF NOT EXISTS "
+                "FOR (s:State) ON (s.user_prompt)"
+            )
 
-    def create(self, state: State) -> bool:
-        with self.driver.session() as session:
+    @staticmethod
+    def _build_state(row: Sequence) -> State:
+        """Build a State from a _STATE_COLUMNS projection row (a Record is a tuple)."""
+        (
+            state_number,
+            user_prompt,
+            branch_name,
+            git_diff_info,
+            state_hash,
+            created_at,
+            file_hashes,
+            file_hash_deltas,
+            llm_context,
+            compression_version,
+            compacted_at,
+        ) = row
+        if file_hashes is not None:
+            if isinstance(file_hashes, str):
+                try:
+                    file_hashes = json_codec.loads(file_hashes)
+                except json.JSONDecodeError:
+                    file_hashes = {}
+            else:
+                file_hashes = file_hashes or {}
+        # file_hashes can be None for transition states
+        file_hash_deltas = file_hash_deltas or {}
+        if isinstance(file_hash_deltas, str):
             try:
-                result = session.run(
-                    """
-                    MERGE (s:State {state_number: $state_number})
-                    SET s.user_prompt = $user_prompt,
-                        s.branch_name = $branch_name,
-                        s.git_diff_info = $git_diff_info,
-                        s.hash = $hash,
-                        s.created_at = $created_at,
-                        s.file_hashes = $file_hashes,
-                        s.file_hash_deltas = $file_hash_deltas,
-                        s.llm_context = $llm_context,
-                        s.compression_version = $compression_version,
-                        s.compacted_at = $compacted_at
-                    RETURN s
-                    """,
-                    state_number=state.state_number,
-                    user_prompt=state.user_prompt,
-                    branch_name=state.branch_name,
-                    git_diff_info=state.git_diff_info,
-                    hash=state.hash,
-                    created_at=state.created_at.isoformat() if state.created_at else None,
-                    file_hashes=json.dumps(state.file_hashes) if state.file_hashes else None,
-                    file_hash_deltas=(
-                        json.dumps(state.file_hash_deltas) if state.file_hash_deltas else None
-                    ),
-                    llm_context=state.llm_context,
-                    compression_version=state.compression_version,
-                    compacted_at=state.compacted_at.isoformat() if state.compacted_at else None,
-                )
-                return result.single() is not None
-            except Exception:
-                return False
+                file_hash_deltas = json_codec.loads(file_hash_deltas)
+            except json.JSONDecodeError:
+                file_hash_deltas = {}
+        return State(
+            state_number=state_number or 0,
+            user_prompt=user_prompt or "",
+            branch_name=branch_name or "",
+            git_diff_info=git_diff_info or "",
+            hash=state_hash or "",
+            created_at=_to_datetime(created_at),
+            file_hashes=file_hashes,
+            file_hash_deltas=file_hash_deltas,
+            llm_context=llm_context,
+            compression_version=compression_version,
+            compacted_at=_to_datetime(compacted_at),
+        )
+
+    def create(self, state: State) -> bool:
+        try:
+            return self._write_counters(_Q_STATE_UPSERT, **_state_params(state)).contains_updates
+        except Exception:
+            return False
+
+    def create_many(self, states: List[State]) -> int:
+        if not states:
+            return 0
+        return self._write_batches(_Q_STATE_UPSERT_MANY, [_state_params(state) for state in states])
 
     def get_by_number(self, state_number: int) -> Optional[State]:
-        with self.driver.session() as session:
-            result = session.run(
-                """
-                MATCH (s:State {state_number: $state_number})
-                RETURN s
-                """,
-                state_number=state_number,
-            )
-            record = result.single()
-            if record:
-                s = record["s"]
-                file_hashes = s.get("file_hashes")
-                if file_hashes is not None:
-                    if isinstance(file_hashes, str):
-                        try:
-                            file_hashes = json.loads(file_hashes)
-                        except json.JSONDecodeError:
-                            file_hashes = {}
-                    else:
-                        file_hashes = file_hashes or {}
-                # file_hashes can be None for transition states
-                file_hash_deltas = s.get("file_hash_deltas", {}) or {}
-                if isinstance(file_hash_deltas, str):
-                    try:
-                        file_hash_deltas = json.loads(file_hash_deltas)
-                    except json.JSONDecodeError:
-                        file_hash_deltas = {}
-                return State(
-                    state_number=s.get("state_number", 0),
-                    user_prompt=s.get("user_prompt", ""),
-                    branch_name=s.get("branch_name", ""),
-                    git_diff_info=s.get("git_diff_info", ""),
-                    hash=s.get("hash", ""),
-                    created_at=(
-                        datetime.fromisoformat(s["created_at"]) if s.get("created_at") else None
-                    ),
-                    file_hashes=file_hashes,
-                    file_hash_deltas=file_hash_deltas,
-                    llm_context=s.get("llm_context"),
-                    compression_version=s.get("compression_version"),
-                    compacted_at=(
-                        datetime.fromisoformat(s["compacted_at"]) if s.get("compacted_at") else None
-                    ),
-                )
-            return None
+        record = self._read_single(_Q_STATE_BY_NUMBER, state_number=state_number)
+        if record:
+            return self._build_state(record.values())
+        return None
+
+    def get_many(self, state_numbers: List[int]) -> List[State]:
+        if not state_numbers:
+            return []
+        return self._read_built(
+            _Q_STATES_BY_NUMBERS, self._build_state, state_numbers=sorted(set(state_numbers))
+        )
 
     def get_current(self) -> Optional[State]:
-        with self.driver.session() as session:
-            metadata_result = session.run("""
-                MATCH (m:Metadata {key: 'current_state'})
-                RETURN m.state_number AS state_number
-                """)
-            metadata_record = metadata_result.single()
-            if metadata_record and metadata_record["state_number"] is not None:
-                return self.get_by_number(metadata_record["state_number"])
-
-            result = session.run("""
-                MATCH (s:State)
-                WITH s.state_number AS sn
-                RETURN MAX(sn) AS max_state
-                """)
-            record = result.single()
-            if record and record["max_state"] is not None:
-                return self.get_by_number(record["max_state"])
-            return None
+        record = self._read_single(_Q_CURRENT_STATE)
+        if record:
+            return self._build_state(record.values())
+        return None
 
     def get_all(self) -> List[State]:
-        with self.driver.session() as session:
-            result = session.run("MATCH (s:State) RETURN s ORDER BY s.state_number")
-            states = []
-            for record in result:
-                s = record["s"]
-                file_hashes = s.get("file_hashes")
-                if file_hashes is not None:
-                    if isinstance(file_hashes, str):
-                        try:
-                            file_hashes = json.loads(file_hashes)
-                        except json.JSONDecodeError:
-                            file_hashes = {}
-                    else:
-                        file_hashes = file_hashes or {}
-                # file_hashes can be None for transition states
-                file_hash_deltas = s.get("file_hash_deltas", {}) or {}
-                if isinstance(file_hash_deltas, str):
-                    try:
-                        file_hash_deltas = json.loads(file_hash_deltas)
-                    except json.JSONDecodeError:
-                        file_hash_deltas = {}
-                states.append(
-                    State(
-                        state_number=s.get("state_number", 0),
-                        user_prompt=s.get("user_prompt", ""),
-                        branch_name=s.get("branch_name", ""),
-                        git_diff_info=s.get("git_diff_info", ""),
-                        hash=s.get("hash", ""),
-                        created_at=(
-                            datetime.fromisoformat(s["created_at"]) if s.get("created_at") else None
-                        ),
-                        file_hashes=file_hashes,
-                        file_hash_deltas=file_hash_deltas,
-                        llm_context=s.get("llm_context"),
-                        compression_version=s.get("compression_version"),
-                        compacted_at=(
-                            datetime.fromisoformat(s["compacted_at"])
-                            if s.get("compacted_at")
-                            else None
-                        ),
-                    )
-                )
-            return states
+        return self._read_built(_Q_ALL_STATES, self._build_state)
+
+    def get_state_numbers(self) -> List[int]:
+        return self._read_built(_Q_STATE_NUMBERS, itemgetter(0))
 
     def exists(self, state_number: int) -> bool:
-        with self.driver.session() as session:
-            result = session.run(
-                """
-                MATCH (s:State {state_number: $state_number})
-                RETURN COUNT(s) AS count
-                """,
-                state_number=state_number,
-            )
-            record = result.single()
-            return record is not None and record["count"] > 0
+        record = self._read_single(_Q_STATE_EXISTS, state_number=state_number)
+        return record is not None and bool(record["found"])
 
     def count(self) -> int:
-        with self.driver.session() as session:
-            result = session.run("MATCH (s:State) RETURN COUNT(s) AS count")
-            record = result.single()
-            return int(record["count"]) if record else 0
+        record = self._read_single(_Q_STATE_COUNT)
+        return int(record["count"]) if record else 0
 
     def search(self, text: str) -> List[int]:
-        with self.driver.session() as session:
-            result = session.run(
-                """
-                MATCH (s:State)
-                WHERE s.user_prompt CONTAINS $text
-                RETURN s.state_number AS state_number
-                ORDER BY s.state_number
-                """,
-                text=text,
-            )
-            return [record["state_number"] for record in result]
+        return self._read_built(_Q_STATE_SEARCH, itemgetter("state_number"), text=text)
 
     def delete(self, state_number: int) -> bool:
-        with self.driver.session() as session:
-            try:
-                result = session.run(
-                    """
-                    MATCH (s:State {state_number: $state_number})
-                    DELETE s
-                    RETURN COUNT(s) AS deleted
-                    """,
-                    state_number=state_number,
-                )
-                record = result.single()
-                return record is not None and record["deleted"] > 0
-            except Exception:
-                return False
+        try:
+            counters = self._write_counters(_Q_STATE_DELETE, state_number=state_number)
+            return counters.nodes_deleted > 0
+        except Exception:
+            return False
 
     def create_next(self, state: State) -> bool:
         """Create a new state with the next sequential state number."""
-        with self.driver.session() as session:
-            try:
-                # Use write transaction for atomicity
-                def create_tx(tx):
-                    # Get current maximum state number
-                    result = tx.run("MATCH (s:State) RETURN MAX(s.state_number) AS max_state")
-                    record = result.single()
-                    max_state = (
-                        record["max_state"] if record and record["max_state"] is not None else -1
-                    )
-                    next_state_number = max_state + 1
-
-                    # Generate hash with the correct state number
-                    state_hash = generate_state_hash(
-                        state.user_prompt,
-                        state.branch_name,
-                        state.git_diff_info,
-                        next_state_number,
-                    )
-
-                    # Create the new state node
-                    result = tx.run(
-                        """
-                        CREATE (new:State {
-                            state_number: $state_number,
-                            user_prompt: $user_prompt,
-                            branch_name: $branch_name,
-                            git_diff_info: $git_diff_info,
-                            hash: $hash,
-                            created_at: $created_at,
-                            file_hash_deltas: $file_hash_deltas,
-                            llm_context: $llm_context,
-                            compression_version: $compression_version,
-                            compacted_at: $compacted_at
-                        })
-                        RETURN new.state_number AS state_number
-                        """,
-                        state_number=next_state_number,
-                        user_prompt=state.user_prompt,
-                        branch_name=state.branch_name,
-                        git_diff_info=state.git_diff_info,
-                        hash=state_hash,
-                        created_at=state.created_at.isoformat() if state.created_at else None,
-                        file_hash_deltas=(
-                            json.dumps(state.file_hash_deltas) if state.file_hash_deltas else None
-                        ),
-                        llm_context=state.llm_context,
-                        compression_version=state.compression_version,
-                        compacted_at=state.compacted_at.isoformat() if state.compacted_at else None,
-                    )
-                    record = result.single()
-                    if record:
-                        state.state_number = record["state_number"]
-                        state.hash = state_hash
-                        return True
-                    return False
 
+        # Use write transaction for atomicity
+        def create_tx(tx):
+            next_state_number = tx.run(_Q_CLAIM_STATE_NUMBER).single()["state_number"]
+
+            # Generate hash with the correct state number
+            state_hash = generate_state_hash(
+                state.user_prompt,
+                state.branch_name,
+                state.git_diff_info,
+                next_state_number,
+            )
+
+            # The number is known to be new, so CREATE skips MERGE's lookup and lock
+            counters = (
+                tx.run(
+                    _Q_STATE_CREATE,
+                    state_number=next_state_number,
+                    user_prompt=state.user_prompt,
+                    branch_name=state.branch_name,
+                    git_diff_info=state.git_diff_info,
+                    hash=state_hash,
+                    created_at=state.created_at,
+                    file_hashes=(
+                        json_codec.dumps(state.file_hashes) if state.file_hashes else None
+                    ),
+                    file_hash_deltas=(
+                        json_codec.dumps(state.file_hash_deltas) if state.file_hash_deltas else None
+                    ),
+                    llm_context=state.llm_context,
+                    compression_version=state.compression_version,
+                    compacted_at=state.compacted_at,
+                )
+                .consume()
+                .counters
+            )
+            if counters.nodes_created > 0:
+                state.state_number = next_state_number
+                state.hash = state_hash
+                return True
+            return False
+
+        try:
+            with self._session() as session:
                 return session.execute_write(create_tx)
-            except Exception:
-                return False
+        except Exception:
+            return False
+
+    def set_file_hashes(self, state_number: int, file_hashes: Dict[str, str]) -> bool:
+        try:
+            counters = self._write_counters(
+                _Q_STATE_SET_FILE_HASHES,
+                state_number=state_number,
+                file_hashes=json_codec.dumps(file_hashes) if file_hashes else None,
+            )
+            return counters.properties_set > 0
+        except Exception:
+            return False
 
     def set_current(self, state_number: int) -> bool:
         """Set the current state explicitly for arbitrary transitions."""
-        with self.driver.session() as session:
-            try:
-                state_exists = session.run(
-                    "MATCH (s:State {state_number: $state_number}) RETURN COUNT(s) AS count",
-                    state_number=state_number,
-                ).single()
-                if not state_exists or state_exists["count"] == 0:
-                    return False
-
-                session.run(
-                    """
-                    MERGE (m:Metadata {key: 'current_state'})
-                    SET m.state_number = $state_number
-                    """,
-                    state_number=state_number,
-                )
-                return True
-            except Exception:
-                return False
+        try:
+            return self._write_single(_Q_SET_CURRENT, state_number=state_number) is not None
+        except Exception:
+            return False
 
     def get_metadata(self, key: str) -> Optional[str]:
-        with self.driver.session() as session:
-            try:
-                result = session.run(
-                    """
-                    MATCH (m:Metadata {key: $key})
-                    RETURN m.value AS value, m.state_number AS state_number
-                    """,
-                    key=key,
-                )
-                record = result.single()
-                if not record:
-                    return None
-                if record.get("value") is not None:
-                    return str(record["value"])
-                if record.get("state_number") is not None:
-                    return str(record["state_number"])
-                return None
-            except Exception:
-                return None
+        try:
+            record = self._read_single(_Q_GET_METADATA, key=key)
+        except Exception:
+            return None
+        if not record:
+            return None
+        if record.get("value") is not None:
+            return str(record["value"])
+        if record.get("state_number") is not None:
+            return str(record["state_number"])
+        return None
 
     def set_metadata(self, key: str, value: str) -> bool:
-        with self.driver.session() as session:
-            try:
-                session.run(
-                    """
-                    MERGE (m:Metadata {key: $key})
-                    SET m.value = $value
-                    REMOVE m.state_number
-                    """,
-                    key=key,
-                    value=value,
-                )
-                return True
-            except Exception:
-                return False
+        try:
+            self._write_counters(_Q_SET_METADATA, key=key, value=value)
+            return True
+        except Exception:
+            return False
 
 
-class Neo4jTransitionRepository(TransitionRepository):
+class Neo4jTransitionRepository(_Neo4jSessionMixin, TransitionRepository):
     def __init__(self, driver: Driver, settings: Settings) -> None:
         self.driver = driver
         self.settings = settings
+        self._init_sessions()
+        self._init_indexes()
+        self._migrate_transition_timestamps()
+
+    def _init_indexes(self) -> None:
+        with self._session() as session:
+            session.run(_Q_COUNTER_CONSTRAINT)
+            # Lookups by id (get_by_id, delete, update_reward) and the newest-first
+            # ordering in get_last would otherwise scan every TRANSITION relationship.
+            session.run(
+                "CREATE INDEX transition_id_idx IF NOT EXISTS "
+                "FOR ()-[t:TRANSITION]-() ON (t.transition_id)"
+            )
+            session.run(
+                "CREATE INDEX transition_timestamp_idx IF NOT EXISTS "
+                "FOR ()-[t:TRANSITION]-() ON (t.timestamp)"
+            )
 
-    def _build_transition(self, record) -> Transition:
-        transition_data = record["t"]
+    def _migrate_transition_timestamps(self) -> None:
+        """Convert legacy ISO-string timestamps to temporals once per database.
+
+        get_last orders by timestamp, and Cypher sorts strings and temporals as
+        separate groups. The full scan runs only until the Metadata marker is set.
+        """
+        if self._read_single(_Q_GET_METADATA, key=_TIMESTAMP_MIGRATION_KEY) is not None:
+            return
+        self._write_counters(_Q_MIGRATE_TRANSITION_TIMESTAMPS)
+        self._write_counters(_Q_SET_METADATA, key=_TIMESTAMP_MIGRATION_KEY, value="1")
+
+    @staticmethod
+    def _build_transition(row: Sequence) -> Transition:
+        """Build a Transition from a _TRANSITION_COLUMNS projection row."""
+        transition_id, current_state, next_state, user_prompt, timestamp, reward = row
         return Transition(
-            transition_id=transition_data.get("transition_id", 0),
-            current_state=record.get("current_state", 0),
-            next_state=record.get("next_state", 0),
-            user_prompt=transition_data.get("user_prompt"),
-            timestamp=(
-                datetime.fromisoformat(transition_data["timestamp"])
-                if transition_data.get("timestamp")
-                else None
-            ),
-            reward=transition_data.get("reward"),
+            transition_id=transition_id or 0,
+            current_state=current_state or 0,
+            next_state=next_state or 0,
+            user_prompt=user_prompt,
+            timestamp=_to_datetime(timestamp),
+            reward=reward,
         )
 
     def create(self, transition: Transition) -> bool:
-        with self.driver.session() as session:
-            try:
-                result = session.run(
-                    """
-                    MERGE (from:State {state_number: $current_state})
-                    MERGE (to:State {state_number: $next_state})
-                    CREATE (from)-[t:TRANSITION {
-                        transition_id: $transition_id,
-                        user_prompt: $user_prompt,
-                        timestamp: $timestamp,
-                        reward: $reward
-                    }]->(to)
-                    RETURN t
-                    """,
-                    transition_id=transition.transition_id,
-                    current_state=transition.current_state,
-                    next_state=transition.next_state,
-                    user_prompt=transition.user_prompt,
-                    timestamp=transition.timestamp.isoformat() if transition.timestamp else None,
-                    reward=transition.reward,
-                )
-                return result.single() is not None
-            except Exception:
-                return False
+        try:
+            counters = self._write_counters(_Q_TRANSITION_CREATE, **_transition_params(transition))
+            return counters.relationships_created > 0
+        except Exception:
+            return False
+
+    def create_many(self, transitions: List[Transition]) -> int:
+        if not transitions:
+            return 0
+        return self._write_batches(
+            _Q_TRANSITION_CREATE_MANY,
+            [_transition_params(transition) for transition in transitions],
+        )
 
     def create_next(self, transition: Transition) -> bool:
         """Create a new transition with the next sequential transition ID."""
-        with self.driver.session() as session:
-            try:
+        try:
+            with self._session() as session:
                 # Use write transaction for atomicity
-                result = session.execute_write(self._create_next_transaction, transition)
-                return result
-            except Exception:
-                return False
+                return session.execute_write(self._create_next_transaction, transition)
+        except Exception:
+            return False
 
     def _create_next_transaction(self, tx, transition: Transition) -> bool:
         """Transaction function for create_next."""
-        # Get current maximum transition ID
-        max_result = tx.run("MATCH ()-[t:TRANSITION]->() RETURN MAX(t.transition_id) AS max_id")
-        max_record = max_result.single()
-        max_id = max_record["max_id"] if max_record and max_record["max_id"] is not None else 0
-        next_id = max_id + 1
+        next_id = tx.run(_Q_CLAIM_TRANSITION_ID).single()["transition_id"]
 
         # Create transition with new ID
-        result = tx.run(
-            """
-            MERGE (from:State {state_number: $current_state})
-            MERGE (to:State {state_number: $next_state})
-            CREATE (from)-[t:TRANSITION {
-                transition_id: $transition_id,
-                user_prompt: $user_prompt,
-                timestamp: $timestamp,
-                reward: $reward
-            }]->(to)
-            RETURN t
-            """,
-            transition_id=next_id,
-            current_state=transition.current_state,
-            next_state=transition.next_state,
-            user_prompt=transition.user_prompt,
-            timestamp=transition.timestamp.isoformat() if transition.timestamp else None,
-            reward=transition.reward,
-        )
-        if result.single():
+        params = _transition_params(transition)
+        params["transition_id"] = next_id
+        if tx.run(_Q_TRANSITION_CREATE, params).consume().counters.relationships_created > 0:
             # Update the transition object with the new ID
             transition.transition_id = next_id
             return True
         return False
 
     def get_by_id(self, transition_id: int) -> Optional[Transition]:
-        with self.driver.session() as session:
-            result = session.run(
-                """
-                MATCH (from:State)-[t:TRANSITION {transition_id: $transition_id}]->(to:State)
-                RETURN t, from.state_number AS current_state, to.state_number AS next_state
-                """,
-                transition_id=transition_id,
-            )
-            record = result.single()
-            if record:
-                return self._build_transition(record)
-            return None
+        record = self._read_single(_Q_TRANSITION_BY_ID, transition_id=transition_id)
+        if record:
+            return self._build_transition(record)
+        return None
 
     def get_by_state(self, state_number: int) -> List[Transition]:
-        with self.driver.session() as session:
-            result = session.run(
-                """
-                MATCH (s:State {state_number: $state_number})
-                OPTIONAL MATCH (s)-[t:TRANSITION]->(next:State)
-                RETURN t, s.state_number AS current_state, next.state_number AS next_state
-                """,
-                state_number=state_number,
-            )
-            transitions = []
-            for record in result:
-                if record["t"]:
-                    transitions.append(self._build_transition(record))
-            return transitions
+        return self._read_built(
+            _Q_TRANSITIONS_BY_STATE, self._build_transition, state_number=state_number
+        )
 
     def get_last(self, limit: int) -> List[Transition]:
-        with self.driver.session() as session:
-            result = session.run(
-                """
-                MATCH (from:State)-[t:TRANSITION]->(to:State)
-                WITH t, from, to
-                ORDER BY t.timestamp DESC
-                LIMIT $limit
-                RETURN t, from.state_number AS current_state, to.state_number AS next_state
-                """,
-                limit=limit,
-            )
-            transitions = []
-            for record in result:
-                transitions.append(self._build_transition(record))
-            return transitions
+        return self._read_built(_Q_LAST_TRANSITIONS, self._build_transition, limit=limit)
 
     def count(self) -> int:
-        with self.driver.session() as session:
-            result = session.run("MATCH ()-[t:TRANSITION]->() RETURN COUNT(t) AS count")
-            record = result.single()
-            return int(record["count"]) if record else 0
+        record = self._read_single(_Q_TRANSITION_COUNT)
+        return int(record["count"]) if record else 0
 
     def delete(self, transition_id: int) -> bool:
-        with self.driver.session() as session:
-            try:
-                result = session.run(
-                    """
-                    MATCH ()-[t:TRANSITION {transition_id: $transition_id}]->()
-                    WITH t
-                    DELETE t
-                    RETURN 1 AS deleted
-                    """,
-                    transition_id=transition_id,
-                )
-                return result.single() is not None
-            except Exception:
-                return False
+        try:
+            counters = self._write_counters(_Q_TRANSITION_DELETE, transition_id=transition_id)
+            return counters.relationships_deleted > 0
+        except Exception:
+            return False
 
     def get_rewarded(self) -> List[Transition]:
-        with self.driver.session() as session:
-            result = session.run("""
-                MATCH (from:State)-[t:TRANSITION]->(to:State)
-                WHERE t.reward IS NOT NULL
-                RETURN t, from.state_number AS current_state, to.state_number AS next_state
-                ORDER BY t.transition_id
-                """)
-            return [self._build_transition(record) for record in result]
+        return self._read_built(_Q_REWARDED_TRANSITIONS, self._build_transition)
 
     def get_by_state_pair(self, current_state: int, next_state: int) -> List[Transition]:
-        with self.driver.session() as session:
-            result = session.run(
-                """
-                MATCH (from:State {state_number: $current_state})-[t:TRANSITION]->
-                      (to:State {state_number: $next_state})
-                RETURN t, from.state_number AS current_state, to.state_number AS next_state
-                ORDER BY t.transition_id
-                """,
-                current_state=current_state,
-                next_state=next_state,
-            )
-            return [self._build_transition(record) for record in result]
+        return self._read_built(
+            _Q_TRANSITIONS_BY_STATE_PAIR,
+            self._build_transition,
+            current_state=current_state,
+            next_state=next_state,
+        )
 
     def update_reward(self, transition_id: int, reward: float | None) -> bool:
-        with self.driver.session() as session:
-            try:
-                result = session.run(
-                    """
-                    MATCH ()-[t:TRANSITION {transition_id: $transition_id}]->()
-                    SET t.reward = $reward
-                    RETURN t
-                    """,
-                    transition_id=transition_id,
-                    reward=reward,
-                )
-                return result.single() is not None
-            except Exception:
-                return False
+        try:
+            record = self._write_single(
+                _Q_TRANSITION_SET_REWARD, transition_id=transition_id, reward=reward
+            )
+            return record is not None
+        except Exception:
+            return False
 
 
 def create_neo4j_repositories(
@@ -574,6 +784,8 @@ def create_neo4j_repositories(
         auth=auth,
         connection_timeout=connection_timeout_ms,
         max_connection_lifetime=3600 * 1000,
+        max_connection_pool_size=MAX_CONNECTION_POOL_SIZE,
+        connection_acquisition_timeout=CONNECTION_ACQUISITION_TIMEOUT_SECONDS,
     )
     driver.verify_connectivity()
     return Neo4jStateRepository(driver, settings), Neo4jTransitionRepository(driver, settings)
@@ -3,17 +3,53 @@ import logging
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING, Dict, List, Optional
 
-from sqlalchemy import Column, DateTime, Float, Integer, String, Text, create_engine, func
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Float,
+    Index,
+    Integer,
+    Row,
+    String,
+    Text,
+    create_engine,
+    event,
+    func,
+    insert,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import declarative_base, sessionmaker
 from sqlalchemy.pool import StaticPool
 
+from ..utils import json_codec
 from ..utils.hash import generate_state_hash
 from ..utils.retry import retry_on_lock
-from ..utils.schema_upgrade import ensure_schema_columns
+from ..utils.schema_upgrade import (
+    STATE_SEARCH_TABLE,
+    ensure_schema_columns,
+    ensure_schema_indexes,
+    ensure_state_search_index,
+)
 
 logger = logging.getLogger(__name__)
 
+# Applied to every new DBAPI connection: WAL lets readers run alongside the single
+# writer, and NORMAL sync skips the per-commit fsync that WAL makes unnecessary.
+SQLITE_PRAGMAS = (
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),
+    ("temp_store", "MEMORY"),
+    ("mmap_size", 268435456),
+    ("cache_size", -65536),
+)
+
+# Rows fetched per cursor round in get_all.
+STATE_FETCH_BATCH_SIZE = 256
+
 if TYPE_CHECKING:
     from sqlalchemy.orm.decl_api import DeclarativeMeta
 
@@ -32,6 +68,11 @@ def _ensure_utc(value: Optional[datetime]) -> Optional[datetime]:
     return value
 
 
+_STATE_SEARCH_QUERY = text(
+    f"SELECT rowid FROM {STATE_SEARCH_TABLE} WHERE user_prompt LIKE :pattern ORDER BY rowid"
+)
+
+
 class StateModel(Base):
     __tablename__ = "states"
     state_number = Column(Integer, primary_key=True)
@@ -55,6 +96,10 @@ class MetadataModel(Base):
 
 class TransitionModel(Base):
     __tablename__ = "transitions"
+    __table_args__ = (
+        Index("ix_transitions_timestamp", "timestamp"),
+        Index("ix_transitions_current_state", "current_state", "id"),
+    )
     id = Column(Integer, primary_key=True, autoincrement=True)
     current_state = Column(Integer, nullable=False)
     next_state = Column(Integer, nullable=False)
@@ -63,6 +108,85 @@ class TransitionModel(Base):
     reward = Column(Float, nullable=True)
 
 
+# Read paths select these columns instead of the mapped classes: the ORM then returns
+# plain Rows and skips identity-map and instance-state bookkeeping. Row attributes
+# carry the model's names, so the _build_* helpers read either form.
+_STATE_ROW = tuple(attr.class_attribute for attr in StateModel.__mapper__.column_attrs)
+_TRANSITION_ROW = tuple(attr.class_attribute for attr in TransitionModel.__mapper__.column_attrs)
+
+
+def _decode_map(encoded: Optional[str]) -> dict:
+    """Decode a stored hash map; empty or unreadable columns decode to ``{}``."""
+    if not encoded:
+        return {}
+    try:
+        return json_codec.loads(encoded)
+    except json.JSONDecodeError:
+        return {}
+
+
+def _state_values(state: State) -> dict:
+    return {
+        "state_number": state.state_number,
+        "user_prompt": state.user_prompt,
+        "branch_name": state.branch_name,
+        "git_diff_info": state.git_diff_info,
+        "hash": state.hash,
+        "created_at": state.created_at,
+        "file_hashes": json_codec.dumps(state.file_hashes) if state.file_hashes else None,
+        "file_hash_deltas": (
+            json_codec.dumps(state.file_hash_deltas) if state.file_hash_deltas else None
+        ),
+        "llm_context": state.llm_context,
+        "compression_version": state.compression_version,
+        "compacted_at": state.compacted_at,
+    }
+
+
+def _transition_values(transition: Transition) -> dict:
+    return {
+        "id": transition.transition_id,
+        "current_state": transition.current_state,
+        "next_state": transition.next_state,
+        "user_prompt": transition.user_prompt,
+        "timestamp": transition.timestamp,
+        "reward": transition.reward,
+    }
+
+
+def _insert_many(session, model, rows: List[dict], label: str) -> int:
+    """Insert ``rows`` in one write transaction, skipping rows that already exist.
+
+    Mirrors ``create``, which treats an existing row as already persisted.
+    Returns the number of new rows, or 0 when the transaction was rolled back.
+    """
+    try:
+        session.execute(text("BEGIN IMMEDIATE"))
+        result = session.execute(insert(model.__table__).prefix_with("OR IGNORE"), rows)
+        session.commit()
+        return max(result.rowcount, 0)
+    except OperationalError as e:
+        session.rollback()
+        if "database is locked" in str(e).lower():
+            raise
+        logger.error(f"SQLite operational error inserting {label}: {e}", exc_info=True)
+        return 0
+    except Exception as e:
+        session.rollback()
+        logger.error(
+            f"Unexpected error inserting {len(rows)} {label}: {type(e).__name__}: {e}",
+            exc_info=True,
+        )
+        return 0
+    finally:
+        session.close()
+
+
+# Plain SELECT count(*) FROM <table>; Query.count() wraps the entity in a subquery.
+_COUNT_STATES = select(func.count()).select_from(StateModel)
+_COUNT_TRANSITIONS = select(func.count()).select_from(TransitionModel)
+
+
 class SQLiteStateRepository(StateRepository):
     def __init__(
         self,
@@ -73,26 +197,20 @@ class SQLiteStateRepository(StateRepository):
         self.session_factory = session_factory
         self.settings = settings
         self._engine = engine
+        self._search_index_enabled = False
         if self._engine is not None:
             ensure_schema_columns(self._engine)
+            ensure_schema_indexes(self._engine)
+            self._search_index_enabled = ensure_state_search_index(self._engine)
 
     def close(self) -> None:
         """Close the database connection."""
-        pass
+        if self._engine is not None:
+            self._engine.dispose()
 
-    def _build_state(self, state_model: StateModel) -> State:
-        file_hashes = {}
-        if state_model.file_hashes:
-            try:
-                file_hashes = json.loads(state_model.file_hashes)
-            except json.JSONDecodeError:
-                file_hashes = {}
-        file_hash_deltas = {}
-        if state_model.file_hash_deltas:
-            try:
-                file_hash_deltas = json.loads(state_model.file_hash_deltas)
-            except json.JSONDecodeError:
-                file_hash_deltas = {}
+    def _build_state(self, state_model: "StateModel | Row") -> State:
+        file_hashes = _decode_map(state_model.file_hashes)
+        file_hash_deltas = _decode_map(state_model.file_hash_deltas)
         return State(
             state_number=state_model.state_number,
             user_prompt=state_model.user_prompt,
@@ -110,27 +228,13 @@ class SQLiteStateRepository(StateRepository):
     def create(self, state: State) -> bool:
         session = self.session_factory()
         try:
-            existing = session.query(StateModel).filter_by(hash=state.hash).first()
-            if existing:
-                return True
-            file_hashes_json = json.dumps(state.file_hashes) if state.file_hashes else None
-            file_hash_deltas_json = (
-                json.dumps(state.file_hash_deltas) if state.file_hash_deltas else None
-            )
-            state_model = StateModel(
-                state_number=state.state_number,
-                user_prompt=state.user_prompt,
-                branch_name=state.branch_name,
-                git_diff_info=state.git_diff_info,
-                hash=state.hash,
-                created_at=state.created_at,
-                file_hashes=file_hashes_json,
-                file_hash_deltas=file_hash_deltas_json,
-                llm_context=state.llm_context,
-                compression_version=state.compression_version,
-                compacted_at=state.compacted_at,
+            # A state already stored under this hash counts as persisted; any other
+            # conflict (a different state with this number) still raises.
+            session.execute(
+                sqlite_insert(StateModel)
+                .values(**_state_values(state))
+                .on_conflict_do_nothing(index_elements=["hash"])
             )
-            session.add(state_model)
             session.commit()
             return True
         except Exception:
@@ -139,16 +243,38 @@ class SQLiteStateRepository(StateRepository):
         finally:
             session.close()
 
+    @retry_on_lock(max_retries=5)
+    def create_many(self, states: List[State]) -> int:
+        if not states:
+            return 0
+        rows = [_state_values(state) for state in states]
+        return _insert_many(self.session_factory(), StateModel, rows, "states")
+
     def get_by_number(self, state_number: int) -> Optional[State]:
         session = self.session_factory()
         try:
-            state_model = session.query(StateModel).filter_by(state_number=state_number).first()
-            if state_model:
-                return self._build_state(state_model)
+            row = session.query(*_STATE_ROW).filter_by(state_number=state_number).first()
+            if row:
+                return self._build_state(row)
             return None
         finally:
             session.close()
 
+    def get_many(self, state_numbers: List[int]) -> List[State]:
+        if not state_numbers:
+            return []
+        session = self.session_factory()
+        try:
+            rows = (
+                session.query(*_STATE_ROW)
+                .filter(StateModel.state_number.in_(set(state_numbers)))
+                .order_by(StateModel.state_number)
+                .all()
+            )
+            return [self._build_state(row) for row in rows]
+        finally:
+            session.close()
+
     def get_current(self) -> Optional[State]:
         session = self.session_factory()
         try:
@@ -157,9 +283,9 @@ class SQLiteStateRepository(StateRepository):
                 state_number = int(metadata.value)
                 return self.get_by_number(state_number)
 
-            state_model = session.query(StateModel).order_by(StateModel.state_number.desc()).first()
-            if state_model:
-                return self._build_state(state_model)
+            row = session.query(*_STATE_ROW).order_by(StateModel.state_number.desc()).first()
+            if row:
+                return self._build_state(row)
             return None
         finally:
             session.close()
@@ -167,30 +293,49 @@ class SQLiteStateRepository(StateRepository):
     def get_all(self) -> List[State]:
         session = self.session_factory()
         try:
-            state_models = session.query(StateModel).order_by(StateModel.state_number).all()
-            return [self._build_state(state_model) for state_model in state_models]
+            rows = session.query(*_STATE_ROW).order_by(StateModel.state_number)
+            # Pull rows from the cursor in batches so only the State list grows with N.
+            return [self._build_state(row) for row in rows.yield_per(STATE_FETCH_BATCH_SIZE)]
+        finally:
+            session.close()
+
+    def get_state_numbers(self) -> List[int]:
+        session = self.session_factory()
+        try:
+            rows = session.query(StateModel.state_number).order_by(StateModel.state_number)
+            return [state_number for (state_number,) in rows]
         finally:
             session.close()
 
     def exists(self, state_number: int) -> bool:
         session = self.session_factory()
         try:
-            return session.query(StateModel).filter_by(state_number=state_number).count() > 0
+            # A primary-key probe that stops at the first row, rather than COUNT over a subquery.
+            row = session.query(StateModel.state_number).filter_by(state_number=state_number)
+            return row.first() is not None
         finally:
             session.close()
 
     def count(self) -> int:
         session = self.session_factory()
         try:
-            return session.query(StateModel).count()
+            return session.execute(_COUNT_STATES).scalar_one()
         finally:
             session.close()
 
     def search(self, text: str) -> List[int]:
         session = self.session_factory()
         try:
-            results = session.query(StateModel).filter(StateModel.user_prompt.contains(text)).all()
-            return [sm.state_number for sm in results]
+            if self._search_index_enabled:
+                rows = session.execute(_STATE_SEARCH_QUERY, {"pattern": f"%{text}%"})
+                return [row[0] for row in rows]
+            results = (
+                session.query(StateModel.state_number)
+                .filter(StateModel.user_prompt.contains(text))
+                .order_by(StateModel.state_number)
+                .all()
+            )
+            return [row.state_number for row in results]
         finally:
             session.close()
 
@@ -217,25 +362,21 @@ class SQLiteStateRepository(StateRepository):
             - ERROR: SQLite lock contention (OperationalError)
             - ERROR: Any other database exception with full traceback
         """
-        from sqlalchemy import text
-
+        # Encode the hash maps before taking the write lock; BEGIN IMMEDIATE blocks
+        # every other writer until commit.
+        file_hashes_json = json_codec.dumps(state.file_hashes) if state.file_hashes else None
+        file_hash_deltas_json = (
+            json_codec.dumps(state.file_hash_deltas) if state.file_hash_deltas else None
+        )
         session = self.session_factory()
         next_state_number = None  # Initialize for error logging
         try:
             session.execute(text("BEGIN IMMEDIATE"))
 
             max_state = session.query(func.max(StateModel.state_number)).scalar()
+            # BEGIN IMMEDIATE holds the write lock, so MAX + 1 cannot be taken concurrently.
             next_state_number = (max_state + 1) if max_state is not None else 0
 
-            existing = session.query(StateModel).filter_by(state_number=next_state_number).first()
-            if existing:
-                logger.warning(
-                    f"State {next_state_number} already exists. "
-                    f"Possible race condition or failed previous transaction."
-                )
-                session.rollback()
-                return False
-
             state.state_number = next_state_number
 
             state.hash = generate_state_hash(
@@ -245,11 +386,6 @@ class SQLiteStateRepository(StateRepository):
                 state.state_number,
             )
 
-            file_hashes_json = json.dumps(state.file_hashes) if state.file_hashes else None
-            file_hash_deltas_json = (
-                json.dumps(state.file_hash_deltas) if state.file_hash_deltas else None
-            )
-
             state_model = StateModel(
                 state_number=state.state_number,
                 user_prompt=state.user_prompt,
@@ -296,6 +432,24 @@ class SQLiteStateRepository(StateRepository):
             session.close()
 
     @retry_on_lock(max_retries=5)
+    def set_file_hashes(self, state_number: int, file_hashes: Dict[str, str]) -> bool:
+        file_hashes_json = json_codec.dumps(file_hashes) if file_hashes else None
+        session = self.session_factory()
+        try:
+            result = (
+                session.query(StateModel)
+                .filter_by(state_number=state_number)
+                .update({StateModel.file_hashes: file_hashes_json}, synchronize_session=False)
+            )
+            session.commit()
+            return result > 0
+        except Exception:
+            session.rollback()
+            logger.error(f"Failed to store file hashes for state {state_number}", exc_info=True)
+            return False
+        finally:
+            session.close()
+
     def set_current(self, state_number: int) -> bool:
         """Set the current state explicitly for arbitrary transitions.
 
@@ -311,7 +465,9 @@ class SQLiteStateRepository(StateRepository):
         """
         session = self.session_factory()
         try:
-            state_exists = session.query(StateModel).filter_by(state_number=state_number).first()
+            state_exists = (
+                session.query(StateModel.state_number).filter_by(state_number=state_number).first()
+            )
             if not state_exists:
                 logger.warning(
                     f"Cannot set current to state {state_number}: state does not exist in database"
@@ -341,6 +497,48 @@ class SQLiteStateRepository(StateRepository):
         finally:
             session.close()
 
+    @retry_on_lock(max_retries=5)
+    def update_file_hash_deltas(self, deltas_by_state: Dict[int, Dict[str, Optional[str]]]) -> int:
+        """Overwrite ``file_hash_deltas`` for many states in one write transaction.
+
+        Args:
+            deltas_by_state: Mapping of state number to its new delta dictionary.
+
+        Returns:
+            int: Number of rows submitted, or 0 when the transaction was rolled back.
+        """
+        if not deltas_by_state:
+            return 0
+        rows = [
+            {
+                "state_number": state_number,
+                "file_hash_deltas": json_codec.dumps(deltas) if deltas else None,
+            }
+            for state_number, deltas in deltas_by_state.items()
+        ]
+        session = self.session_factory()
+        try:
+            session.execute(text("BEGIN IMMEDIATE"))
+            session.execute(update(StateModel), rows)
+            session.commit()
+            return len(rows)
+        except OperationalError as e:
+            session.rollback()
+            if "database is locked" in str(e).lower():
+                raise
+            logger.error(f"SQLite operational error updating deltas: {e}", exc_info=True)
+            return 0
+        except Exception as e:
+            session.rollback()
+            logger.error(
+                f"Unexpected error updating deltas for {len(rows)} states: "
+                f"{type(e).__name__}: {e}",
+                exc_info=True,
+            )
+            return 0
+        finally:
+            session.close()
+
     def get_metadata(self, key: str) -> Optional[str]:
         session = self.session_factory()
         try:
@@ -372,7 +570,7 @@ class SQLiteTransitionRepository(TransitionRepository):
         """Close the database connection."""
         pass
 
-    def _build_transition(self, transition_model: TransitionModel) -> Transition:
+    def _build_transition(self, transition_model: "TransitionModel | Row") -> Transition:
         return Transition(
             transition_id=transition_model.id,
             current_state=transition_model.current_state,
@@ -385,18 +583,11 @@ class SQLiteTransitionRepository(TransitionRepository):
     def create(self, transition: Transition) -> bool:
         session = self.session_factory()
         try:
-            existing = session.query(TransitionModel).filter_by(id=transition.transition_id).first()
-            if existing:
-                return True
-            transition_model = TransitionModel(
-                id=transition.transition_id,
-                current_state=transition.current_state,
-                next_state=transition.next_state,
-                user_prompt=transition.user_prompt,
-                timestamp=transition.timestamp,
-                reward=transition.reward,
+            session.execute(
+                sqlite_insert(TransitionModel)
+                .values(**_transition_values(transition))
+                .on_conflict_do_nothing(index_elements=["id"])
             )
-            session.add(transition_model)
             session.commit()
             return True
         except Exception:
@@ -405,6 +596,13 @@ class SQLiteTransitionRepository(TransitionRepository):
         finally:
             session.close()
 
+    @retry_on_lock(max_retries=5)
+    def create_many(self, transitions: List[Transition]) -> int:
+        if not transitions:
+            return 0
+        rows = [_transition_values(transition) for transition in transitions]
+        return _insert_many(self.session_factory(), TransitionModel, rows, "transitions")
+
     @retry_on_lock(max_retries=5)
     def create_next(self, transition: Transition) -> bool:
         """Create a new transition with the next sequential transition ID.
@@ -416,25 +614,15 @@ class SQLiteTransitionRepository(TransitionRepository):
             - ERROR: SQLite lock contention (OperationalError)
             - ERROR: Any other database exception with full traceback
         """
-        from sqlalchemy import text
-
         session = self.session_factory()
         next_id = None  # Initialize for error logging
         try:
             session.execute(text("BEGIN IMMEDIATE"))
 
             max_id = session.query(func.max(TransitionModel.id)).scalar()
+            # BEGIN IMMEDIATE holds the write lock, so MAX + 1 cannot be taken concurrently.
             next_id = (max_id + 1) if max_id is not None else 1
 
-            existing = session.query(TransitionModel).filter_by(id=next_id).first()
-            if existing:
-                logger.warning(
-                    f"Transition {next_id} already exists. "
-                    f"Possible race condition or failed previous transaction."
-                )
-                session.rollback()
-                return False
-
             transition.transition_id = next_id
 
             transition_model = TransitionModel(
@@ -479,9 +667,9 @@ class SQLiteTransitionRepository(TransitionRepository):
     def get_by_id(self, transition_id: int) -> Optional[Transition]:
         session = self.session_factory()
         try:
-            tm = session.query(TransitionModel).filter_by(id=transition_id).first()
-            if tm:
-                return self._build_transition(tm)
+            row = session.query(*_TRANSITION_ROW).filter_by(id=transition_id).first()
+            if row:
+                return self._build_transition(row)
             return None
         finally:
             session.close()
@@ -489,33 +677,33 @@ class SQLiteTransitionRepository(TransitionRepository):
     def get_by_state(self, state_number: int) -> List[Transition]:
         session = self.session_factory()
         try:
-            tm_models = (
-                session.query(TransitionModel)
+            rows = (
+                session.query(*_TRANSITION_ROW)
                 .filter_by(current_state=state_number)
                 .order_by(TransitionModel.id)
                 .all()
             )
-            return [self._build_transition(tm) for tm in tm_models]
+            return [self._build_transition(row) for row in rows]
         finally:
             session.close()
 
     def get_last(self, limit: int) -> List[Transition]:
         session = self.session_factory()
         try:
-            tm_models = (
-                session.query(TransitionModel)
+            rows = (
+                session.query(*_TRANSITION_ROW)
                 .order_by(TransitionModel.timestamp.desc())
                 .limit(limit)
                 .all()
             )
-            return [self._build_transition(tm) for tm in tm_models]
+            return [self._build_transition(row) for row in rows]
         finally:
             session.close()
 
     def count(self) -> int:
         session = self.session_factory()
         try:
-            return session.query(TransitionModel).count()
+            return session.execute(_COUNT_TRANSITIONS).scalar_one()
         finally:
             session.close()
 
@@ -534,26 +722,26 @@ class SQLiteTransitionRepository(TransitionRepository):
     def get_rewarded(self) -> List[Transition]:
         session = self.session_factory()
         try:
-            tm_models = (
-                session.query(TransitionModel)
+            rows = (
+                session.query(*_TRANSITION_ROW)
                 .filter(TransitionModel.reward.isnot(None))
                 .order_by(TransitionModel.id)
                 .all()
             )
-            return [self._build_transition(tm) for tm in tm_models]
+            return [self._build_transition(row) for row in rows]
         finally:
             session.close()
 
     def get_by_state_pair(self, current_state: int, next_state: int) -> List[Transition]:
         session = self.session_factory()
         try:
-            tm_models = (
-                session.query(TransitionModel)
+            rows = (
+                session.query(*_TRANSITION_ROW)
                 .filter_by(current_state=current_state, next_state=next_state)
                 .order_by(TransitionModel.id)
                 .all()
             )
-            return [self._build_transition(tm) for tm in tm_models]
+            return [self._build_transition(row) for row in rows]
         finally:
             session.close()
 
@@ -574,6 +762,15 @@ class SQLiteTransitionRepository(TransitionRepository):
             session.close()
 
 
+def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in SQLITE_PRAGMAS:
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
 def create_sqlite_engine(path: str):
     from pathlib import Path
 
@@ -583,6 +780,7 @@ def create_sqlite_engine(path: str):
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
+    event.listen(engine, "connect", _apply_sqlite_pragmas)
     Base.metadata.create_all(engine)
     return engine
 
@@ -591,7 +789,9 @@ def create_sqlite_repositories(
     path: str, settings: Settings
 ) -> tuple[SQLiteStateRepository, SQLiteTransitionRepository]:
     engine = create_sqlite_engine(path)
-    session_factory = sessionmaker(bind=engine)
+    # Sessions live for one repository call and are never read after commit, so skip
+    # expiring (and later re-SELECTing) instances on commit and the implicit pre-query flush.
+    session_factory = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
     return SQLiteStateRepository(
         session_factory, settings, engine=engine
     ), SQLiteTransitionRepository(session_factory, settings)
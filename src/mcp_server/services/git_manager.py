@@ -5,6 +5,7 @@ import os  # nosec: B404
 import shutil
 import signal  # nosec: B404
 import subprocess  # nosec: B404
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import TYPE_CHECKING, Dict, Optional, Tuple
 
@@ -14,6 +15,15 @@ if TYPE_CHECKING:
     from ..utils.ignore_manager import IgnoreManager
 
 
+def _hash_file(file_path: Path) -> Optional[str]:
+    """Return the SHA256 hex digest of a file, or None if it cannot be read."""
+    try:
+        with open(file_path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except (OSError, ValueError):
+        return None
+
+
 class GitOperationError(Exception):
     """Exceção para erros em operações git."""
 
@@ -28,6 +38,8 @@ class GitTimeoutError(Exception):
 
 GIT_TIMEOUT_SECONDS = 30
 GIT_COMMAND_TIMEOUT = 60
+# hashlib releases the GIL while digesting, so a few threads keep several cores busy
+HASH_WORKERS = min(8, os.cpu_count() or 1)
 
 # Binary file extensions to ignore during file hashing and diff calculation
 # Based on common binary extensions in software development and Linux
@@ -566,7 +578,7 @@ class GitManager:
         Returns:
             Dictionary mapping relative file paths to SHA256 hashes
         """
-        file_hashes = {}
+        candidates: list[tuple[str, Path]] = []
         for root, dirs, files in os.walk(directory_path):
             # Filter directories using ignore patterns
             dirs[:] = [
@@ -592,14 +604,19 @@ class GitManager:
                     project_path=directory_path,
                 ):
                     continue
+                candidates.append((relative_path, file_path))
 
-                try:
-                    with open(file_path, "rb") as f:
-                        file_hash = hashlib.sha256(f.read()).hexdigest()
-                        file_hashes[relative_path] = file_hash
-                except (OSError, ValueError):
-                    continue
-        return file_hashes
+        if len(candidates) > 1 and HASH_WORKERS > 1:
+            with ThreadPoolExecutor(max_workers=HASH_WORKERS) as executor:
+                digests = list(executor.map(_hash_file, (path for _, path in candidates)))
+        else:
+            digests = [_hash_file(path) for _, path in candidates]
+
+        return {
+            relative_path: digest
+            for (relative_path, _), digest in zip(candidates, digests)
+            if digest is not None
+        }
 
     def compute_changes_since_last_state(
         self,
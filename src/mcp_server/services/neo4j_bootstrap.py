@@ -1,10 +1,34 @@
 """Helpers for resolving Neo4j connection settings at startup."""
 
+import socket
 from pathlib import Path
+from urllib.parse import urlparse
 
 from ..config import Settings
 from .neo4j_service_manager import ProjectNeo4jServiceManager
 
+DEFAULT_BOLT_PORT = 7687
+REACHABILITY_TIMEOUT_SECONDS = 0.5
+
+
+def neo4j_endpoint_reachable(uri: str, timeout: float = REACHABILITY_TIMEOUT_SECONDS) -> bool:
+    """Return True when the host/port in a Neo4j URI accepts a TCP connection.
+
+    Used as a fast pre-check so an unreachable server falls back to SQLite in well
+    under a second instead of waiting out the driver's connection timeout.
+    """
+    try:
+        parsed = urlparse(uri)
+        host = parsed.hostname or "localhost"
+        port = parsed.port or DEFAULT_BOLT_PORT
+    except ValueError:
+        return False
+    try:
+        with socket.create_connection((host, port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
 
 def prepare_neo4j_connection(settings: Settings, project_root: Path | None = None) -> Settings:
     """Resolve managed Neo4j connection details when auto-bootstrap is enabled."""
@@ -10,15 +10,34 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Callable, Optional
 
+import docker
 from docker.client import DockerClient
-from docker.errors import DockerException
+from docker.errors import DockerException, NotFound
 from docker.models.containers import Container
-from neo4j import GraphDatabase
-
-import docker
+from neo4j import Driver, GraphDatabase
 
 from ..config import Settings
 
+READINESS_INITIAL_DELAY_SECONDS = 0.05
+READINESS_MAX_DELAY_SECONDS = 1.0
+HEALTHCHECK_INTERVAL_NS = 1_000_000_000
+HEALTHCHECK_RETRIES = 30
+
+_docker_client: DockerClient | None = None
+
+
+def get_docker_client() -> DockerClient:
+    """Return a process-wide Docker client so the socket is negotiated only once."""
+    global _docker_client
+    if _docker_client is None:
+        _docker_client = docker.from_env()
+    return _docker_client
+
+
+def reset_docker_client() -> None:
+    global _docker_client
+    _docker_client = None
+
 
 class Neo4jServiceError(RuntimeError):
     """Raised when the managed Neo4j service cannot be prepared."""
@@ -94,7 +113,7 @@ class ProjectNeo4jServiceManager:
     ) -> None:
         self.project_root = project_root.resolve()
         self.settings = settings
-        self.client_factory = client_factory or docker.from_env
+        self.client_factory = client_factory or get_docker_client
         self.sleep_func = sleep_func
 
     def ensure_service(self) -> ManagedNeo4jConnection:
@@ -112,7 +131,8 @@ class ProjectNeo4jServiceManager:
 
         connection = self._connection_from_container(container, runtime_state)
         self._persist_runtime_state(runtime_state)
-        self._wait_until_ready(connection)
+        if not self._container_healthy(container):
+            self._wait_until_ready(connection)
         return connection
 
     def _runtime_home(self) -> Path:
@@ -166,13 +186,15 @@ class ProjectNeo4jServiceManager:
             client.ping()
             return client
         except DockerException as exc:
+            if self.client_factory is get_docker_client:
+                reset_docker_client()
             raise Neo4jServiceError(f"Docker unavailable for managed Neo4j: {exc}") from exc
 
     def _find_container(self, client: DockerClient, container_name: str) -> Optional[Container]:
-        containers = client.containers.list(all=True, filters={"name": container_name})
-        if not containers:
+        try:
+            return client.containers.get(container_name)
+        except NotFound:
             return None
-        return containers[0]
 
     def _create_container(
         self,
@@ -197,6 +219,12 @@ class ProjectNeo4jServiceManager:
                 "codebase-state-manager.project_root": str(self.project_root),
             },
             restart_policy={"Name": "unless-stopped"},
+            healthcheck={
+                "test": ["CMD", "wget", "--quiet", "--spider", "http://localhost:7474"],
+                "interval": HEALTHCHECK_INTERVAL_NS,
+                "timeout": HEALTHCHECK_INTERVAL_NS,
+                "retries": HEALTHCHECK_RETRIES,
+            },
         )
 
     def _start_container_if_needed(self, container: Container) -> None:
@@ -204,6 +232,20 @@ class ProjectNeo4jServiceManager:
             container.start()
         container.reload()
 
+    def _container_healthy(self, container: Container) -> bool:
+        """Return True when Docker's own healthcheck already reports the container healthy.
+
+        Relies on attrs refreshed by the preceding reload; containers created without a
+        healthcheck never report healthy and fall through to the Bolt readiness probe.
+        """
+        state = container.attrs.get("State", {})
+        if not isinstance(state, dict):
+            return False
+        health = state.get("Health", {})
+        if not isinstance(health, dict):
+            return False
+        return health.get("Status") == "healthy"
+
     def _published_port(self, container: Container, key: str) -> Optional[int]:
         container.reload()
         network_settings = container.attrs.get("NetworkSettings", {})
@@ -250,34 +292,51 @@ class ProjectNeo4jServiceManager:
         configured_timeout = float(self.settings.neo4j_connection_timeout)
         return max(0.5, min(5.0, configured_timeout, remaining_seconds))
 
+    def _bolt_port_open(self, connection: ManagedNeo4jConnection, timeout: float) -> bool:
+        """Cheap TCP probe so the Bolt handshake only runs once the port accepts connections."""
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            return sock.connect_ex(("127.0.0.1", connection.bolt_port)) == 0
+
     def _wait_until_ready(self, connection: ManagedNeo4jConnection) -> None:
         deadline = time.monotonic() + self.settings.neo4j_connection_timeout
+        delay = READINESS_INITIAL_DELAY_SECONDS
         last_error: Exception | None = None
+        driver: Driver | None = None
+
+        try:
+            while True:
+                remaining_seconds = deadline - time.monotonic()
+                if remaining_seconds <= 0:
+                    break
+
+                probe_timeout = self._connectivity_probe_timeout(remaining_seconds)
+                if not self._bolt_port_open(connection, probe_timeout):
+                    last_error = ConnectionRefusedError(
+                        f"Bolt port {connection.bolt_port} is not accepting connections"
+                    )
+                else:
+                    try:
+                        if driver is None:
+                            driver = GraphDatabase.driver(
+                                connection.uri,
+                                auth=None,
+                                connection_timeout=probe_timeout,
+                                connection_acquisition_timeout=probe_timeout,
+                            )
+                        driver.verify_connectivity()
+                        return
+                    except Exception as exc:
+                        last_error = exc
 
-        while True:
-            remaining_seconds = deadline - time.monotonic()
-            if remaining_seconds <= 0:
-                break
-
-            probe_timeout = self._connectivity_probe_timeout(remaining_seconds)
-            try:
-                driver = GraphDatabase.driver(
-                    connection.uri,
-                    auth=None,
-                    connection_timeout=probe_timeout,
-                    connection_acquisition_timeout=probe_timeout,
-                )
-                try:
-                    driver.verify_connectivity()
-                    return
-                finally:
-                    driver.close()
-            except Exception as exc:
-                last_error = exc
                 remaining_after_failure = deadline - time.monotonic()
                 if remaining_after_failure <= 0:
                     break
-                self.sleep_func(min(1.0, remaining_after_failure))
+                self.sleep_func(min(delay, remaining_after_failure))
+                delay = min(delay * 2, READINESS_MAX_DELAY_SECONDS)
+        finally:
+            if driver is not None:
+                driver.close()
 
         detail = f" Last error: {last_error}" if last_error is not None else ""
         raise Neo4jServiceError(
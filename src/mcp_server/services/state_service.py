@@ -1,10 +1,13 @@
+import functools
+import itertools
 import logging
-import os
 import shutil
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Any, Callable, Dict, Iterator, Optional, TypeVar
 
-from ..config import Settings
+from ..config import Settings, get_env
 from ..models.state_model import State, Transition
 from ..repositories.abstract_repositories import StateRepository, TransitionRepository
 from ..repositories.sqlite_repository import SQLiteStateRepository
@@ -44,6 +47,40 @@ class InvalidStateTransitionError(StateServiceError):
     pass
 
 
+READ_CACHE_SIZE = 1024
+# Every Nth transition state also stores its full file hashes so reconstruction
+# replays at most N deltas instead of walking back to genesis.
+FILE_HASH_CHECKPOINT_INTERVAL = 32
+
+_MethodT = TypeVar("_MethodT", bound=Callable)
+_ItemT = TypeVar("_ItemT")
+
+
+def _invalidates_read_caches(method: _MethodT) -> _MethodT:
+    """Drop the cached state/transition reads once a mutating method returns."""
+
+    @functools.wraps(method)
+    def wrapper(self: "StateService", *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self.invalidate_read_caches()
+
+    return wrapper  # type: ignore[return-value]
+
+
+def _page(items: list[_ItemT], limit: Optional[int], offset: int) -> Iterator[_ItemT]:
+    """Iterate over one page of ``items`` without copying the rest of the list."""
+    stop = None if limit is None else offset + limit
+    return itertools.islice(items, offset, stop)
+
+
+def _page_summary(returned: int, total: int, limit: Optional[int], offset: int) -> str:
+    if limit is None and offset == 0:
+        return f"{total} total"
+    return f"{returned} of {total} total from offset {offset}"
+
+
 class StateService:
     MANAGED_PROJECT_PATH_METADATA_KEY = "managed_project_path"
 
@@ -64,6 +101,14 @@ class StateService:
         self._ignore_manager = IgnoreManager()
         self._project_path = Path.cwd()
         self._initialized_cache: Optional[bool] = None
+        self._state_cache: OrderedDict[int, State] = OrderedDict()
+        self._transition_cache: OrderedDict[int, Transition] = OrderedDict()
+        self._current_state_cache: Optional[State] = None
+        # Read caches are shared by the service worker and the volume-fix job thread.
+        # The generation changes on every invalidation, so a read that started before
+        # one cannot put its (possibly stale) result back afterwards.
+        self._cache_lock = threading.Lock()
+        self._cache_generation = 0
         self.branch_detector = BranchDetectionService(git_manager)
 
     @property
@@ -77,21 +122,84 @@ class StateService:
         """Run expensive consistency checks only for the real SQLite-backed service."""
         return isinstance(self.state_repo, SQLiteStateRepository)
 
+    def get_consistency_checker(self) -> ConsistencyChecker:
+        """Build a checker for the configured volume and database.
+
+        Checkers keep the issues of their last check_all for auto_repair, so each
+        operation gets its own instance instead of sharing one across threads.
+        """
+        return ConsistencyChecker(
+            state_repo=self.state_repo,
+            volume_path=self.settings.docker_volume_name,
+            db_path=self.settings.sqlite_path,
+        )
+
     def _is_initialized(self, volume_path: str) -> bool:
         if self._initialized_cache is None:
             self._initialized_cache = is_initialized(volume_path)
         return self._initialized_cache
 
+    def invalidate_read_caches(self) -> None:
+        """Forget cached reads; call after anything writes to the repositories directly."""
+        with self._cache_lock:
+            self._cache_generation += 1
+            self._state_cache.clear()
+            self._transition_cache.clear()
+            self._current_state_cache = None
+
+    def _lookup(self, cache: OrderedDict, key: int) -> tuple[Any, int]:
+        """Return the cached value (or None) and the generation it was read in."""
+        with self._cache_lock:
+            value = cache.get(key)
+            if value is not None:
+                cache.move_to_end(key)
+            return value, self._cache_generation
+
+    def _remember(self, cache: OrderedDict, key: int, value, generation: int) -> None:
+        with self._cache_lock:
+            if generation != self._cache_generation:
+                return
+            cache[key] = value
+            cache.move_to_end(key)
+            if len(cache) > READ_CACHE_SIZE:
+                cache.popitem(last=False)
+
+    def _cached_current_state(self) -> Optional[State]:
+        with self._cache_lock:
+            state, generation = self._current_state_cache, self._cache_generation
+        if state is None:
+            state = self.state_repo.get_current()
+            with self._cache_lock:
+                if generation == self._cache_generation:
+                    self._current_state_cache = state
+        return state
+
+    def _cached_state(self, state_number: int) -> Optional[State]:
+        cached: Optional[State]
+        cached, generation = self._lookup(self._state_cache, state_number)
+        if cached is not None:
+            return cached
+        state = self.state_repo.get_by_number(state_number)
+        if state is not None:
+            self._remember(self._state_cache, state_number, state, generation)
+        return state
+
+    def _cached_transition(self, transition_id: int) -> Optional[Transition]:
+        cached: Optional[Transition]
+        cached, generation = self._lookup(self._transition_cache, transition_id)
+        if cached is not None:
+            return cached
+        transition = self.transition_repo.get_by_id(transition_id)
+        if transition is not None:
+            self._remember(self._transition_cache, transition_id, transition, generation)
+        return transition
+
     def _repair_consistency_for_volume_rebuild(self) -> tuple[bool, Optional[str]]:
         """Repair non-volume consistency issues before rebuilding the snapshot."""
         if not self._should_run_consistency_check():
             return True, None
 
-        checker = ConsistencyChecker(
-            state_repo=self.state_repo,
-            volume_path=self.settings.docker_volume_name,
-            db_path=self.settings.sqlite_path,
-        )
+        checker = self.get_consistency_checker()
         issues = checker.check_all()
 
         if any(issue.auto_fixable for issue in issues):
@@ -141,7 +249,7 @@ class StateService:
         """Return candidate project roots ordered by trustworthiness."""
         candidates: list[Path] = []
 
-        env_project_path = os.getenv("MANAGED_PROJECT_PATH")
+        env_project_path = get_env("MANAGED_PROJECT_PATH")
         persisted_project_path = None
         try:
             persisted_project_path = self.state_repo.get_metadata(
@@ -223,16 +331,24 @@ class StateService:
             self._cached_full_hashes = dict(genesis_hashes)
             return genesis_hashes
 
+        checkpoint_number = state_number - state_number % FILE_HASH_CHECKPOINT_INTERVAL
         if (
             self._cached_full_hashes is not None
             and self._cached_full_hashes_state_number is not None
-            and self._cached_full_hashes_state_number <= state_number
+            and checkpoint_number <= self._cached_full_hashes_state_number <= state_number
         ):
             current_hashes = dict(self._cached_full_hashes)
             start_state = self._cached_full_hashes_state_number + 1
         else:
-            current_hashes = dict(genesis_state.file_hashes or {})
-            start_state = 1
+            checkpoint = (
+                self.state_repo.get_by_number(checkpoint_number) if checkpoint_number else None
+            )
+            if checkpoint is not None and checkpoint.file_hashes:
+                current_hashes = dict(checkpoint.file_hashes)
+                start_state = checkpoint_number + 1
+            else:
+                current_hashes = dict(genesis_state.file_hashes or {})
+                start_state = 1
 
         for current_state_number in range(start_state, state_number + 1):
             state = self.state_repo.get_by_number(current_state_number)
@@ -247,6 +363,7 @@ class StateService:
         self._cached_full_hashes = dict(current_hashes)
         return current_hashes
 
+    @_invalidates_read_caches
     def genesis(
         self,
         project_path: str,
@@ -468,6 +585,53 @@ class StateService:
         except Exception as e:
             return False, None, f"Atomic operation failed: {e}"
 
+    @staticmethod
+    def _checkpoint_hashes_for_state(
+        state_number: int,
+        last_hashes: Optional[Dict[str, str]],
+        delta_hashes: Dict[str, Optional[str]],
+    ) -> Optional[Dict[str, str]]:
+        """Return full hashes for a state that lands on a checkpoint, else None.
+
+        ``last_hashes`` is the full snapshot of the state the deltas were computed
+        against; None means it could not be reconstructed and no checkpoint is written.
+        """
+        if last_hashes is None or state_number <= 0 or state_number % FILE_HASH_CHECKPOINT_INTERVAL:
+            return None
+
+        full_hashes = dict(last_hashes)
+        for file_path, hash_val in delta_hashes.items():
+            if hash_val is None:
+                full_hashes.pop(file_path, None)
+            else:
+                full_hashes[file_path] = hash_val
+        return full_hashes
+
+    def _attach_checkpoint_hashes(
+        self,
+        new_state: State,
+        last_hashes: Optional[Dict[str, str]],
+        delta_hashes: Dict[str, Optional[str]],
+    ) -> None:
+        """Store the full snapshot on ``new_state`` if its assigned number is a checkpoint.
+
+        create_next assigns MAX + 1, which differs from current + 1 after an arbitrary
+        transition, so this runs only once the real number is known.
+        """
+        full_hashes = self._checkpoint_hashes_for_state(
+            new_state.state_number, last_hashes, delta_hashes
+        )
+        if full_hashes is None:
+            return
+        if self.state_repo.set_file_hashes(new_state.state_number, full_hashes):
+            new_state.file_hashes = full_hashes
+        else:
+            logging.warning(
+                f"Failed to store checkpoint hashes for state {new_state.state_number}; "
+                "reconstruction will replay deltas from an earlier checkpoint"
+            )
+
+    @_invalidates_read_caches
     def new_state_transition(
         self, user_prompt: str, reward: float | None = None
     ) -> tuple[bool, Optional[State], str]:
@@ -475,11 +639,7 @@ class StateService:
             return False, None, "State manager not initialized. Call genesis first."
 
         if self._should_run_consistency_check():
-            checker = ConsistencyChecker(
-                state_repo=self.state_repo,
-                volume_path=self.settings.docker_volume_name,
-                db_path=self.settings.sqlite_path,
-            )
+            checker = self.get_consistency_checker()
             issues = checker.check_all()
 
             if issues:
@@ -527,8 +687,10 @@ class StateService:
 
         # Reconstruct complete file hashes for the CURRENT state so the next transition
         # stores only the delta between the real current snapshot and the project now.
+        checkpoint_base: Optional[Dict[str, str]] = None
         try:
             last_hashes = self._get_current_full_hashes(current_state)
+            checkpoint_base = last_hashes
         except StateNotFoundError as e:
             # Fallback: if genesis reconstruction fails, try to get from volume
             if volume_codebase_path is not None:
@@ -555,13 +717,13 @@ class StateService:
             file_hashes=compact_hashes,
         )
 
-        # For delta storage optimization: store only deltas for transition states
-        # Don't reconstruct full hashes here - store deltas only
+        # For delta storage optimization: store only deltas for transition states;
+        # checkpoint states get their full snapshot once the number is assigned
         success, new_state, message = self._create_state_and_transition_atomic(
             user_prompt,
             diff_info,
             current_state,
-            None,  # No full hashes for transition states (save space)
+            None,
             delta_hashes,  # Store actual deltas for optimization
             project_path,  # NOVO: Passar project_path
             current_branch_name=current_branch_name,
@@ -575,6 +737,7 @@ class StateService:
         # for true atomicity. If the method returns success=True, current is already set.
 
         if success and new_state:
+            self._attach_checkpoint_hashes(new_state, checkpoint_base, delta_hashes)
             try:
                 if volume_codebase_path is not None:
                     self.git_manager.sync_project_to_volume(
@@ -600,6 +763,7 @@ class StateService:
 
         return success, new_state, message
 
+    @_invalidates_read_caches
     def arbitrary_state_transition(
         self, next_state: int, user_prompt: Optional[str] = None
     ) -> tuple[bool, Optional[State], str]:
@@ -656,6 +820,7 @@ class StateService:
             f"Arbitrary transition to state {next_state} successful",
         )
 
+    @_invalidates_read_caches
     def fix_volume_path(
         self, project_path: Optional[str] = None
     ) -> tuple[bool, Optional[dict], str]:
@@ -769,11 +934,7 @@ class StateService:
             self._initialized_cache = True
 
             if self._should_run_consistency_check():
-                checker = ConsistencyChecker(
-                    state_repo=self.state_repo,
-                    volume_path=self.settings.docker_volume_name,
-                    db_path=self.settings.sqlite_path,
-                )
+                checker = self.get_consistency_checker()
                 remaining_issues = checker.check_all()
                 blocking_issues = [
                     issue.message
@@ -808,7 +969,7 @@ class StateService:
     def get_current_state(self) -> tuple[Optional[State], str]:
         if not self._is_initialized(self.settings.docker_volume_name):
             return None, "State manager not initialized. Call genesis first."
-        state = self.state_repo.get_current()
+        state = self._cached_current_state()
         if state:
             return self._ensure_compact_state_context(state), "Current state retrieved"
         return None, "No state found"
@@ -816,7 +977,7 @@ class StateService:
     def get_current_state_number(self) -> tuple[Optional[int], str]:
         if not self._is_initialized(self.settings.docker_volume_name):
             return None, "State manager not initialized. Call genesis first."
-        state = self.state_repo.get_current()
+        state = self._cached_current_state()
         if state:
             return state.state_number, "Current state number retrieved"
         return None, "No state found"
@@ -824,11 +985,46 @@ class StateService:
     def get_state_info(self, state_number: int) -> tuple[Optional[State], str]:
         if not self._is_initialized(self.settings.docker_volume_name):
             return None, "State manager not initialized. Call genesis first."
-        state = self.state_repo.get_by_number(state_number)
+        state = self._cached_state(state_number)
         if state:
             return self._ensure_compact_state_context(state), f"State {state_number} info retrieved"
         return None, f"State {state_number} not found"
 
+    def get_states_info(self, state_numbers: list[int]) -> tuple[list[State], list[int], str]:
+        """Fetch several states at once, reading only cache misses from the repository.
+
+        Returns:
+            The found states ordered by state number, the requested numbers that do not
+            exist, and a status message
+        """
+        if not self._is_initialized(self.settings.docker_volume_name):
+            return [], [], "State manager not initialized. Call genesis first."
+
+        requested = sorted(set(state_numbers))
+        found: dict[int, State] = {}
+        misses = []
+        with self._cache_lock:
+            generation = self._cache_generation
+            for state_number in requested:
+                state = self._state_cache.get(state_number)
+                if state is None:
+                    misses.append(state_number)
+                else:
+                    self._state_cache.move_to_end(state_number)
+                    found[state_number] = state
+        if misses:
+            for state in self.state_repo.get_many(misses):
+                self._remember(self._state_cache, state.state_number, state, generation)
+                found[state.state_number] = state
+
+        states = [
+            self._ensure_compact_state_context(found[number])
+            for number in requested
+            if number in found
+        ]
+        missing = [number for number in requested if number not in found]
+        return states, missing, f"{len(states)} of {len(requested)} states retrieved"
+
     def _get_generation_reward_by_state(self) -> dict[int, float | None]:
         total_transitions = self.transition_repo.count()
         if total_transitions <= 0:
@@ -900,12 +1096,7 @@ class StateService:
                     [],
                     "Invalid selector: start_state cannot be greater than end_state",
                 )
-            all_states = self.state_repo.get_all()
-            selected_states = [
-                candidate
-                for candidate in all_states
-                if start_state <= candidate.state_number <= end_state
-            ]
+            selected_states = self.state_repo.get_many(list(range(start_state, end_state + 1)))
             found_numbers = {candidate.state_number for candidate in selected_states}
             missing_states = [
                 state_number
@@ -1024,19 +1215,27 @@ class StateService:
             )
         return payload
 
-    def get_state_transitions(self, state_number: int) -> tuple[list, str]:
+    def get_state_transitions(
+        self, state_number: int, limit: Optional[int] = None, offset: int = 0
+    ) -> tuple[list, str]:
         if not self._is_initialized(self.settings.docker_volume_name):
             return [], "State manager not initialized. Call genesis first."
         transitions = self.transition_repo.get_by_state(state_number)
-        result = [self._transition_payload(transition, state_number) for transition in transitions]
-        return result, f"Transitions for state {state_number} retrieved: {len(result)} total"
+        result = [
+            self._transition_payload(transition, state_number)
+            for transition in _page(transitions, limit, offset)
+        ]
+        return result, (
+            f"Transitions for state {state_number} retrieved: "
+            f"{_page_summary(len(result), len(transitions), limit, offset)}"
+        )
 
     def get_transition_info(self, transition_id: str) -> tuple[Optional[dict], str]:
         if not self._is_initialized(self.settings.docker_volume_name):
             return None, "State manager not initialized. Call genesis first."
         try:
             transition_id_int = int(transition_id)
-            transition = self.transition_repo.get_by_id(transition_id_int)
+            transition = self._cached_transition(transition_id_int)
             if transition:
                 return transition.to_dict(), f"Transition {transition_id} info retrieved"
             return None, f"Transition {transition_id} not found"
@@ -1058,13 +1257,21 @@ class StateService:
 
         return self._get_full_hashes_for_state(current_state.state_number)
 
-    def get_rewarded_transitions(self) -> tuple[list[dict[str, object]], str]:
+    def get_rewarded_transitions(
+        self, limit: Optional[int] = None, offset: int = 0
+    ) -> tuple[list[dict[str, object]], str]:
         if not self._is_initialized(self.settings.docker_volume_name):
             return [], "State manager not initialized. Call genesis first."
         transitions = self.transition_repo.get_rewarded()
-        result = [self._transition_payload(transition) for transition in transitions]
-        return result, f"Rewarded transitions retrieved: {len(result)} total"
+        result = [
+            self._transition_payload(transition) for transition in _page(transitions, limit, offset)
+        ]
+        return result, (
+            "Rewarded transitions retrieved: "
+            f"{_page_summary(len(result), len(transitions), limit, offset)}"
+        )
 
+    @_invalidates_read_caches
     def set_transition_reward(
         self,
         reward: float | None,
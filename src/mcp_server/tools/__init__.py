@@ -13,6 +13,7 @@ from .mcp_tools import (
     get_rewarded_transitions,
     get_state_info,
     get_state_transitions,
+    get_states_info,
     get_transition_info,
     new_state_transition,
     search_states,
@@ -23,7 +24,7 @@ from .mcp_tools import (
     track_transitions,
 )
 
-__all__ = [
+__all__ = (
     "arbitrary_state_transition",
     "fix_volume_path",
     "genesis",
@@ -38,6 +39,7 @@ __all__ = [
     "get_rewarded_transitions",
     "get_state_info",
     "get_state_transitions",
+    "get_states_info",
     "get_transition_info",
     "new_state_transition",
     "search_states",
@@ -46,4 +48,4 @@ __all__ = [
     "start_genesis",
     "total_states",
     "track_transitions",
-]
+)
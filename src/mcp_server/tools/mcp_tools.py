@@ -17,6 +17,7 @@ from .volume_fix_jobs import VolumeFixJobManager
 logger = get_logger(__name__)
 _volume_operation_jobs = VolumeFixJobManager()
 VALID_STATE_REPRESENTATIONS = {"raw", "compact", "both"}
+MAX_STATES_PER_REQUEST = 100
 
 
 def _state_meta(state_representation: str) -> dict[str, object]:
@@ -35,6 +36,15 @@ def _validate_state_representation(state_representation: str) -> dict[str, objec
     }
 
 
+def _validate_page(limit: int | None, offset: int) -> dict[str, object] | None:
+    if (limit is None or limit > 0) and offset >= 0:
+        return None
+    return {
+        "success": False,
+        "message": "Invalid page. Expected limit >= 1 (or unset) and offset >= 0",
+    }
+
+
 def _raw_state_payload(state: Any) -> dict[str, Any] | None:
     if state is None:
         return None
@@ -538,6 +548,48 @@ def get_state_info(
     }
 
 
+def get_states_info(
+    state_service: StateService,
+    states: list[int],
+    state_representation: str = "raw",
+    client_id: str = "default",
+) -> dict:
+    """Get information for several states in one call.
+
+    Args:
+        state_service: StateService instance
+        states: State numbers to fetch (at most MAX_STATES_PER_REQUEST)
+        state_representation: Payload representation for each state
+        client_id: Client identifier for rate limiting
+
+    Returns:
+        Dict with success status, states ordered by number, missing numbers, and message
+    """
+    invalid_representation = _validate_state_representation(state_representation)
+    if invalid_representation is not None:
+        return invalid_representation
+    if len(states) > MAX_STATES_PER_REQUEST:
+        return {
+            "success": False,
+            "message": f"Too many states requested, maximum is {MAX_STATES_PER_REQUEST}",
+        }
+
+    rate_result = _handle_rate_limit(client_id, "get_states_info")
+    if rate_result:
+        return rate_result
+
+    state_objs, missing, message = state_service.get_states_info(states)
+    return {
+        "success": bool(state_objs) or not states,
+        "states": [
+            _serialize_state_payload(state_obj, state_representation) for state_obj in state_objs
+        ],
+        "missing": missing,
+        "message": message,
+        "_meta": _state_meta(state_representation),
+    }
+
+
 def get_current_state_compact_context(
     state_service: StateService,
     include_vocabulary: bool = False,
@@ -632,6 +684,8 @@ def search_states(
 def get_state_transitions(
     state_service: StateService,
     state: int,
+    limit: int | None = None,
+    offset: int = 0,
     client_id: str = "default",
 ) -> dict:
     """Get transitions for a specific state.
@@ -639,16 +693,22 @@ def get_state_transitions(
     Args:
         state_service: StateService instance
         state: State number
+        limit: Maximum number of transitions to return, all when unset
+        offset: Number of transitions to skip before the returned page
         client_id: Client identifier for rate limiting
 
     Returns:
         Dict with success status, transitions, and message
     """
+    invalid_page = _validate_page(limit, offset)
+    if invalid_page is not None:
+        return invalid_page
+
     rate_result = _handle_rate_limit(client_id, "get_state_transitions")
     if rate_result:
         return rate_result
 
-    transitions, message = state_service.get_state_transitions(state)
+    transitions, message = state_service.get_state_transitions(state, limit=limit, offset=offset)
     return {"success": True, "transitions": transitions, "message": message}
 
 
@@ -677,14 +737,20 @@ def get_transition_info(
 
 def get_rewarded_transitions(
     state_service: StateService,
+    limit: int | None = None,
+    offset: int = 0,
     client_id: str = "default",
 ) -> dict:
-    """Get transitions with non-null reward values."""
+    """Get transitions with non-null reward values, optionally one page at a time."""
+    invalid_page = _validate_page(limit, offset)
+    if invalid_page is not None:
+        return invalid_page
+
     rate_result = _handle_rate_limit(client_id, "get_rewarded_transitions")
     if rate_result:
         return rate_result
 
-    transitions, message = state_service.get_rewarded_transitions()
+    transitions, message = state_service.get_rewarded_transitions(limit=limit, offset=offset)
     return {"success": True, "transitions": transitions, "message": message}
 
 
@@ -194,13 +194,10 @@ class ConsistencyChecker:
     def _check_state_sequence(self):
         """Check if state numbers are sequential without gaps."""
         try:
-            all_states = self.state_repo.get_all()
-            if not all_states:
+            state_numbers = sorted(self.state_repo.get_state_numbers())
+            if not state_numbers:
                 return
 
-            state_numbers = [s.state_number for s in all_states]
-            state_numbers.sort()
-
             # Check for gaps
             expected_sequence = list(range(state_numbers[0], state_numbers[-1] + 1))
             missing = set(expected_sequence) - set(state_numbers)
@@ -283,15 +280,15 @@ class ConsistencyChecker:
     def _fix_reset_current_to_latest(self) -> bool:
         """Reset current state pointer to the latest state."""
         try:
-            all_states = self.state_repo.get_all()
-            if not all_states:
+            state_numbers = self.state_repo.get_state_numbers()
+            if not state_numbers:
                 return False
 
-            latest_state = max(all_states, key=lambda s: s.state_number)
-            success = self.state_repo.set_current(latest_state.state_number)
+            latest_state_number = max(state_numbers)
+            success = self.state_repo.set_current(latest_state_number)
 
             if success:
-                logger.info(f"Reset current state pointer to state {latest_state.state_number}")
+                logger.info(f"Reset current state pointer to state {latest_state_number}")
             return bool(success)
         except Exception as e:
             logger.error(f"Failed to reset current state pointer: {e}")
@@ -0,0 +1,27 @@
+"""JSON encoding for persisted hash maps, using orjson when it is installed."""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the optional "fast" extra
+    orjson = None  # type: ignore[assignment]
+
+
+def dumps(value: Any) -> str:
+    """Serialize a value to a compact JSON string."""
+    if orjson is not None:
+        return orjson.dumps(value).decode("utf-8")
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def loads(data: str | bytes) -> Any:
+    """Parse a JSON document.
+
+    Raises:
+        json.JSONDecodeError: If the payload is not valid JSON (orjson's error subclasses it)
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -55,6 +55,8 @@ class ContextFilter(logging.Filter):
 
 _context_filter = ContextFilter()
 
+PROTOCOL_LOGGER_NAMES = ("mcp", "anyio", "asyncio")
+
 
 def setup_logging(
     log_level: str = "INFO",
@@ -104,6 +106,25 @@ def setup_logging(
     return root_logger
 
 
+def enable_protocol_debug_logging(log_level: str) -> bool:
+    """Turn on DEBUG for the MCP transport loggers when the server runs at DEBUG.
+
+    These loggers emit a record per protocol message, so they stay at their default
+    level unless debugging was explicitly requested.
+
+    Args:
+        log_level: Configured application log level
+
+    Returns:
+        True if the transport loggers were switched to DEBUG
+    """
+    if log_level.upper() != "DEBUG":
+        return False
+    for name in PROTOCOL_LOGGER_NAMES:
+        logging.getLogger(name).setLevel(logging.DEBUG)
+    return True
+
+
 def get_logger(name: str) -> logging.Logger:
     """Get a logger with the given name.
 
@@ -2,6 +2,7 @@
 
 from sqlalchemy import text
 from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
 
 STATE_COLUMN_DEFINITIONS = {
     "llm_context": "TEXT NULL",
@@ -13,6 +14,46 @@ TRANSITION_COLUMN_DEFINITIONS = {
     "reward": "REAL NULL",
 }
 
+# get_last sorts by timestamp and get_by_state filters on current_state ordered by id;
+# without these both scan and sort the whole transitions table.
+TRANSITION_INDEX_DEFINITIONS = {
+    "ix_transitions_timestamp": "timestamp",
+    "ix_transitions_current_state": "current_state, id",
+}
+
+STATE_SEARCH_TABLE = "states_fts"
+
+# External-content FTS5 table over states.user_prompt. The trigram tokenizer lets
+# LIKE '%text%' use the index, so search keeps its substring semantics.
+_STATE_SEARCH_DDL = (
+    f"""
+    CREATE VIRTUAL TABLE {STATE_SEARCH_TABLE} USING fts5(
+        user_prompt, content='states', content_rowid='state_number', tokenize='trigram'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS states_fts_ai AFTER INSERT ON states BEGIN
+        INSERT INTO {STATE_SEARCH_TABLE}(rowid, user_prompt)
+        VALUES (new.state_number, new.user_prompt);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS states_fts_ad AFTER DELETE ON states BEGIN
+        INSERT INTO {STATE_SEARCH_TABLE}({STATE_SEARCH_TABLE}, rowid, user_prompt)
+        VALUES ('delete', old.state_number, old.user_prompt);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS states_fts_au AFTER UPDATE OF user_prompt ON states BEGIN
+        INSERT INTO {STATE_SEARCH_TABLE}({STATE_SEARCH_TABLE}, rowid, user_prompt)
+        VALUES ('delete', old.state_number, old.user_prompt);
+        INSERT INTO {STATE_SEARCH_TABLE}(rowid, user_prompt)
+        VALUES (new.state_number, new.user_prompt);
+    END
+    """,
+    f"INSERT INTO {STATE_SEARCH_TABLE}({STATE_SEARCH_TABLE}) VALUES ('rebuild')",
+)
+
 
 def _column_names(engine: Engine, table_name: str) -> set[str]:
     with engine.connect() as connection:
@@ -42,3 +83,31 @@ def ensure_schema_columns(engine: Engine) -> None:
     """Ensure optional SCC-E and reward columns exist in SQLite tables."""
     _ensure_table_columns(engine, "states", STATE_COLUMN_DEFINITIONS)
     _ensure_table_columns(engine, "transitions", TRANSITION_COLUMN_DEFINITIONS)
+
+
+def ensure_schema_indexes(engine: Engine) -> None:
+    """Create the transition lookup indexes on databases created before they existed."""
+    with engine.begin() as connection:
+        for index_name, columns in TRANSITION_INDEX_DEFINITIONS.items():
+            connection.execute(
+                text(f"CREATE INDEX IF NOT EXISTS {index_name} ON transitions ({columns})")
+            )
+
+
+def ensure_state_search_index(engine: Engine) -> bool:
+    """Create the states full-text index if missing; return False when FTS5 is unavailable."""
+    with engine.connect() as connection:
+        existing = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": STATE_SEARCH_TABLE},
+        ).first()
+    if existing is not None:
+        return True
+
+    try:
+        with engine.begin() as connection:
+            for statement in _STATE_SEARCH_DDL:
+                connection.execute(text(statement))
+    except OperationalError:
+        return False
+    return True
@@ -3,8 +3,8 @@
 Test script for Codebase State Manager MCP Server
 """
 
-import sys
 import os
+import sys
 from pathlib import Path
 
 # Add src to path
@@ -17,6 +17,7 @@ from mcp_server.services.git_manager import GitManager
 from mcp_server.services.state_service import StateService
 from mcp_server.tools import genesis, get_current_state_number, total_states
 
+
 def main():
     print("Testing Codebase State Manager MCP Server...")
 
@@ -26,8 +27,9 @@ def main():
     # Get settings
     settings = get_settings()
     print(f"Database mode: {settings.db_mode}")
-    print(f"NEO4J_ENABLED env: {os.getenv('NEO4J_ENABLED')}")
-    print(f"DB_MODE env: {os.getenv('DB_MODE')}")
+    env = os.environ
+    print(f"NEO4J_ENABLED env: {env.get('NEO4J_ENABLED')}")
+    print(f"DB_MODE env: {env.get('DB_MODE')}")
 
     # Create repositories
     state_repo, transition_repo = create_sqlite_repositories(
@@ -72,7 +74,9 @@ def main():
     except Exception as e:
         print(f"Error: {e}")
         import traceback
+
         traceback.print_exc()
 
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -63,6 +63,12 @@ class MockStateRepository:
         self.states[next_num] = state
         return True
 
+    def set_file_hashes(self, state_number, file_hashes):
+        if state_number not in self.states:
+            return False
+        self.states[state_number].file_hashes = file_hashes
+        return True
+
     def set_current(self, state_number: int) -> bool:
         if state_number not in self.states:
             return False
@@ -217,6 +223,35 @@ class TestCompleteWorkflows:
         assert success is True
         assert state.state_number == 2
 
+    def test_checkpoint_follows_assigned_number_after_arbitrary_jump(
+        self, state_service, mock_state_repo, git_manager, temp_project, tmp_path
+    ):
+        """The full snapshot lands on the number create_next assigns, not current + 1."""
+        from src.mcp_server.services.state_service import FILE_HASH_CHECKPOINT_INTERVAL
+
+        state_service.genesis(str(temp_project), str(tmp_path / "volume"))
+        for number in range(1, FILE_HASH_CHECKPOINT_INTERVAL):
+            state_service.new_state_transition(f"State {number}")
+
+        success, _, msg = state_service.arbitrary_state_transition(5)
+        assert success is True, msg
+
+        git_manager.compute_changes_since_last_state.return_value = (
+            "{}",
+            {"main.py": "after-jump"},
+        )
+        success, state, msg = state_service.new_state_transition("After jump")
+
+        assert success is True, msg
+        assert state.state_number == FILE_HASH_CHECKPOINT_INTERVAL
+        assert mock_state_repo.states[FILE_HASH_CHECKPOINT_INTERVAL].file_hashes == {
+            "main.py": "after-jump"
+        }
+        assert all(
+            mock_state_repo.states[number].file_hashes is None
+            for number in range(1, FILE_HASH_CHECKPOINT_INTERVAL)
+        )
+
     def test_state_search_functionality(self, state_service, temp_project, settings, tmp_path):
         """Test searching states by prompt content."""
         from src.mcp_server.utils.init_manager import is_initialized
@@ -440,7 +475,9 @@ class TestMCPToolsIntegration:
         assert result["preview"]["vocabulary"] is not None
         assert before == after
 
-    def test_get_compact_states_tool_returns_generation_reward(self, state_service, settings, tmp_path):
+    def test_get_compact_states_tool_returns_generation_reward(
+        self, state_service, settings, tmp_path
+    ):
         """Test compact state retrieval with the generation reward attached."""
         from src.mcp_server.tools import get_compact_states
 
@@ -144,6 +144,60 @@ class TestSQLiteStateRepository:
         results = state_repo.search("user")
         assert 2 in results
 
+    def test_search_uses_full_text_index_and_tracks_deletes(self, sqlite_repos):
+        """Test search goes through the FTS table and stays in sync with writes."""
+        state_repo, _ = sqlite_repos
+        for number, prompt in enumerate(["Refactor Parser", "parse config", "misc"]):
+            state_repo.create(
+                State(
+                    state_number=number,
+                    user_prompt=prompt,
+                    branch_name="main",
+                    git_diff_info=None,
+                    hash=f"hash-{number}",
+                )
+            )
+
+        assert state_repo._search_index_enabled is True
+        assert state_repo.search("PARSE") == [0, 1]
+        assert state_repo.search("fig") == [1]
+
+        state_repo.delete(1)
+
+        assert state_repo.search("parse") == [0]
+
+    def test_search_index_is_backfilled_for_existing_database(self, settings):
+        """Test opening a database created before the FTS table indexes old states."""
+        connection = sqlite3.connect(settings.sqlite_path)
+        connection.execute(
+            "CREATE TABLE states (state_number INTEGER PRIMARY KEY, user_prompt TEXT NOT NULL, "
+            "branch_name VARCHAR(255) NOT NULL, git_diff_info TEXT, hash VARCHAR(64) UNIQUE "
+            "NOT NULL, created_at DATETIME, file_hashes TEXT, file_hash_deltas TEXT)"
+        )
+        connection.execute(
+            "INSERT INTO states (state_number, user_prompt, branch_name, hash) "
+            "VALUES (0, 'legacy genesis', 'main', 'legacy-hash')"
+        )
+        connection.commit()
+        connection.close()
+
+        state_repo, _ = create_sqlite_repositories(path=settings.sqlite_path, settings=settings)
+
+        assert state_repo.search("genesis") == [0]
+
+    def test_engine_applies_wal_and_tuning_pragmas(self, sqlite_repos):
+        """Test connections are opened in WAL mode with relaxed fsync."""
+        state_repo, _ = sqlite_repos
+
+        with state_repo._engine.connect() as connection:
+            journal_mode = connection.exec_driver_sql("PRAGMA journal_mode").scalar()
+            synchronous = connection.exec_driver_sql("PRAGMA synchronous").scalar()
+            temp_store = connection.exec_driver_sql("PRAGMA temp_store").scalar()
+
+        assert journal_mode == "wal"
+        assert synchronous == 1
+        assert temp_store == 2
+
     def test_duplicate_hash_prevention(self, sqlite_repos):
         """Test that duplicate hashes are handled correctly."""
         state_repo, _ = sqlite_repos
@@ -189,6 +243,82 @@ class TestSQLiteStateRepository:
         assert retrieved.file_hashes is None
         assert retrieved.file_hash_deltas == {"tracked.txt": "abc123", "removed.txt": None}
 
+    def test_get_many_returns_existing_states_in_order(self, sqlite_repos):
+        """Test fetching several states with one call."""
+        state_repo, _ = sqlite_repos
+
+        for number in range(4):
+            state_repo.create(
+                State(
+                    state_number=number,
+                    user_prompt=f"State {number}",
+                    branch_name="main",
+                    git_diff_info="diff",
+                    hash=f"hash{number}",
+                )
+            )
+
+        states = state_repo.get_many([3, 1, 7, 1])
+
+        assert [state.state_number for state in states] == [1, 3]
+        assert state_repo.get_many([]) == []
+
+    def test_get_state_numbers_lists_numbers_in_order(self, sqlite_repos):
+        """Test listing state numbers without loading the states."""
+        state_repo, _ = sqlite_repos
+
+        assert state_repo.get_state_numbers() == []
+        for number in (2, 0, 1):
+            state_repo.create(
+                State(
+                    state_number=number,
+                    user_prompt=f"State {number}",
+                    branch_name="main",
+                    git_diff_info="diff",
+                    hash=f"hash{number}",
+                )
+            )
+
+        assert state_repo.get_state_numbers() == [0, 1, 2]
+
+    def test_set_file_hashes_attaches_a_snapshot(self, sqlite_repos):
+        """Test storing a checkpoint snapshot on an existing state."""
+        state_repo, _ = sqlite_repos
+        state = State(
+            state_number=0,
+            user_prompt="Checkpoint",
+            branch_name="main",
+            git_diff_info="diff",
+            hash="",
+        )
+        state_repo.create_next(state)
+
+        assert state_repo.set_file_hashes(state.state_number, {"a.py": "x"}) is True
+        assert state_repo.get_by_number(state.state_number).file_hashes == {"a.py": "x"}
+        assert state_repo.set_file_hashes(99, {"a.py": "x"}) is False
+
+    def test_create_many_inserts_states_in_one_batch(self, sqlite_repos):
+        """Test bulk-inserting states, skipping ones that already exist."""
+        state_repo, _ = sqlite_repos
+        states = [
+            State(
+                state_number=number,
+                user_prompt=f"Bulk {number}",
+                branch_name="main",
+                git_diff_info="diff",
+                hash=f"bulk{number}",
+                file_hash_deltas={"a.py": f"h{number}"},
+            )
+            for number in range(3)
+        ]
+        state_repo.create(states[0])
+
+        assert state_repo.create_many(states) == 2
+        assert state_repo.create_many([]) == 0
+        assert state_repo.get_state_numbers() == [0, 1, 2]
+        assert state_repo.get_by_number(2).file_hash_deltas == {"a.py": "h2"}
+        assert state_repo.search("Bulk 1") == [1]
+
     def test_metadata_roundtrip(self, sqlite_repos):
         """Test storing and reading generic metadata values."""
         state_repo, _ = sqlite_repos
@@ -273,9 +403,15 @@ class TestSQLiteStateRepository:
             transition_columns = {
                 row[1] for row in connection.execute("PRAGMA table_info(transitions)")
             }
+            transition_indexes = {
+                row[1] for row in connection.execute("PRAGMA index_list(transitions)")
+            }
 
         assert {"llm_context", "compression_version", "compacted_at"}.issubset(state_columns)
         assert {"reward"}.issubset(transition_columns)
+        assert {"ix_transitions_timestamp", "ix_transitions_current_state"}.issubset(
+            transition_indexes
+        )
 
         recovered_state = state_repo.get_by_number(0)
         recovered_transition = transition_repo.get_by_id(1)
@@ -284,6 +420,29 @@ class TestSQLiteStateRepository:
         assert recovered_transition is not None
         assert recovered_transition.user_prompt == "Initial transition"
 
+    def test_update_file_hash_deltas_rewrites_many_states(self, sqlite_repos):
+        """Test bulk delta updates land in one call and clear empty deltas."""
+        state_repo, _ = sqlite_repos
+        for number in range(3):
+            state_repo.create(
+                State(
+                    state_number=number,
+                    user_prompt=f"state {number}",
+                    branch_name="main",
+                    git_diff_info=None,
+                    hash=f"hash-{number}",
+                    file_hash_deltas={"stale.py": "old"},
+                )
+            )
+
+        written = state_repo.update_file_hash_deltas({1: {"a.py": "h1", "gone.py": None}, 2: {}})
+
+        assert written == 2
+        assert state_repo.get_by_number(0).file_hash_deltas == {"stale.py": "old"}
+        assert state_repo.get_by_number(1).file_hash_deltas == {"a.py": "h1", "gone.py": None}
+        assert state_repo.get_by_number(2).file_hash_deltas == {}
+        assert state_repo.update_file_hash_deltas({}) == 0
+
 
 class TestSQLiteTransitionRepository:
     """Integration tests for SQLite Transition Repository."""
@@ -452,6 +611,18 @@ class TestSQLiteTransitionRepository:
         assert updated is not None
         assert updated.reward == 4.0
 
+    def test_create_many_inserts_transitions_with_their_ids(self, sqlite_repos):
+        """Test bulk-inserting transitions."""
+        _, transition_repo = sqlite_repos
+        transitions = [
+            Transition(transition_id=number, current_state=number - 1, next_state=number)
+            for number in range(1, 4)
+        ]
+
+        assert transition_repo.create_many(transitions) == 3
+        assert transition_repo.count() == 3
+        assert transition_repo.get_by_id(3).current_state == 2
+
 
 class TestSQLiteIntegrationWorkflow:
     """Integration tests for complete SQLite workflows."""
@@ -64,6 +64,12 @@ class MockStateRepository:
         self._max_state_number = next_num
         return True
 
+    def set_file_hashes(self, state_number: int, file_hashes) -> bool:
+        if state_number not in self.states:
+            return False
+        self.states[state_number].file_hashes = file_hashes
+        return True
+
     def set_current(self, state_number: int) -> bool:
         if state_number not in self.states:
             return False
@@ -4,8 +4,9 @@ from pathlib import Path
 from unittest.mock import MagicMock, PropertyMock, patch
 
 import pytest
+from dotenv import dotenv_values
 
-from src.mcp_server.config import Settings
+from src.mcp_server.config import Settings, get_env
 
 
 class TestSettings:
@@ -46,7 +47,7 @@ class TestSettings:
 
     def test_settings_from_env_missing(self):
         with patch.dict(os.environ, {}, clear=True):
-            with patch("src.mcp_server.config.load_dotenv"):
+            with patch("src.mcp_server.config._load_env_file", return_value={}):
                 settings = Settings.from_env()
                 expected_volume_path = str(
                     Path("/opt/codebase-state-manager/volumes") / Path.cwd().resolve().name
@@ -67,20 +68,49 @@ class TestSettings:
             "NEO4J_PASSWORD": "secret",
         }
         with patch.dict(os.environ, env, clear=True):
-            with patch("src.mcp_server.config.load_dotenv"):
+            with patch("src.mcp_server.config._load_env_file", return_value={}):
                 settings = Settings.from_env()
                 assert settings.neo4j_bootstrap_mode == "external"
                 assert settings.neo4j_auth_enabled is True
                 assert settings.neo4j_uri == "bolt://neo4j.example:7687"
                 assert settings.neo4j_password == "secret"
 
-    def test_settings_from_env_uses_opt_fallback_named_after_project_directory(self, tmp_path, monkeypatch):
+    def test_settings_from_env_parses_flags_and_integers(self):
+        env = {
+            "NEO4J_ENABLED": " Off ",
+            "NEO4J_AUTH_ENABLED": "",
+            "RATE_LIMIT_ENABLED": "ON",
+            "AUDIT_ENABLED": "no",
+            "MAX_PROMPT_LENGTH": "42",
+        }
+        with patch.dict(os.environ, env, clear=True):
+            with patch("src.mcp_server.config._load_env_file", return_value={}):
+                settings = Settings.from_env()
+                assert settings.neo4j_enabled is False
+                assert settings.db_mode == "sqlite"
+                assert settings.neo4j_auth_enabled is False
+                assert settings.rate_limit_enabled is True
+                assert settings.audit_enabled is False
+                assert settings.max_prompt_length == 42
+                assert settings.max_state_number == 1000000
+
+    def test_settings_from_env_reads_blank_flags_as_false(self):
+        env = {"RATE_LIMIT_ENABLED": "", "AUDIT_ENABLED": " "}
+        with patch.dict(os.environ, env, clear=True):
+            with patch("src.mcp_server.config._load_env_file", return_value={}):
+                settings = Settings.from_env()
+                assert settings.rate_limit_enabled is False
+                assert settings.audit_enabled is False
+
+    def test_settings_from_env_uses_opt_fallback_named_after_project_directory(
+        self, tmp_path, monkeypatch
+    ):
         project_root = tmp_path / "my-project"
         project_root.mkdir()
         monkeypatch.chdir(project_root)
 
         with patch.dict(os.environ, {}, clear=True):
-            with patch("src.mcp_server.config.load_dotenv"):
+            with patch("src.mcp_server.config._load_env_file", return_value={}):
                 settings = Settings.from_env()
 
         expected_volume_path = "/opt/codebase-state-manager/volumes/my-project"
@@ -94,3 +124,49 @@ class TestSettings:
 
         assert settings.docker_volume_name == explicit_volume
         assert settings.volume_path == explicit_volume
+
+    def test_settings_from_env_reads_env_file_once_per_mtime(self, tmp_path, monkeypatch):
+        env_file = tmp_path / ".env"
+        env_file.write_text("LOG_LEVEL=DEBUG\nSQLITE_PATH=/from/dotenv.db\n")
+        monkeypatch.setattr("src.mcp_server.config.ENV_FILE_PATH", env_file)
+
+        from src.mcp_server.config import _parse_env_file
+
+        _parse_env_file.cache_clear()
+        with patch.dict(os.environ, {"SQLITE_PATH": "/from/environ.db"}, clear=True):
+            with patch(
+                "src.mcp_server.config.dotenv_values", wraps=dotenv_values
+            ) as mock_dotenv_values:
+                first = Settings.from_env()
+                second = Settings.from_env()
+            assert "LOG_LEVEL" not in os.environ
+
+        _parse_env_file.cache_clear()
+        assert mock_dotenv_values.call_count == 1
+        assert first.log_level == "DEBUG"
+        assert second.log_level == "DEBUG"
+        assert first.sqlite_path == "/from/environ.db"
+
+    def test_get_env_falls_back_to_env_file(self, tmp_path, monkeypatch):
+        env_file = tmp_path / ".env"
+        env_file.write_text("MANAGED_PROJECT_PATH=/from/dotenv\n")
+        monkeypatch.setattr("src.mcp_server.config.ENV_FILE_PATH", env_file)
+
+        from src.mcp_server.config import _parse_env_file
+
+        _parse_env_file.cache_clear()
+        with patch.dict(os.environ, {}, clear=True):
+            from_file = get_env("MANAGED_PROJECT_PATH")
+        with patch.dict(os.environ, {"MANAGED_PROJECT_PATH": "/from/environ"}, clear=True):
+            from_environ = get_env("MANAGED_PROJECT_PATH")
+        _parse_env_file.cache_clear()
+
+        assert from_file == "/from/dotenv"
+        assert from_environ == "/from/environ"
+
+    def test_settings_rejects_unknown_attributes(self):
+        settings = Settings()
+
+        assert not hasattr(settings, "__dict__")
+        with pytest.raises(AttributeError):
+            settings.volume_pth = "/typo"  # type: ignore[attr-defined]
@@ -7,7 +7,7 @@ import pytest
 
 from src.mcp_server.models.state_model import State
 from src.mcp_server.services.git_manager import GitManager
-from src.mcp_server.services.state_service import StateService
+from src.mcp_server.services.state_service import FILE_HASH_CHECKPOINT_INTERVAL, StateService
 
 
 class TestDeltaStorage:
@@ -109,6 +109,67 @@ class TestDeltaStorage:
         }
         assert reconstructed == expected
 
+    def test_reconstruct_file_hashes_starts_from_nearest_checkpoint(self):
+        """Reconstruction replays only the deltas after the closest full snapshot."""
+        interval = FILE_HASH_CHECKPOINT_INTERVAL
+        states = {
+            0: State(
+                state_number=0,
+                user_prompt="genesis",
+                branch_name="main",
+                git_diff_info="",
+                hash="genesis_hash",
+                file_hashes={"file1.py": "stale"},
+            ),
+            interval: State(
+                state_number=interval,
+                user_prompt="checkpoint",
+                branch_name="main",
+                git_diff_info="",
+                hash="checkpoint_hash",
+                file_hashes={"file1.py": "hash1", "file2.py": "hash2"},
+                file_hash_deltas={"file2.py": "hash2"},
+            ),
+            interval
+            + 1: State(
+                state_number=interval + 1,
+                user_prompt="change",
+                branch_name="main",
+                git_diff_info="",
+                hash="state_hash",
+                file_hash_deltas={"file1.py": None, "file3.py": "hash3"},
+            ),
+        }
+        mock_state_repo = MagicMock()
+        mock_state_repo.get_by_number.side_effect = states.get
+        state_service = StateService(
+            state_repo=mock_state_repo,
+            transition_repo=MagicMock(),
+            git_manager=GitManager(),
+            settings=MagicMock(),
+        )
+
+        reconstructed = state_service._reconstruct_file_hashes(interval + 1, {})
+
+        assert reconstructed == {"file2.py": "hash2", "file3.py": "hash3"}
+        requested = [call.args[0] for call in mock_state_repo.get_by_number.call_args_list]
+        assert requested == [0, interval, interval + 1]
+
+    def test_checkpoint_hashes_only_for_checkpoint_state_numbers(self):
+        """Full hashes are materialized only when the next state lands on a checkpoint."""
+        last_hashes = {"file1.py": "hash1"}
+        deltas = {"file1.py": None, "file2.py": "hash2"}
+
+        assert StateService._checkpoint_hashes_for_state(5, last_hashes, deltas) is None
+        assert StateService._checkpoint_hashes_for_state(
+            FILE_HASH_CHECKPOINT_INTERVAL, last_hashes, deltas
+        ) == {"file2.py": "hash2"}
+        assert last_hashes == {"file1.py": "hash1"}
+        assert (
+            StateService._checkpoint_hashes_for_state(FILE_HASH_CHECKPOINT_INTERVAL, None, deltas)
+            is None
+        )
+
     def test_new_transition_uses_current_state_as_delta_baseline(self):
         """Transition deltas must be computed against the current state, not the previous one."""
         mock_state_repo = MagicMock()
@@ -144,11 +205,21 @@ class TestDeltaStorage:
         )
 
         mock_state_repo.get_current.return_value = current_state
-        mock_state_repo.get_by_number.side_effect = lambda n: {0: genesis_state, 1: state1, 2: current_state}.get(n)
-        mock_state_repo.create_next.side_effect = lambda state: setattr(state, "state_number", 3) or True
+        mock_state_repo.get_by_number.side_effect = lambda n: {
+            0: genesis_state,
+            1: state1,
+            2: current_state,
+        }.get(n)
+        mock_state_repo.count.return_value = 3
+        mock_state_repo.create_next.side_effect = (
+            lambda state: setattr(state, "state_number", 3) or True
+        )
         mock_state_repo.set_current.return_value = True
         mock_transition_repo.create_next.return_value = True
-        mock_git_manager.compute_changes_since_last_state.return_value = ("{}", {"file.txt": "new-hash"})
+        mock_git_manager.compute_changes_since_last_state.return_value = (
+            "{}",
+            {"file.txt": "new-hash"},
+        )
 
         service = StateService(
             state_repo=mock_state_repo,
@@ -164,9 +235,9 @@ class TestDeltaStorage:
             success, _, _ = service.new_state_transition("Recovery prompt")
 
         assert success is True
-        assert mock_git_manager.compute_changes_since_last_state.call_args.kwargs["last_state_file_hashes"] == {
-            "file.txt": "current-hash"
-        }
+        assert mock_git_manager.compute_changes_since_last_state.call_args.kwargs[
+            "last_state_file_hashes"
+        ] == {"file.txt": "current-hash"}
 
     def test_state_model_with_deltas(self):
         """Test State model handles deltas correctly."""
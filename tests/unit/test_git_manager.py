@@ -1,3 +1,4 @@
+import hashlib
 import tempfile
 from pathlib import Path
 
@@ -23,6 +24,23 @@ def test_get_directory_hashes_excludes_binaries():
         assert "image.png" not in hashes
 
 
+def test_get_directory_hashes_keeps_sha256_digests_across_many_files():
+    """Parallel hashing must produce the same SHA256 digests that older states stored."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        dir_path = Path(tmpdir)
+        expected = {}
+        for index in range(20):
+            content = f"module {index}\n".encode("utf-8") * (index + 1)
+            relative_path = f"pkg/module_{index}.py"
+            (dir_path / "pkg").mkdir(exist_ok=True)
+            (dir_path / relative_path).write_bytes(content)
+            expected[relative_path] = hashlib.sha256(content).hexdigest()
+
+        hashes = GitManager().get_directory_hashes(dir_path)
+
+        assert hashes == expected
+
+
 def test_get_working_diff():
     """Test getting working directory diff."""
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -0,0 +1,33 @@
+import json
+
+import pytest
+
+from src.mcp_server.utils import json_codec
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def codec(request, monkeypatch):
+    if request.param == "stdlib":
+        monkeypatch.setattr(json_codec, "orjson", None)
+    elif json_codec.orjson is None:
+        pytest.skip("orjson is not installed")
+    return json_codec
+
+
+class TestJsonCodec:
+    def test_round_trips_hash_maps_compactly(self, codec):
+        payload = {"src/ção.py": "abc123", "removed.py": None}
+
+        encoded = codec.dumps(payload)
+
+        assert isinstance(encoded, str)
+        assert " " not in encoded
+        assert codec.loads(encoded) == payload
+        assert json.loads(encoded) == payload
+
+    def test_reads_documents_written_by_stdlib_json(self, codec):
+        assert codec.loads(json.dumps({"a.py": "h1"})) == {"a.py": "h1"}
+
+    def test_invalid_payload_raises_stdlib_decode_error(self, codec):
+        with pytest.raises(json.JSONDecodeError):
+            codec.loads("{not json")
@@ -7,9 +7,11 @@ from io import StringIO
 import pytest
 
 from src.mcp_server.utils.logging import (
+    PROTOCOL_LOGGER_NAMES,
     ContextFilter,
     JSONFormatter,
     clear_context,
+    enable_protocol_debug_logging,
     get_logger,
     set_session_context,
     set_state_context,
@@ -147,6 +149,32 @@ class TestSetupLogging:
         assert logger.level == logging.INFO
 
 
+class TestProtocolDebugLogging:
+    """Tests for gating MCP transport debug logging."""
+
+    @pytest.fixture(autouse=True)
+    def restore_levels(self):
+        levels = {name: logging.getLogger(name).level for name in PROTOCOL_LOGGER_NAMES}
+        yield
+        for name, level in levels.items():
+            logging.getLogger(name).setLevel(level)
+
+    def test_leaves_transport_loggers_alone_below_debug(self):
+        """Test that INFO does not turn on per-message transport logging."""
+        for name in PROTOCOL_LOGGER_NAMES:
+            logging.getLogger(name).setLevel(logging.NOTSET)
+
+        assert enable_protocol_debug_logging("INFO") is False
+        assert all(
+            logging.getLogger(name).level == logging.NOTSET for name in PROTOCOL_LOGGER_NAMES
+        )
+
+    def test_enables_transport_loggers_at_debug(self):
+        """Test that DEBUG switches the transport loggers to DEBUG."""
+        assert enable_protocol_debug_logging("debug") is True
+        assert all(logging.getLogger(name).level == logging.DEBUG for name in PROTOCOL_LOGGER_NAMES)
+
+
 class TestGetLogger:
     """Tests for get_logger function."""
 
@@ -89,6 +89,10 @@ class TestMainEntryPoint:
             patch("src.mcp_server.utils.logging.get_logger") as mock_get_logger,
             patch("src.mcp_server.utils.security.get_rate_limiter") as mock_get_rate_limiter,
             patch("src.mcp_server.utils.audit.get_audit_logger") as mock_get_audit_logger,
+            patch(
+                "src.mcp_server.services.neo4j_bootstrap.neo4j_endpoint_reachable",
+                return_value=True,
+            ),
             patch(
                 "src.mcp_server.repositories.neo4j_repository.create_neo4j_repositories",
                 return_value=mock_repositories,
@@ -138,6 +142,10 @@ class TestMainEntryPoint:
                 "src.mcp_server.services.neo4j_bootstrap.prepare_neo4j_connection",
                 return_value=mock_settings,
             ) as mock_prepare,
+            patch(
+                "src.mcp_server.services.neo4j_bootstrap.neo4j_endpoint_reachable",
+                return_value=True,
+            ),
             patch(
                 "src.mcp_server.repositories.neo4j_repository.create_neo4j_repositories",
                 return_value=mock_repositories,
@@ -158,6 +166,49 @@ class TestMainEntryPoint:
             mock_prepare.assert_called()
             mock_app_run.assert_called_once()
 
+    def test_main_falls_back_to_sqlite_when_neo4j_port_is_closed(
+        self, mock_settings, mock_repositories
+    ):
+        """Test that an unreachable Neo4j endpoint skips the driver entirely."""
+        mock_settings.db_mode = "neo4j"
+        mock_settings.neo4j_bootstrap_mode = "external"
+
+        with (
+            patch("src.mcp_server.config.get_settings", return_value=mock_settings),
+            patch("src.mcp_server.utils.logging.setup_logging"),
+            patch("src.mcp_server.utils.logging.get_logger") as mock_get_logger,
+            patch("src.mcp_server.utils.security.get_rate_limiter"),
+            patch("src.mcp_server.utils.audit.get_audit_logger"),
+            patch(
+                "src.mcp_server.services.neo4j_bootstrap.neo4j_endpoint_reachable",
+                return_value=False,
+            ),
+            patch(
+                "src.mcp_server.repositories.neo4j_repository.create_neo4j_repositories"
+            ) as mock_create_neo4j,
+            patch(
+                "src.mcp_server.repositories.sqlite_repository.create_sqlite_repositories",
+                return_value=mock_repositories,
+            ) as mock_create_sqlite,
+            patch("src.mcp_server.services.git_manager.GitManager"),
+            patch("src.mcp_server.services.state_service.StateService"),
+            patch("src.mcp_server.tools.mcp_tools"),
+            patch("src.mcp_server.mcp_server.app.run") as mock_app_run,
+        ):
+            mock_logger = MagicMock()
+            mock_get_logger.return_value = mock_logger
+
+            from src.mcp_server.__main__ import main
+
+            main()
+
+            mock_create_neo4j.assert_not_called()
+            mock_create_sqlite.assert_called_once()
+            mock_app_run.assert_called_once()
+            assert any(
+                "Falling back to SQLite" in str(call) for call in mock_logger.warning.call_args_list
+            )
+
     def test_main_disables_rate_limiting_when_disabled(self, mock_settings, mock_repositories):
         """Test that rate limiting is disabled when configured."""
         mock_settings.rate_limit_enabled = False
@@ -259,6 +310,10 @@ class TestMainEntryPoint:
                 settings=mock_settings,
             )
 
+            from src.mcp_server import mcp_server
+
+            assert mcp_server._state_service is mock_state_service_class.return_value
+
     def test_main_logs_available_tools(self, mock_settings, mock_repositories):
         """Test that available MCP tools are logged."""
         state_repo, transition_repo = mock_repositories
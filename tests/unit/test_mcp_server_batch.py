@@ -0,0 +1,145 @@
+import asyncio
+import threading
+from unittest.mock import patch
+
+from mcp.server.fastmcp.tools import Tool
+
+from src.mcp_server import mcp_server
+
+
+def _run_batch(calls, **kwargs):
+    return asyncio.run(mcp_server.batch_execute_tool(calls, **kwargs))
+
+
+def _tools(**functions):
+    return {name: Tool.from_function(fn, name=name) for name, fn in functions.items()}
+
+
+class TestBatchExecuteTool:
+    def test_returns_results_in_call_order(self):
+        async def slow_tool(value: int) -> dict:
+            await asyncio.sleep(0.01 * (3 - value))
+            return {"success": True, "value": value}
+
+        with patch.dict(mcp_server._BATCHABLE_TOOLS, _tools(slow_tool=slow_tool)):
+            response = _run_batch(
+                [{"tool": "slow_tool", "args": {"value": value}} for value in range(3)],
+                max_concurrent=3,
+            )
+
+        assert response["success"] is True
+        assert [entry["result"]["value"] for entry in response["results"]] == [0, 1, 2]
+        assert [entry["index"] for entry in response["results"]] == [0, 1, 2]
+
+    def test_limits_concurrency(self):
+        in_flight = 0
+        peak = 0
+
+        async def tracked_tool() -> dict:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {"success": True}
+
+        with patch.dict(mcp_server._BATCHABLE_TOOLS, _tools(tracked_tool=tracked_tool)):
+            _run_batch([{"tool": "tracked_tool"}] * 6, max_concurrent=2)
+
+        assert peak == 2
+
+    def test_reports_unknown_tools_and_timeouts(self):
+        async def hanging_tool() -> dict:
+            await asyncio.sleep(1)
+            return {"success": True}
+
+        with patch.dict(mcp_server._BATCHABLE_TOOLS, _tools(hanging_tool=hanging_tool)):
+            response = _run_batch(
+                [{"tool": "missing_tool"}, {"tool": "hanging_tool"}],
+                timeout_ms=10,
+            )
+
+        assert response["success"] is False
+        assert response["results"][0]["error"] == "Unknown tool: missing_tool"
+        assert "Timed out" in response["results"][1]["error"]
+
+    def test_stop_on_error_skips_pending_calls(self):
+        calls_made: list[str] = []
+
+        async def failing_tool() -> dict:
+            calls_made.append("failing")
+            return {"success": False, "message": "boom"}
+
+        async def ok_tool() -> dict:
+            calls_made.append("ok")
+            return {"success": True}
+
+        with patch.dict(
+            mcp_server._BATCHABLE_TOOLS, _tools(failing_tool=failing_tool, ok_tool=ok_tool)
+        ):
+            response = _run_batch(
+                [{"tool": "failing_tool"}, {"tool": "ok_tool"}],
+                max_concurrent=1,
+                stop_on_error=True,
+            )
+
+        assert calls_made == ["failing"]
+        assert response["results"][1]["skipped"] is True
+
+    def test_validates_and_coerces_sub_call_args(self):
+        async def typed_tool(value: int) -> dict:
+            return {"success": True, "value": value}
+
+        with patch.dict(mcp_server._BATCHABLE_TOOLS, _tools(typed_tool=typed_tool)):
+            response = _run_batch(
+                [
+                    {"tool": "typed_tool", "args": {"value": "7"}},
+                    {"tool": "typed_tool", "args": {"value": "seven"}},
+                    {"tool": "typed_tool", "args": {}},
+                ]
+            )
+
+        assert response["results"][0]["result"]["value"] == 7
+        assert response["results"][1]["success"] is False
+        assert "validation error" in response["results"][1]["error"]
+        assert response["results"][2]["success"] is False
+
+    def test_timed_out_call_keeps_its_service_slot_until_done(self):
+        release = threading.Event()
+
+        def blocking_job() -> dict:
+            release.wait(5)
+            return {"success": True}
+
+        async def blocking_tool() -> dict:
+            return await mcp_server._call_service(blocking_job)
+
+        async def scenario():
+            slots = mcp_server._get_service_slots(asyncio.get_running_loop())
+            free_before = slots._value
+            with patch.dict(mcp_server._BATCHABLE_TOOLS, _tools(blocking_tool=blocking_tool)):
+                response = await mcp_server.batch_execute_tool(
+                    [{"tool": "blocking_tool"}], timeout_ms=10
+                )
+            held_after_timeout = slots._value
+            release.set()
+            for _ in range(100):
+                if slots._value == free_before:
+                    break
+                await asyncio.sleep(0.01)
+            return response, free_before, held_after_timeout, slots._value
+
+        response, free_before, held_after_timeout, free_after = asyncio.run(scenario())
+
+        assert "Timed out" in response["results"][0]["error"]
+        assert held_after_timeout == free_before - 1
+        assert free_after == free_before
+
+    def test_rejects_oversized_batches(self):
+        response = _run_batch([{"tool": "total_states_tool"}] * (mcp_server.MAX_BATCH_CALLS + 1))
+
+        assert response["success"] is False
+
+    def test_batch_tool_cannot_call_itself(self):
+        assert "batch_execute_tool" not in mcp_server._BATCHABLE_TOOLS
+        assert "get_state_info_tool" in mcp_server._BATCHABLE_TOOLS
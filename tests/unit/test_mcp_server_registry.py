@@ -1,7 +1,6 @@
 import ast
 from pathlib import Path
 
-
 MCP_SERVER_PATH = Path("src/mcp_server/mcp_server.py")
 
 
@@ -41,15 +40,30 @@ def _registered_tool_names(tree: ast.Module) -> list[str]:
     raise AssertionError("registered_tool_names not found")
 
 
+def _service_tool_table_names(tree: ast.Module) -> list[str]:
+    for node in tree.body:
+        if isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
+            if node.target.id == "_SERVICE_TOOL_TABLE":
+                assert isinstance(node.value, ast.Tuple)
+                return [
+                    entry.elts[0].value
+                    for entry in node.value.elts
+                    if isinstance(entry, ast.Tuple) and isinstance(entry.elts[0], ast.Constant)
+                ]
+    raise AssertionError("_SERVICE_TOOL_TABLE not found")
+
+
 class TestMcpServerRegistry:
     def test_registered_tool_names_matches_decorated_tools(self):
         tree = _load_tree()
 
         decorated_tool_count = _tool_registration_count(tree)
+        table_names = _service_tool_table_names(tree)
         registered_names = _registered_tool_names(tree)
 
-        assert decorated_tool_count == 25
-        assert len(registered_names) == decorated_tool_count
+        assert decorated_tool_count + len(table_names) == 27
+        assert len(registered_names) == decorated_tool_count + len(table_names)
+        assert set(table_names).issubset(registered_names)
 
     def test_registered_tool_names_contains_newly_missing_entries(self):
         tree = _load_tree()
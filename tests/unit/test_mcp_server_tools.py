@@ -0,0 +1,156 @@
+import asyncio
+import threading
+from unittest.mock import Mock, patch
+
+from src.mcp_server import mcp_server
+
+
+class TestToolWrappers:
+    def test_service_calls_run_off_the_event_loop_thread(self):
+        service = Mock()
+        seen: dict[str, object] = {}
+
+        def fake_total_states(state_service):
+            seen["thread"] = threading.current_thread().name
+            seen["service"] = state_service
+            return {"success": True, "total_states": 3}
+
+        async def call_tool():
+            seen["loop_thread"] = threading.current_thread().name
+            return await mcp_server.total_states_tool()
+
+        with (
+            patch.object(mcp_server, "_state_service", service),
+            patch.object(mcp_server, "total_states", side_effect=fake_total_states),
+        ):
+            result = asyncio.run(call_tool())
+
+        assert result == {"success": True, "total_states": 3}
+        assert seen["service"] is service
+        assert seen["thread"] != seen["loop_thread"]
+        assert str(seen["thread"]).startswith("state-service")
+
+    def test_job_status_tools_do_not_wait_for_the_service_worker(self):
+        release = threading.Event()
+
+        def blocking_total_states(state_service):
+            release.wait(timeout=5)
+            return {"success": True}
+
+        async def run_both():
+            slow = asyncio.create_task(mcp_server.total_states_tool())
+            await asyncio.sleep(0.01)
+            status = await mcp_server.get_genesis_status_tool(job_id="missing")
+            assert not slow.done()
+            release.set()
+            await slow
+            return status
+
+        with (
+            patch.object(mcp_server, "_state_service", Mock()),
+            patch.object(mcp_server, "total_states", side_effect=blocking_total_states),
+            patch.object(
+                mcp_server, "get_genesis_status", return_value={"success": False}
+            ) as get_status,
+        ):
+            status = asyncio.run(run_both())
+
+        assert status == {"success": False}
+        get_status.assert_called_once_with(job_id="missing")
+
+    def test_pending_service_calls_are_bounded(self):
+        release = threading.Event()
+        started: list[int] = []
+
+        def blocking_call(index):
+            started.append(index)
+            release.wait(timeout=5)
+            return index
+
+        async def run_calls():
+            tasks = [
+                asyncio.create_task(mcp_server._call_service(blocking_call, index))
+                for index in range(3)
+            ]
+            await asyncio.sleep(0.05)
+            queued = sum(1 for task in tasks if not task.done())
+            slots = mcp_server._get_service_slots(asyncio.get_running_loop())
+            assert slots.locked()
+            release.set()
+            return queued, await asyncio.gather(*tasks)
+
+        with patch.object(mcp_server, "MAX_PENDING_SERVICE_CALLS", 2):
+            queued, results = asyncio.run(run_calls())
+
+        assert queued == 3
+        assert results == [0, 1, 2]
+        assert started == [0, 1, 2]
+
+    def test_service_is_built_on_the_worker_when_missing(self):
+        service = Mock()
+        seen: dict[str, object] = {}
+
+        def build_on_worker():
+            seen["thread"] = threading.current_thread().name
+            return service
+
+        with (
+            patch.object(mcp_server, "_get_state_service", side_effect=build_on_worker),
+            patch.object(mcp_server, "total_states", return_value={"success": True}) as total,
+        ):
+            asyncio.run(mcp_server.total_states_tool())
+
+        assert str(seen["thread"]).startswith("state-service")
+        total.assert_called_once_with(state_service=service)
+
+    def test_tools_use_the_service_from_the_lifespan_context(self):
+        service = Mock()
+        ctx = Mock()
+        ctx.request_context.lifespan_context = {"state_service": service}
+
+        with (
+            patch.object(mcp_server, "_get_state_service") as get_state_service,
+            patch.object(mcp_server, "total_states", return_value={"success": True}) as total,
+        ):
+            asyncio.run(mcp_server.total_states_tool(ctx=ctx))
+
+        get_state_service.assert_not_called()
+        total.assert_called_once_with(state_service=service)
+
+    def test_context_parameter_is_hidden_from_the_tool_schema(self):
+        tool = mcp_server.app._tool_manager.get_tool("get_state_info_tool")
+
+        assert tool.context_kwarg == "ctx"
+        assert "ctx" not in tool.parameters["properties"]
+
+
+class TestLifespan:
+    def test_lifespan_exposes_service_and_keeps_it_open(self):
+        service = Mock()
+
+        async def run_lifespan():
+            async with mcp_server.lifespan(mcp_server.app) as context:
+                assert context == {"state_service": service}
+                assert mcp_server._state_service is service
+
+        with patch.object(mcp_server, "_state_service", service):
+            # One session ending must not close what other sessions still use.
+            asyncio.run(run_lifespan())
+            asyncio.run(run_lifespan())
+            assert mcp_server._state_service is service
+
+        service.state_repo.close.assert_not_called()
+        service.transition_repo.close.assert_not_called()
+
+    def test_repositories_are_closed_at_process_exit(self):
+        service = Mock()
+
+        with patch.object(mcp_server, "_state_service", service):
+            mcp_server._close_state_service_at_exit()
+            assert mcp_server._state_service is None
+
+        service.state_repo.close.assert_called_once_with()
+        service.transition_repo.close.assert_called_once_with()
+
+    def test_app_is_configured_with_lifespan(self):
+        assert mcp_server.app.settings.lifespan is not None
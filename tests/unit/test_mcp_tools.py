@@ -8,21 +8,23 @@ import pytest
 
 from src.mcp_server.models.state_model import State, Transition
 from src.mcp_server.tools.mcp_tools import (
+    MAX_STATES_PER_REQUEST,
     _handle_rate_limit,
     arbitrary_state_transition,
     fix_volume_path,
+    genesis,
     get_compact_states,
     get_current_state_compact_context,
+    get_current_state_info,
+    get_current_state_number,
     get_fix_volume_path_result,
     get_fix_volume_path_status,
     get_genesis_result,
     get_genesis_status,
-    genesis,
-    get_current_state_info,
-    get_current_state_number,
     get_rewarded_transitions,
     get_state_info,
     get_state_transitions,
+    get_states_info,
     get_transition_info,
     new_state_transition,
     search_states,
@@ -692,6 +694,16 @@ class TestRewardTools:
             assert result["success"] is True
             assert result["transitions"][0]["reward"] == 8.5
 
+    def test_get_rewarded_transitions_rejects_invalid_page(self):
+        """Test get_rewarded_transitions validates limit and offset."""
+        mock_state_service = Mock()
+
+        result = get_rewarded_transitions(state_service=mock_state_service, limit=0)
+
+        assert result["success"] is False
+        assert "Invalid page" in result["message"]
+        mock_state_service.get_rewarded_transitions.assert_not_called()
+
     def test_set_transition_reward_success(self):
         """Test set_transition_reward function."""
         mock_state_service = Mock()
@@ -822,6 +834,34 @@ class TestGetters:
             assert result["success"] is True
             assert result["states"] == [1, 3, 5]
 
+    def test_get_states_info(self):
+        """Test get_states_info function."""
+        state = Mock()
+        state.to_dict.return_value = {"state_number": 2, "llm_context": "ctx"}
+        mock_state_service = Mock()
+        mock_state_service.get_states_info.return_value = ([state], [5], "1 of 2 states retrieved")
+
+        with patch("src.mcp_server.tools.mcp_tools._handle_rate_limit") as mock_rl:
+            mock_rl.return_value = {}
+
+            result = get_states_info(state_service=mock_state_service, states=[2, 5])
+
+        assert result["success"] is True
+        assert result["states"][0]["state_number"] == 2
+        assert result["missing"] == [5]
+        mock_state_service.get_states_info.assert_called_once_with([2, 5])
+
+    def test_get_states_info_rejects_oversized_requests(self):
+        """Test get_states_info caps the number of requested states."""
+        mock_state_service = Mock()
+
+        result = get_states_info(
+            state_service=mock_state_service, states=list(range(MAX_STATES_PER_REQUEST + 1))
+        )
+
+        assert result["success"] is False
+        mock_state_service.get_states_info.assert_not_called()
+
     def test_get_state_transitions(self):
         """Test get_state_transitions function."""
         mock_state_service = Mock()
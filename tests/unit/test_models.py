@@ -1,8 +1,14 @@
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
 import pytest
 
-from src.mcp_server.models.state_model import State, Transition
+from src.mcp_server.models.state_model import (
+    State,
+    Transition,
+    _format_iso,
+    format_iso_datetime,
+    parse_iso_datetime,
+)
 
 
 class TestStateModel:
@@ -49,6 +55,23 @@ class TestStateModel:
         assert state.user_prompt == "From dict prompt"
         assert state.branch_name == "develop"
 
+    def test_state_uses_slots_and_fills_defaults(self):
+        state = State(
+            state_number=3,
+            user_prompt="Slots",
+            branch_name="main",
+            git_diff_info="",
+            hash="slots123",
+            created_at=None,
+            file_hash_deltas=None,
+        )
+
+        assert not hasattr(state, "__dict__")
+        assert state.created_at is not None
+        assert state.file_hash_deltas == {}
+        with pytest.raises(AttributeError):
+            state.unexpected = True
+
 
 class TestTransitionModel:
     def test_transition_creation(self):
@@ -62,6 +85,8 @@ class TestTransitionModel:
         assert transition.current_state == 0
         assert transition.next_state == 1
         assert transition.user_prompt == "Test transition"
+        assert transition.timestamp is not None
+        assert not hasattr(transition, "__dict__")
 
     def test_transition_to_dict(self):
         transition_id = 1
@@ -90,3 +115,53 @@ class TestTransitionModel:
         assert transition.current_state == 2
         assert transition.next_state == 3
         assert transition.user_prompt == "Another transition"
+
+
+class TestParseIsoDatetime:
+    def test_repeated_timestamps_share_one_parse(self):
+        parse_iso_datetime.cache_clear()
+        first = Transition.from_dict(
+            {
+                "transition_id": 1,
+                "current_state": 0,
+                "next_state": 1,
+                "timestamp": "2024-02-02T10:00:00",
+            }
+        )
+        second = Transition.from_dict(
+            {
+                "transition_id": 2,
+                "current_state": 1,
+                "next_state": 2,
+                "timestamp": "2024-02-02T10:00:00",
+            }
+        )
+
+        assert first.timestamp == datetime(2024, 2, 2, 10, 0, 0)
+        assert first.timestamp is second.timestamp
+        assert parse_iso_datetime.cache_info().hits == 1
+
+    def test_zulu_suffix_is_read_as_utc(self):
+        parsed = parse_iso_datetime("2024-02-02T10:00:00Z")
+
+        assert parsed == datetime(2024, 2, 2, 10, 0, 0, tzinfo=timezone.utc)
+
+    def test_serializing_a_shared_timestamp_formats_it_once(self):
+        _format_iso.cache_clear()
+        moment = datetime(2024, 2, 2, 10, 0, 0)
+        transitions = [
+            Transition(transition_id=n, current_state=n, next_state=n + 1, timestamp=moment)
+            for n in range(3)
+        ]
+
+        payloads = [transition.to_dict() for transition in transitions]
+
+        assert {payload["timestamp"] for payload in payloads} == {"2024-02-02T10:00:00"}
+        assert _format_iso.cache_info().hits == 2
+
+    def test_equal_instants_in_different_offsets_keep_their_own_offset(self):
+        utc = datetime(2024, 2, 2, 12, 0, 0, tzinfo=timezone.utc)
+        shifted = datetime(2024, 2, 2, 14, 0, 0, tzinfo=timezone(timedelta(hours=2)))
+
+        assert format_iso_datetime(utc) == "2024-02-02T12:00:00+00:00"
+        assert format_iso_datetime(shifted) == "2024-02-02T14:00:00+02:00"
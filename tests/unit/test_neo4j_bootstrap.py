@@ -1,8 +1,12 @@
+import socket
 from unittest.mock import MagicMock, Mock, patch
 
 from src.mcp_server.config import Settings
 from src.mcp_server.repositories.neo4j_repository import create_neo4j_repositories
-from src.mcp_server.services.neo4j_bootstrap import prepare_neo4j_connection
+from src.mcp_server.services.neo4j_bootstrap import (
+    neo4j_endpoint_reachable,
+    prepare_neo4j_connection,
+)
 from src.mcp_server.services.neo4j_service_manager import ManagedNeo4jConnection
 
 
@@ -27,7 +31,9 @@ class TestPrepareNeo4jConnection:
             image="neo4j:5.24",
         )
 
-        with patch("src.mcp_server.services.neo4j_bootstrap.ProjectNeo4jServiceManager") as manager_cls:
+        with patch(
+            "src.mcp_server.services.neo4j_bootstrap.ProjectNeo4jServiceManager"
+        ) as manager_cls:
             manager_cls.return_value.ensure_service.return_value = managed_connection
 
             resolved = prepare_neo4j_connection(settings, project_root=tmp_path)
@@ -47,7 +53,9 @@ class TestPrepareNeo4jConnection:
             neo4j_auth_enabled=True,
         )
 
-        with patch("src.mcp_server.services.neo4j_bootstrap.ProjectNeo4jServiceManager") as manager_cls:
+        with patch(
+            "src.mcp_server.services.neo4j_bootstrap.ProjectNeo4jServiceManager"
+        ) as manager_cls:
             resolved = prepare_neo4j_connection(settings, project_root=tmp_path)
 
         assert resolved.neo4j_uri == "bolt://neo4j.example:7687"
@@ -59,7 +67,9 @@ class TestCreateNeo4jRepositories:
     def test_create_neo4j_repositories_disables_auth_when_requested(self):
         settings = Settings(db_mode="neo4j", neo4j_auth_enabled=False)
 
-        with patch("src.mcp_server.repositories.neo4j_repository.GraphDatabase.driver") as driver_factory:
+        with patch(
+            "src.mcp_server.repositories.neo4j_repository.GraphDatabase.driver"
+        ) as driver_factory:
             driver = MagicMock()
             session = Mock()
             session.run.return_value = None
@@ -74,11 +84,15 @@ class TestCreateNeo4jRepositories:
             )
 
         assert driver_factory.call_args.kwargs["auth"] is None
+        assert driver_factory.call_args.kwargs["max_connection_pool_size"] == 50
+        assert driver_factory.call_args.kwargs["connection_acquisition_timeout"] == 60
 
     def test_create_neo4j_repositories_uses_credentials_when_auth_is_enabled(self):
         settings = Settings(db_mode="neo4j", neo4j_auth_enabled=True)
 
-        with patch("src.mcp_server.repositories.neo4j_repository.GraphDatabase.driver") as driver_factory:
+        with patch(
+            "src.mcp_server.repositories.neo4j_repository.GraphDatabase.driver"
+        ) as driver_factory:
             driver = MagicMock()
             session = Mock()
             session.run.return_value = None
@@ -93,3 +107,23 @@ class TestCreateNeo4jRepositories:
             )
 
         assert driver_factory.call_args.kwargs["auth"] == ("neo4j", "secret")
+
+
+class TestNeo4jEndpointReachable:
+    def test_reports_listening_port_as_reachable(self):
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as server:
+            server.bind(("127.0.0.1", 0))
+            server.listen(1)
+            port = server.getsockname()[1]
+
+            assert neo4j_endpoint_reachable(f"bolt://127.0.0.1:{port}") is True
+
+    def test_reports_closed_port_as_unreachable(self):
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+            probe.bind(("127.0.0.1", 0))
+            port = probe.getsockname()[1]
+
+        assert neo4j_endpoint_reachable(f"bolt://127.0.0.1:{port}", timeout=0.2) is False
+
+    def test_rejects_malformed_uri(self):
+        assert neo4j_endpoint_reachable("bolt://127.0.0.1:notaport") is False
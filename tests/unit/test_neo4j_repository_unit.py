@@ -1,22 +1,384 @@
-from unittest.mock import MagicMock
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
 
 from src.mcp_server.config import Settings
-from src.mcp_server.repositories.neo4j_repository import Neo4jStateRepository
+from src.mcp_server.models.state_model import State, Transition
+from src.mcp_server.repositories import neo4j_repository
+from src.mcp_server.repositories.neo4j_repository import (
+    Neo4jStateRepository,
+    Neo4jTransitionRepository,
+    _to_datetime,
+)
+
+
+def _driver_with_session():
+    driver = MagicMock()
+    session = driver.session.return_value
+    session.closed.return_value = False
+    # Managed transactions run their work function against the session's run().
+    session.execute_read.side_effect = lambda work, *args: work(session, *args)
+    session.execute_write.side_effect = lambda work, *args: work(session, *args)
+    return driver, session
 
 
 class TestNeo4jStateRepositoryUnit:
-    def test_get_current_returns_genesis_when_max_state_is_zero_without_metadata(self):
-        driver = MagicMock()
-        metadata_session = driver.session.return_value.__enter__.return_value
-        metadata_result = MagicMock()
-        metadata_result.single.side_effect = [None, {"max_state": 0}]
-        metadata_session.run.return_value = metadata_result
+    def test_get_current_loads_the_state_in_one_query(self):
+        driver, session = _driver_with_session()
+        record = MagicMock()
+        record.values.return_value = [
+            0,
+            "genesis",
+            "main",
+            "",
+            "h0",
+            None,
+            '{"a.py": "x"}',
+            None,
+            None,
+            None,
+            None,
+        ]
+        session.run.return_value.single.return_value = record
 
         settings = Settings(db_mode="neo4j")
         repository = Neo4jStateRepository(driver, settings)
-        repository.get_by_number = MagicMock(return_value="genesis-state")
+        session.run.reset_mock()
 
         current = repository.get_current()
 
-        assert current == "genesis-state"
-        repository.get_by_number.assert_called_once_with(0)
+        assert current is not None
+        assert current.state_number == 0
+        assert current.user_prompt == "genesis"
+        assert current.file_hashes == {"a.py": "x"}
+        assert current.file_hash_deltas == {}
+        session.run.assert_called_once()
+        session.execute_read.assert_called_once()
+
+    def test_reads_reuse_the_same_query_text(self):
+        driver, session = _driver_with_session()
+        session.run.return_value.single.return_value = None
+        repository = Neo4jStateRepository(driver, Settings(db_mode="neo4j"))
+        session.run.reset_mock()
+
+        repository.get_by_number(1)
+        repository.get_by_number(2)
+
+        first, second = session.run.call_args_list
+        assert first.args[0] is second.args[0]
+        assert [call.args[1] for call in session.run.call_args_list] == [
+            {"state_number": 1},
+            {"state_number": 2},
+        ]
+
+    def test_get_all_hydrates_rows_inside_the_read_transaction(self):
+        driver, session = _driver_with_session()
+        repository = Neo4jStateRepository(driver, Settings(db_mode="neo4j"))
+        rows = [
+            (n, f"s{n}", "main", "", f"h{n}", None, None, None, None, None, None) for n in range(3)
+        ]
+        session.run.return_value.__iter__.return_value = iter(rows)
+
+        states = repository.get_all()
+
+        assert [state.state_number for state in states] == [0, 1, 2]
+        session.execute_read.assert_called_once()
+
+    def test_exists_uses_an_exists_subquery(self):
+        driver, session = _driver_with_session()
+        repository = Neo4jStateRepository(driver, Settings(db_mode="neo4j"))
+        session.run.return_value.single.return_value = {"found": True}
+
+        assert repository.exists(3) is True
+
+        assert "EXISTS {" in session.run.call_args.args[0]
+        session.run.return_value.single.return_value = {"found": False}
+        assert repository.exists(4) is False
+
+    def test_set_current_is_a_single_write(self):
+        driver, session = _driver_with_session()
+        session.run.return_value.single.return_value = {"state_number": 4}
+        repository = Neo4jStateRepository(driver, Settings(db_mode="neo4j"))
+        session.run.reset_mock()
+
+        assert repository.set_current(4) is True
+        session.execute_write.assert_called_once()
+        session.run.assert_called_once()
+
+        session.run.return_value.single.return_value = None
+        assert repository.set_current(99) is False
+
+    def test_get_current_returns_none_without_states(self):
+        driver, session = _driver_with_session()
+        session.run.return_value.single.return_value = None
+
+        repository = Neo4jStateRepository(driver, Settings(db_mode="neo4j"))
+
+        assert repository.get_current() is None
+
+    def test_queries_reuse_one_session_per_thread(self):
+        driver, session = _driver_with_session()
+        session.run.return_value.single.return_value = {"count": 3}
+
+        repository = Neo4jStateRepository(driver, Settings(db_mode="neo4j"))
+        repository.count()
+        repository.count()
+
+        driver.session.assert_called_once_with()
+
+    def test_failed_session_is_replaced_and_closed(self):
+        driver, session = _driver_with_session()
+        repository = Neo4jStateRepository(driver, Settings(db_mode="neo4j"))
+        session.run.side_effect = RuntimeError("connection reset")
+
+        with pytest.raises(RuntimeError):
+            repository.count()
+
+        session.close.assert_called_once_with()
+        session.run.side_effect = None
+        session.run.return_value.single.return_value = {"count": 0}
+        assert repository.count() == 0
+        assert driver.session.call_count == 2
+
+    def test_create_many_writes_states_in_unwind_batches(self):
+        driver, session = _driver_with_session()
+        tx = MagicMock()
+        tx.run.return_value.single.side_effect = lambda: {"written": 2}
+        session.execute_write.side_effect = lambda work, *args: work(tx, *args)
+        repository = Neo4jStateRepository(driver, Settings(db_mode="neo4j"))
+        states = [
+            State(
+                state_number=n,
+                user_prompt=f"s{n}",
+                branch_name="main",
+                git_diff_info="",
+                hash=f"h{n}",
+                file_hashes={"a.py": str(n)},
+            )
+            for n in range(4)
+        ]
+
+        with patch.object(neo4j_repository, "BULK_WRITE_BATCH_SIZE", 2):
+            written = repository.create_many(states)
+
+        assert written == 4
+        assert session.execute_write.call_count == 2
+        first_batch = tx.run.call_args_list[0].args[1]["rows"]
+        assert [row["state_number"] for row in first_batch] == [0, 1]
+        assert first_batch[1]["file_hashes"] == '{"a.py":"1"}'
+        assert "UNWIND $rows" in tx.run.call_args_list[0].args[0]
+
+    def test_create_many_reports_batches_committed_before_a_failure(self, caplog):
+        driver, session = _driver_with_session()
+        tx = MagicMock()
+        tx.run.return_value.single.side_effect = [{"written": 2}, RuntimeError("lost leader")]
+        session.execute_write.side_effect = lambda work, *args: work(tx, *args)
+        repository = Neo4jStateRepository(driver, Settings(db_mode="neo4j"))
+        states = [
+            State(
+                state_number=n, user_prompt=f"s{n}", branch_name="main", git_diff_info="", hash=""
+            )
+            for n in range(4)
+        ]
+
+        with patch.object(neo4j_repository, "BULK_WRITE_BATCH_SIZE", 2):
+            written = repository.create_many(states)
+
+        assert written == 2
+        assert "after 2 of 4 rows were committed" in caplog.text
+        session.close.assert_called_once()
+
+    def test_create_judges_the_upsert_by_its_counters(self):
+        driver, session = _driver_with_session()
+        repository = Neo4jStateRepository(driver, Settings(db_mode="neo4j"))
+        state = State(
+            state_number=1, user_prompt="p", branch_name="main", git_diff_info="", hash="h1"
+        )
+        counters = session.run.return_value.consume.return_value.counters
+
+        counters.contains_updates = True
+        assert repository.create(state) is True
+        counters.contains_updates = False
+        assert repository.create(state) is False
+        session.run.return_value.single.assert_not_called()
+
+    def test_create_next_uses_create_for_the_new_number(self):
+        driver, session = _driver_with_session()
+        session.run.return_value.single.return_value = {"state_number": 5}
+        session.run.return_value.consume.return_value.counters.nodes_created = 1
+        repository = Neo4jStateRepository(driver, Settings(db_mode="neo4j"))
+        session.run.reset_mock()
+        state = State(
+            state_number=0, user_prompt="p", branch_name="main", git_diff_info="", hash=""
+        )
+
+        assert repository.create_next(state) is True
+
+        assert state.state_number == 5
+        statement = session.run.call_args.args[0]
+        assert "CREATE (new:State" in statement
+        assert "MERGE" not in statement
+        claim = session.run.call_args_list[0].args[0]
+        assert "MERGE (c:Counter {name: 'state'})" in claim
+
+    def test_create_next_failure_replaces_the_cached_session(self):
+        driver, session = _driver_with_session()
+        repository = Neo4jStateRepository(driver, Settings(db_mode="neo4j"))
+        session.execute_write.side_effect = RuntimeError("connection reset")
+        state = State(
+            state_number=0, user_prompt="p", branch_name="main", git_diff_info="", hash=""
+        )
+
+        assert repository.create_next(state) is False
+
+        session.close.assert_called_once()
+        driver.session.reset_mock()
+        repository.exists(1)
+        driver.session.assert_called_once()
+
+    def test_set_file_hashes_reports_whether_a_state_was_updated(self):
+        driver, session = _driver_with_session()
+        repository = Neo4jStateRepository(driver, Settings(db_mode="neo4j"))
+        counters = session.run.return_value.consume.return_value.counters
+
+        counters.properties_set = 1
+        assert repository.set_file_hashes(32, {"a.py": "x"}) is True
+        assert session.run.call_args.args[1]["file_hashes"] == '{"a.py":"x"}'
+        counters.properties_set = 0
+        assert repository.set_file_hashes(99, {"a.py": "x"}) is False
+
+    def test_create_next_writes_checkpoint_file_hashes(self):
+        driver, session = _driver_with_session()
+        session.run.return_value.single.return_value = {"state_number": 32}
+        session.run.return_value.consume.return_value.counters.nodes_created = 1
+        repository = Neo4jStateRepository(driver, Settings(db_mode="neo4j"))
+        session.run.reset_mock()
+        state = State(
+            state_number=0,
+            user_prompt="p",
+            branch_name="main",
+            git_diff_info="",
+            hash="",
+            file_hashes={"a.py": "x"},
+        )
+
+        assert repository.create_next(state) is True
+
+        create = session.run.call_args
+        assert "file_hashes: $file_hashes" in create.args[0]
+        assert create.kwargs["file_hashes"] == '{"a.py":"x"}'
+
+    def test_create_many_skips_empty_input(self):
+        driver, session = _driver_with_session()
+        repository = Neo4jStateRepository(driver, Settings(db_mode="neo4j"))
+
+        assert repository.create_many([]) == 0
+        session.execute_write.assert_not_called()
+
+
+class TestNeo4jTimestamps:
+    def test_native_temporal_values_are_converted_without_parsing(self):
+        moment = datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+        stored = MagicMock()
+        stored.to_native.return_value = moment
+
+        assert _to_datetime(stored) is moment
+
+    def test_legacy_iso_strings_are_still_read(self):
+        assert _to_datetime("2026-01-02T03:04:05+00:00") == datetime(
+            2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc
+        )
+        assert _to_datetime("") is None
+        assert _to_datetime(None) is None
+
+
+class TestNeo4jTransitionRepositoryUnit:
+    def test_init_creates_relationship_property_indexes(self):
+        driver, session = _driver_with_session()
+
+        Neo4jTransitionRepository(driver, Settings(db_mode="neo4j"))
+
+        statements = [call.args[0] for call in session.run.call_args_list]
+        assert any("transition_id_idx" in statement for statement in statements)
+        assert any("transition_timestamp_idx" in statement for statement in statements)
+        assert any("counter_name_unique" in statement for statement in statements)
+
+    def test_timestamp_migration_runs_until_the_marker_is_set(self):
+        driver, session = _driver_with_session()
+        session.run.return_value.single.return_value = None
+
+        Neo4jTransitionRepository(driver, Settings(db_mode="neo4j"))
+
+        statements = [call.args[0] for call in session.run.call_args_list]
+        assert any("datetime(t.timestamp)" in statement for statement in statements)
+        marker = session.run.call_args
+        assert marker.args[1] == {"key": "transition_timestamps_migrated", "value": "1"}
+
+        session.run.reset_mock()
+        session.run.return_value.single.return_value = {"value": "1", "state_number": None}
+
+        Neo4jTransitionRepository(driver, Settings(db_mode="neo4j"))
+
+        statements = [call.args[0] for call in session.run.call_args_list]
+        assert not any("datetime(t.timestamp)" in statement for statement in statements)
+
+    def test_get_by_state_orders_by_transition_id(self):
+        driver, session = _driver_with_session()
+        repository = Neo4jTransitionRepository(driver, Settings(db_mode="neo4j"))
+        session.run.reset_mock()
+        session.run.return_value = []
+
+        assert repository.get_by_state(1) == []
+
+        statement = session.run.call_args.args[0]
+        assert statement.rstrip().endswith("ORDER BY t.transition_id")
+
+    def test_create_many_sends_transition_rows(self):
+        driver, session = _driver_with_session()
+        tx = MagicMock()
+        tx.run.return_value.single.return_value = {"written": 1}
+        session.execute_write.side_effect = lambda work, *args: work(tx, *args)
+        repository = Neo4jTransitionRepository(driver, Settings(db_mode="neo4j"))
+        moment = datetime(2026, 1, 2, tzinfo=timezone.utc)
+
+        written = repository.create_many(
+            [Transition(transition_id=7, current_state=1, next_state=2, timestamp=moment)]
+        )
+
+        assert written == 1
+        (row,) = tx.run.call_args.args[1]["rows"]
+        assert row["transition_id"] == 7
+        assert row["timestamp"] is moment
+
+    def test_create_next_claims_the_id_under_the_counter_lock(self):
+        driver, session = _driver_with_session()
+        session.run.return_value.single.return_value = {"transition_id": 8}
+        session.run.return_value.consume.return_value.counters.relationships_created = 1
+        repository = Neo4jTransitionRepository(driver, Settings(db_mode="neo4j"))
+        session.run.reset_mock()
+        transition = Transition(transition_id=0, current_state=3, next_state=4)
+
+        assert repository.create_next(transition) is True
+
+        assert transition.transition_id == 8
+        session.execute_write.assert_called_once()
+        claim, create = session.run.call_args_list
+        assert "MERGE (c:Counter {name: 'transition'})" in claim.args[0]
+        assert create.args[1]["transition_id"] == 8
+
+    def test_get_last_builds_transitions_from_projected_scalars(self):
+        driver, session = _driver_with_session()
+        repository = Neo4jTransitionRepository(driver, Settings(db_mode="neo4j"))
+        moment = datetime(2026, 1, 2, tzinfo=timezone.utc)
+        stored = MagicMock()
+        stored.to_native.return_value = moment
+        session.run.return_value.__iter__.return_value = iter([(9, 3, 4, "p", stored, 0.5)])
+
+        (transition,) = repository.get_last(1)
+
+        assert transition.transition_id == 9
+        assert (transition.current_state, transition.next_state) == (3, 4)
+        assert transition.timestamp is moment
+        assert transition.reward == 0.5
+        assert "RETURN t," not in session.run.call_args.args[0]
@@ -2,25 +2,45 @@ import json
 from unittest.mock import Mock, patch
 
 import pytest
+from docker.errors import DockerException, NotFound
 
 from src.mcp_server.config import Settings
+from src.mcp_server.services import neo4j_service_manager
 from src.mcp_server.services.neo4j_service_manager import (
     ManagedNeo4jConnection,
     Neo4jServiceError,
     ProjectNeo4jServiceManager,
+    reset_docker_client,
 )
 
 
-def _make_container(status: str, bolt_port: int, http_port: int) -> Mock:
+def _make_connection(tmp_path) -> ManagedNeo4jConnection:
+    return ManagedNeo4jConnection(
+        uri="bolt://127.0.0.1:17687",
+        user="",
+        password=None,
+        auth_enabled=False,
+        container_name="codebase-state-manager-neo4j-test",
+        bolt_port=17687,
+        http_port=17474,
+        data_dir=tmp_path / ".data" / "neo4j" / "data",
+        logs_dir=tmp_path / ".data" / "neo4j" / "logs",
+        runtime_file=tmp_path / ".data" / "neo4j" / "runtime.json",
+        image="neo4j:5.24",
+    )
+
+
+def _make_container(status: str, bolt_port: int, http_port: int, health: str | None = None) -> Mock:
     container = Mock()
     container.status = status
     container.attrs = {
+        "State": {"Health": {"Status": health}} if health else {"Status": status},
         "NetworkSettings": {
             "Ports": {
                 "7687/tcp": [{"HostPort": str(bolt_port)}],
                 "7474/tcp": [{"HostPort": str(http_port)}],
             }
-        }
+        },
     }
     return container
 
@@ -42,7 +62,7 @@ class TestProjectNeo4jServiceManager:
     def test_ensure_service_creates_authless_container_and_persists_runtime(self, tmp_path):
         client = Mock()
         client.ping.return_value = True
-        client.containers.list.return_value = []
+        client.containers.get.side_effect = NotFound("missing")
         client.containers.run.return_value = _make_container("running", 17687, 17474)
 
         settings = Settings(db_mode="neo4j", neo4j_bootstrap_mode="auto")
@@ -62,6 +82,7 @@ class TestProjectNeo4jServiceManager:
         assert run_kwargs["environment"]["NEO4J_AUTH"] == "none"
         assert run_kwargs["ports"]["7687/tcp"] == 17687
         assert run_kwargs["ports"]["7474/tcp"] == 17474
+        assert run_kwargs["healthcheck"]["retries"] == 30
         assert connection.uri == "bolt://127.0.0.1:17687"
         assert connection.auth_enabled is False
 
@@ -75,7 +96,7 @@ class TestProjectNeo4jServiceManager:
         client = Mock()
         client.ping.return_value = True
         container = _make_container("exited", 18687, 18474)
-        client.containers.list.return_value = [container]
+        client.containers.get.return_value = container
 
         settings = Settings(db_mode="neo4j", neo4j_bootstrap_mode="auto")
         manager = ProjectNeo4jServiceManager(
@@ -95,10 +116,49 @@ class TestProjectNeo4jServiceManager:
         client.containers.run.assert_not_called()
         assert connection.uri == "bolt://127.0.0.1:18687"
 
+    def test_ensure_service_skips_bolt_probe_for_healthy_container(self, tmp_path):
+        client = Mock()
+        client.ping.return_value = True
+        client.containers.get.return_value = _make_container(
+            "running", 18687, 18474, health="healthy"
+        )
+
+        settings = Settings(db_mode="neo4j", neo4j_bootstrap_mode="auto")
+        manager = ProjectNeo4jServiceManager(
+            project_root=tmp_path,
+            settings=settings,
+            client_factory=lambda: client,
+        )
+
+        with patch.object(manager, "_wait_until_ready") as wait_until_ready:
+            connection = manager.ensure_service()
+
+        wait_until_ready.assert_not_called()
+        assert connection.uri == "bolt://127.0.0.1:18687"
+
+    def test_ensure_service_waits_while_container_health_is_starting(self, tmp_path):
+        client = Mock()
+        client.ping.return_value = True
+        client.containers.get.return_value = _make_container(
+            "running", 18687, 18474, health="starting"
+        )
+
+        settings = Settings(db_mode="neo4j", neo4j_bootstrap_mode="auto")
+        manager = ProjectNeo4jServiceManager(
+            project_root=tmp_path,
+            settings=settings,
+            client_factory=lambda: client,
+        )
+
+        with patch.object(manager, "_wait_until_ready") as wait_until_ready:
+            manager.ensure_service()
+
+        wait_until_ready.assert_called_once()
+
     def test_ensure_service_recreates_missing_container_from_saved_runtime(self, tmp_path):
         client = Mock()
         client.ping.return_value = True
-        client.containers.list.return_value = []
+        client.containers.get.side_effect = NotFound("missing")
         client.containers.run.return_value = _make_container("running", 19687, 19474)
 
         settings = Settings(db_mode="neo4j", neo4j_bootstrap_mode="auto")
@@ -121,6 +181,43 @@ class TestProjectNeo4jServiceManager:
         assert run_kwargs["ports"]["7474/tcp"] == 19474
         assert connection.uri == "bolt://127.0.0.1:19687"
 
+    def test_find_container_looks_up_by_exact_name(self, tmp_path):
+        client = Mock()
+        container = _make_container("running", 17687, 17474)
+        client.containers.get.return_value = container
+        settings = Settings(db_mode="neo4j", neo4j_bootstrap_mode="auto")
+        manager = ProjectNeo4jServiceManager(project_root=tmp_path, settings=settings)
+
+        assert manager._find_container(client, "codebase-state-manager-neo4j-x") is container
+        client.containers.get.assert_called_once_with("codebase-state-manager-neo4j-x")
+        client.containers.list.assert_not_called()
+
+    def test_default_docker_client_is_shared_and_reset_after_failure(self, tmp_path):
+        settings = Settings(db_mode="neo4j", neo4j_bootstrap_mode="auto")
+        healthy_client = Mock()
+        broken_client = Mock()
+        broken_client.ping.side_effect = DockerException("daemon gone")
+
+        reset_docker_client()
+        try:
+            with patch(
+                "src.mcp_server.services.neo4j_service_manager.docker.from_env",
+                side_effect=[healthy_client, broken_client],
+            ) as from_env:
+                first = ProjectNeo4jServiceManager(project_root=tmp_path, settings=settings)
+                second = ProjectNeo4jServiceManager(project_root=tmp_path, settings=settings)
+
+                assert first._get_client() is healthy_client
+                assert second._get_client() is healthy_client
+                assert from_env.call_count == 1
+
+                reset_docker_client()
+                with pytest.raises(Neo4jServiceError, match="daemon gone"):
+                    first._get_client()
+                assert neo4j_service_manager._docker_client is None
+        finally:
+            reset_docker_client()
+
     def test_wait_until_ready_uses_short_connectivity_probes(self, tmp_path):
         settings = Settings(
             db_mode="neo4j", neo4j_bootstrap_mode="auto", neo4j_connection_timeout=90
@@ -143,14 +240,14 @@ class TestProjectNeo4jServiceManager:
             runtime_file=tmp_path / ".data" / "neo4j" / "runtime.json",
             image="neo4j:5.24",
         )
-        first_driver = Mock()
-        first_driver.verify_connectivity.side_effect = RuntimeError("not ready")
-        second_driver = Mock()
+        driver = Mock()
+        driver.verify_connectivity.side_effect = [RuntimeError("not ready"), None]
 
         with (
+            patch.object(manager, "_bolt_port_open", return_value=True),
             patch(
                 "src.mcp_server.services.neo4j_service_manager.GraphDatabase.driver",
-                side_effect=[first_driver, second_driver],
+                return_value=driver,
             ) as driver_factory,
             patch(
                 "src.mcp_server.services.neo4j_service_manager.time.monotonic",
@@ -167,8 +264,9 @@ class TestProjectNeo4jServiceManager:
             driver_factory.call_args_list[0].kwargs["connection_acquisition_timeout"]
             == expected_probe_timeout
         )
-        first_driver.verify_connectivity.assert_called_once_with()
-        second_driver.verify_connectivity.assert_called_once_with()
+        driver_factory.assert_called_once()
+        assert driver.verify_connectivity.call_count == 2
+        driver.close.assert_called_once_with()
 
     def test_wait_until_ready_reports_last_probe_error_after_timeout(self, tmp_path):
         settings = Settings(
@@ -196,6 +294,7 @@ class TestProjectNeo4jServiceManager:
         failing_driver.verify_connectivity.side_effect = RuntimeError("still booting")
 
         with (
+            patch.object(manager, "_bolt_port_open", return_value=True),
             patch(
                 "src.mcp_server.services.neo4j_service_manager.GraphDatabase.driver",
                 return_value=failing_driver,
@@ -207,3 +306,33 @@ class TestProjectNeo4jServiceManager:
             pytest.raises(Neo4jServiceError, match="still booting"),
         ):
             manager._wait_until_ready(connection)
+
+        failing_driver.close.assert_called_once_with()
+
+    def test_wait_until_ready_backs_off_until_bolt_port_accepts_connections(self, tmp_path):
+        sleeps: list[float] = []
+        settings = Settings(
+            db_mode="neo4j", neo4j_bootstrap_mode="auto", neo4j_connection_timeout=90
+        )
+        manager = ProjectNeo4jServiceManager(
+            project_root=tmp_path,
+            settings=settings,
+            sleep_func=sleeps.append,
+        )
+        ready_driver = Mock()
+
+        with (
+            patch.object(
+                manager, "_bolt_port_open", side_effect=[False, False, False, True]
+            ) as port_probe,
+            patch(
+                "src.mcp_server.services.neo4j_service_manager.GraphDatabase.driver",
+                return_value=ready_driver,
+            ) as driver_factory,
+        ):
+            manager._wait_until_ready(_make_connection(tmp_path))
+
+        assert port_probe.call_count == 4
+        assert sleeps == [0.05, 0.1, 0.2]
+        driver_factory.assert_called_once()
+        ready_driver.verify_connectivity.assert_called_once_with()
@@ -24,6 +24,9 @@ class MockStateRepository:
     def get_by_number(self, state_number: int):
         return self.states.get(state_number)
 
+    def get_many(self, state_numbers):
+        return [self.states[n] for n in sorted(set(state_numbers)) if n in self.states]
+
     def get_current(self):
         if self._current_state is not None:
             return self.states.get(self._current_state)
@@ -234,7 +237,9 @@ class TestStateServiceGenesis:
         manager.init_repo.assert_called_once()
         manager.create_branch.assert_called_once()
 
-    def test_genesis_generates_compact_context(self, state_service, git_manager, settings, tmp_path):
+    def test_genesis_generates_compact_context(
+        self, state_service, git_manager, settings, tmp_path
+    ):
         project_path = str(tmp_path / "project")
         volume_path = str(tmp_path / "volume")
         Path(project_path).mkdir()
@@ -583,6 +588,16 @@ class TestStateServiceGetters:
         assert results == []
         assert "not initialized" in message
 
+    def test_consistency_checker_is_built_per_operation(self, state_service, settings, tmp_path):
+        checker = state_service.get_consistency_checker()
+
+        assert state_service.get_consistency_checker() is not checker
+
+        settings.docker_volume_name = str(tmp_path / "moved")
+        moved = state_service.get_consistency_checker()
+
+        assert moved.volume_path == tmp_path / "moved"
+
     def test_get_rewarded_transitions_returns_only_rewarded_items(
         self, state_service, mock_repos, settings
     ):
@@ -615,6 +630,59 @@ class TestStateServiceGetters:
         assert transitions[0]["reward"] == 8.5
         assert "1 total" in message
 
+    def test_get_states_info_reads_cache_misses_in_one_call(
+        self, state_service, mock_repos, settings
+    ):
+        from src.mcp_server.utils.init_manager import set_initialized
+
+        state_repo, _ = mock_repos
+        for number in range(3):
+            state_repo.create(
+                State(
+                    state_number=number,
+                    user_prompt=f"state {number}",
+                    branch_name="main",
+                    git_diff_info="",
+                    hash=f"hash{number}",
+                    llm_context="ctx",
+                    compression_version="v1",
+                    compacted_at=datetime.now(timezone.utc),
+                )
+            )
+        set_initialized(settings.docker_volume_name, True)
+        state_service.get_state_info(0)
+
+        with patch.object(state_repo, "get_many", wraps=state_repo.get_many) as get_many:
+            states, missing, message = state_service.get_states_info([2, 0, 9])
+
+        get_many.assert_called_once_with([2, 9])
+        assert [state.state_number for state in states] == [0, 2]
+        assert missing == [9]
+        assert "2 of 3" in message
+
+    def test_get_rewarded_transitions_returns_requested_page(
+        self, state_service, mock_repos, settings
+    ):
+        from src.mcp_server.utils.init_manager import set_initialized
+
+        _, transition_repo = mock_repos
+        for transition_id in range(1, 5):
+            transition_repo.create(
+                Transition(
+                    transition_id=transition_id,
+                    current_state=transition_id - 1,
+                    next_state=transition_id,
+                    user_prompt=f"rewarded {transition_id}",
+                    reward=float(transition_id),
+                )
+            )
+        set_initialized(settings.docker_volume_name, True)
+
+        transitions, message = state_service.get_rewarded_transitions(limit=2, offset=1)
+
+        assert [t["transition_id"] for t in transitions] == ["2", "3"]
+        assert "2 of 4 total from offset 1" in message
+
     def test_set_transition_reward_updates_by_transition_id(
         self, state_service, mock_repos, settings
     ):
@@ -668,9 +736,7 @@ class TestStateServiceGetters:
         assert transition is None
         assert "ambiguous" in message.lower()
 
-    def test_set_transition_reward_rejects_invalid_selector(
-        self, state_service, settings
-    ):
+    def test_set_transition_reward_rejects_invalid_selector(self, state_service, settings):
         from src.mcp_server.utils.init_manager import set_initialized
 
         set_initialized(settings.docker_volume_name, True)
@@ -717,6 +783,91 @@ class TestStateServiceGetters:
         assert state is None
         assert "not found" in message
 
+    def test_get_state_info_serves_repeat_reads_from_cache(
+        self, state_service, mock_repos, settings
+    ):
+        from src.mcp_server.utils.init_manager import set_initialized
+
+        state_repo, _ = mock_repos
+        state_repo.create(
+            State(
+                state_number=0,
+                user_prompt="genesis",
+                branch_name="main",
+                git_diff_info=None,
+                hash="hash0",
+            )
+        )
+        set_initialized(settings.docker_volume_name, True)
+
+        with patch.object(state_repo, "get_by_number", wraps=state_repo.get_by_number) as get:
+            first, _ = state_service.get_state_info(0)
+            second, _ = state_service.get_state_info(0)
+
+        assert first is second
+        assert get.call_count == 1
+
+    def test_set_transition_reward_invalidates_cached_transition(
+        self, state_service, mock_repos, settings
+    ):
+        from src.mcp_server.utils.init_manager import set_initialized
+
+        _, transition_repo = mock_repos
+        transition_repo.create(
+            Transition(transition_id=6, current_state=0, next_state=1, user_prompt="cached")
+        )
+        set_initialized(settings.docker_volume_name, True)
+
+        before, _ = state_service.get_transition_info("6")
+        state_service.set_transition_reward(reward=2.0, transition_id=6)
+        after, _ = state_service.get_transition_info("6")
+
+        assert before["reward"] is None
+        assert after["reward"] == 2.0
+
+    def test_current_state_cache_follows_transitions(self, state_service, mock_repos, settings):
+        from src.mcp_server.utils.init_manager import set_initialized
+
+        state_repo, _ = mock_repos
+        for number in (0, 1):
+            state_repo.create(
+                State(
+                    state_number=number,
+                    user_prompt=f"state {number}",
+                    branch_name="main",
+                    git_diff_info=None,
+                    hash=f"hash{number}",
+                )
+            )
+        state_repo.set_current(1)
+        set_initialized(settings.docker_volume_name, True)
+
+        assert state_service.get_current_state_number()[0] == 1
+        success, _, _ = state_service.arbitrary_state_transition(0)
+
+        assert success is True
+        assert state_service.get_current_state_number()[0] == 0
+
+    def test_read_racing_an_invalidation_is_not_cached(self, state_service, mock_repos):
+        state_repo, _ = mock_repos
+        stale = State(
+            state_number=3,
+            user_prompt="stale",
+            branch_name="main",
+            git_diff_info=None,
+            hash="hash3",
+        )
+
+        def read_then_invalidate(state_number):
+            # Another thread writes and invalidates while this read is in flight.
+            state_service.invalidate_read_caches()
+            return stale
+
+        with patch.object(state_repo, "get_by_number", side_effect=read_then_invalidate):
+            assert state_service._cached_state(3) is stale
+
+        assert 3 not in state_service._state_cache
+
 
 class TestStateServiceFixVolumePath:
     @pytest.fixture
@@ -880,7 +1031,10 @@ class TestStateServiceFixVolumePath:
 
         assert result_success is False
         assert result_payload is None
-        assert "Project snapshot diverges from the current state stored in the database" in result_message
+        assert (
+            "Project snapshot diverges from the current state stored in the database"
+            in result_message
+        )
         assert "failed to create recovery transition" in result_message
         assert is_initialized(settings.docker_volume_name) is False
 
@@ -914,7 +1068,9 @@ class TestStateServiceFixVolumePath:
         checker.check_all.side_effect = [[fixable_issue], [], []]
 
         with patch.object(state_service, "_should_run_consistency_check", return_value=True):
-            with patch("src.mcp_server.services.state_service.ConsistencyChecker", return_value=checker):
+            with patch(
+                "src.mcp_server.services.state_service.ConsistencyChecker", return_value=checker
+            ):
                 result_success, result_payload, result_message = state_service.fix_volume_path(
                     str(project_path)
                 )
@@ -995,7 +1151,9 @@ class TestStateServiceFixVolumePath:
         checker.check_all.return_value = [blocking_issue]
 
         with patch.object(state_service, "_should_run_consistency_check", return_value=True):
-            with patch("src.mcp_server.services.state_service.ConsistencyChecker", return_value=checker):
+            with patch(
+                "src.mcp_server.services.state_service.ConsistencyChecker", return_value=checker
+            ):
                 result_success, result_payload, result_message = state_service.fix_volume_path(
                     str(project_path)
                 )
@@ -1045,7 +1203,9 @@ class TestStateServiceFixVolumePath:
         clone_source = git_manager.clone_to_volume.call_args.args[0]
         assert clone_source == managed_project.resolve()
 
-    def test_fix_volume_path_reports_mismatch_summary(self, state_service, mock_repos, git_manager, tmp_path):
+    def test_fix_volume_path_reports_mismatch_summary(
+        self, state_service, mock_repos, git_manager, tmp_path
+    ):
         state_repo, _ = mock_repos
         state_repo.create(
             State(
@@ -1083,7 +1243,9 @@ class TestStateServiceFixVolumePath:
         assert "extra=1" in result_message
         assert "changed=1" in result_message
 
-    def test_fix_volume_path_auto_aligns_state_and_retries(self, state_service, mock_repos, git_manager, tmp_path):
+    def test_fix_volume_path_auto_aligns_state_and_retries(
+        self, state_service, mock_repos, git_manager, tmp_path
+    ):
         state_repo, _ = mock_repos
         state_repo.create(
             State(